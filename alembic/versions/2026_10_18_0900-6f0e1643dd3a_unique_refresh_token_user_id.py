@@ -0,0 +1,48 @@
+"""unique refresh token user id
+
+Revision ID: 6f0e1643dd3a
+Revises: 385f4ed73ee8
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f0e1643dd3a'
+down_revision: Union[str, Sequence[str], None] = '385f4ed73ee8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the row each user is actually using so the unique index can be built: the old
+    # save_or_update_token kept refreshing the first (lowest id) row, so prefer active, then
+    # latest expiry, then lowest id.
+    op.execute(
+        """
+        DELETE FROM refreshtokens
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (PARTITION BY user_id ORDER BY is_active DESC, expires_at DESC, id ASC) AS position
+                FROM refreshtokens
+            ) ranked
+            WHERE ranked.position > 1
+        )
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_refreshtokens_user_id'), 'refreshtokens', ['user_id'],
+            unique=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_refreshtokens_user_id'), table_name='refreshtokens', postgresql_concurrently=True)
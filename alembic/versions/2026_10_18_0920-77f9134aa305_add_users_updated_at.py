@@ -0,0 +1,66 @@
+"""add users updated_at
+
+Revision ID: 77f9134aa305
+Revises: 3946d682b848
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '77f9134aa305'
+down_revision: Union[str, Sequence[str], None] = '3946d682b848'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        last_id = 0
+        while True:
+            # walk the primary key so each batch starts where the last one ended instead of rescanning done rows
+            batch_end = connection.execute(
+                sa.text(
+                    """
+                    SELECT max(id) FROM (
+                        SELECT id FROM users WHERE id > :last_id ORDER BY id LIMIT :batch_size
+                    ) AS batch
+                    """
+                ),
+                {"last_id": last_id, "batch_size": BATCH_SIZE},
+            ).scalar()
+            if batch_end is None:
+                break
+
+            connection.execute(
+                sa.text(
+                    """
+                    UPDATE users SET updated_at = created_at
+                    WHERE id > :last_id AND id <= :batch_end AND updated_at IS NULL
+                    """
+                ),
+                {"last_id": last_id, "batch_end": batch_end},
+            )
+            last_id = batch_end
+
+        op.create_index(
+            op.f('ix_users_updated_at'), 'users', ['updated_at'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_users_updated_at'), table_name='users', postgresql_concurrently=True)
+    op.drop_column('users', 'updated_at')
@@ -0,0 +1,120 @@
+"""add refresh token digests
+
+Revision ID: a76cd8b32d05
+Revises: 77f9134aa305
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a76cd8b32d05'
+down_revision: Union[str, Sequence[str], None] = '77f9134aa305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+DIGEST_COLUMNS = ('access_token', 'refresh_token')
+LOCK_TIMEOUT = '5s'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in DIGEST_COLUMNS:
+        op.add_column('refreshtokens', sa.Column(f'{column}_digest', sa.LargeBinary(length=32), nullable=True))
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        last_id = 0
+        while True:
+            # walk the primary key so each batch starts where the last one ended instead of rescanning done rows
+            batch_end = connection.execute(
+                sa.text(
+                    """
+                    SELECT max(id) FROM (
+                        SELECT id FROM refreshtokens WHERE id > :last_id ORDER BY id LIMIT :batch_size
+                    ) AS batch
+                    """
+                ),
+                {"last_id": last_id, "batch_size": BATCH_SIZE},
+            ).scalar()
+            if batch_end is None:
+                break
+
+            connection.execute(
+                sa.text(
+                    """
+                    UPDATE refreshtokens
+                    SET access_token_digest = sha256(convert_to(access_token, 'UTF8')),
+                        refresh_token_digest = sha256(convert_to(refresh_token, 'UTF8'))
+                    WHERE id > :last_id AND id <= :batch_end
+                    AND (access_token_digest IS NULL OR refresh_token_digest IS NULL)
+                    """
+                ),
+                {"last_id": last_id, "batch_end": batch_end},
+            )
+            last_id = batch_end
+
+        for column in DIGEST_COLUMNS:
+            op.create_index(
+                op.f(f'ix_refreshtokens_{column}_digest'), 'refreshtokens', [f'{column}_digest'],
+                unique=True, postgresql_concurrently=True,
+            )
+
+    # each step commits on its own so no lock outlives its statement: NOT VALID needs ACCESS EXCLUSIVE only
+    # briefly, VALIDATE scans under a lock that still allows reads and writes, and SET NOT NULL then reuses
+    # the validated constraint instead of rescanning. A short lock_timeout makes the ACCESS EXCLUSIVE steps
+    # fail fast rather than queue live traffic behind them.
+    with op.get_context().autocommit_block():
+        op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        for column in DIGEST_COLUMNS:
+            op.execute(
+                f'ALTER TABLE refreshtokens ADD CONSTRAINT {_not_null_constraint(column)} '
+                f'CHECK ({column}_digest IS NOT NULL) NOT VALID'
+            )
+
+    with op.get_context().autocommit_block():
+        op.execute('RESET lock_timeout')
+        for column in DIGEST_COLUMNS:
+            op.execute(f'ALTER TABLE refreshtokens VALIDATE CONSTRAINT {_not_null_constraint(column)}')
+
+    with op.get_context().autocommit_block():
+        op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        for column in DIGEST_COLUMNS:
+            op.alter_column('refreshtokens', f'{column}_digest', nullable=False)
+            op.drop_constraint(_not_null_constraint(column), 'refreshtokens', type_='check')
+        op.execute('RESET lock_timeout')
+
+    with op.get_context().autocommit_block():
+        for column in DIGEST_COLUMNS:
+            op.drop_index(
+                op.f(f'ix_refreshtokens_{column}'), table_name='refreshtokens', postgresql_concurrently=True,
+            )
+
+
+def _not_null_constraint(column: str) -> str:
+    return f'ck_refreshtokens_{column}_digest_not_null'
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_refreshtokens_access_token'), 'refreshtokens', ['access_token'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f('ix_refreshtokens_refresh_token'), 'refreshtokens', ['refresh_token'],
+            unique=True, postgresql_concurrently=True,
+        )
+        for column in DIGEST_COLUMNS:
+            op.drop_index(
+                op.f(f'ix_refreshtokens_{column}_digest'), table_name='refreshtokens', postgresql_concurrently=True,
+            )
+
+    for column in DIGEST_COLUMNS:
+        op.drop_column('refreshtokens', f'{column}_digest')
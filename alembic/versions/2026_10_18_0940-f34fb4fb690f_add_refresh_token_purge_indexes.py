@@ -0,0 +1,42 @@
+"""add refresh token purge indexes
+
+Revision ID: f34fb4fb690f
+Revises: a76cd8b32d05
+Create Date: 2026-10-18 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f34fb4fb690f'
+down_revision: Union[str, Sequence[str], None] = 'a76cd8b32d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the purge deletes `NOT is_active OR expires_at < cutoff` in LIMITed batches; one index per branch
+    # lets each batch be a BitmapOr of two index scans instead of a sequential scan
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_refreshtokens_expires_at'), 'refreshtokens', ['expires_at'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_refreshtokens_inactive_id', 'refreshtokens', ['id'],
+            unique=False, postgresql_concurrently=True, postgresql_where=sa.text('NOT is_active'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_refreshtokens_inactive_id', table_name='refreshtokens', postgresql_concurrently=True)
+        op.drop_index(
+            op.f('ix_refreshtokens_expires_at'), table_name='refreshtokens', postgresql_concurrently=True,
+        )
@@ -0,0 +1,76 @@
+"""add refresh token last_used_at
+
+Revision ID: f5d2d5e386f1
+Revises: f34fb4fb690f
+Create Date: 2026-10-18 09:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5d2d5e386f1'
+down_revision: Union[str, Sequence[str], None] = 'f34fb4fb690f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refreshtokens', sa.Column('last_used_at', sa.DateTime(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        last_id = 0
+        while True:
+            batch_end = connection.execute(
+                sa.text(
+                    """
+                    SELECT max(id) FROM (
+                        SELECT id FROM refreshtokens WHERE id > :last_id ORDER BY id LIMIT :batch_size
+                    ) AS batch
+                    """
+                ),
+                {"last_id": last_id, "batch_size": BATCH_SIZE},
+            ).scalar()
+            if batch_end is None:
+                break
+
+            # every login and refresh rewrote expires_at, so it is the closest record of the last use
+            connection.execute(
+                sa.text(
+                    """
+                    UPDATE refreshtokens SET last_used_at = expires_at
+                    WHERE id > :last_id AND id <= :batch_end AND last_used_at IS NULL
+                    """
+                ),
+                {"last_id": last_id, "batch_end": batch_end},
+            )
+            last_id = batch_end
+
+        # the purge now filters on last_used_at, so the expires_at index has no reader left
+        op.create_index(
+            op.f('ix_refreshtokens_last_used_at'), 'refreshtokens', ['last_used_at'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f('ix_refreshtokens_expires_at'), table_name='refreshtokens', postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_refreshtokens_expires_at'), 'refreshtokens', ['expires_at'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f('ix_refreshtokens_last_used_at'), table_name='refreshtokens', postgresql_concurrently=True,
+        )
+    op.drop_column('refreshtokens', 'last_used_at')
@@ -0,0 +1,11 @@
+import os
+
+
+# Benchmarks import application modules, which read settings at import time.
+for key, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+    "DATABASE_ECHO": "false",
+    "CLIENT_ID": "benchmark-client-id",
+    "CLIENT_SECRET": "benchmark-client-secret",
+}.items():
+    os.environ.setdefault(key, value)
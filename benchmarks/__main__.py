@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import importlib
+import json
+import platform
+import sys
+from pathlib import Path
+
+from benchmarks import _timing
+
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# suite name -> (module, keyword arguments for its run() coroutine given the parsed CLI args)
+SUITES = {
+    "auth_units": (
+        "benchmarks.bench_auth_units",
+        lambda args: {"iterations": args.iterations, "route_iterations": max(args.iterations // 10, 50)},
+    ),
+    "jwks_decoder": (
+        "benchmarks.bench_jwks_decoder",
+        lambda args: {"iterations": args.iterations, "concurrency": 32, "workers": 4},
+    ),
+    "metrics": ("benchmarks.bench_metrics", lambda args: {"iterations": args.iterations * 10}),
+    "current_user": (
+        "benchmarks.bench_current_user",
+        lambda args: {"users": 1000, "iterations": args.iterations, "concurrency": 1},
+    ),
+    "logging": (
+        "benchmarks.bench_logging",
+        lambda args: {"iterations": args.iterations, "concurrency": 32, "disk_delay_ms": 0.0},
+    ),
+    "users_projection": ("benchmarks.bench_users_projection", lambda args: {"rows": 1000, "iterations": 50}),
+}
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Run benchmark suites and compare them against a stored baseline.",
+    )
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="defaults to auth_units")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per suite; the fastest run of each benchmark is kept")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--metric", default="p50_us", help="result field compared against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, 0.5 = 50%%")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--output", type=Path, help="write this run's results as JSON")
+    return parser.parse_args(argv)
+
+async def run_suites(names: list[str], args: argparse.Namespace) -> dict[str, dict]:
+    for name in names:
+        module_name, make_kwargs = SUITES[name]
+        module = importlib.import_module(module_name)
+        for _ in range(args.repeat):
+            await module.run(**make_kwargs(args))
+
+    # scheduler noise only ever makes a run slower, so the fastest repeat is the most comparable one
+    best: dict[str, dict] = {}
+    skipped: set[str] = set()
+    for result in _timing.collected:
+        result = dict(result)
+        name = result.pop("benchmark")
+        if args.metric not in result:
+            skipped.add(name)
+        elif name not in best or result[args.metric] < best[name][args.metric]:
+            best[name] = result
+
+    for name in sorted(skipped):
+        print(f"{name}: skipped, it does not report {args.metric}", file=sys.stderr)
+    return best
+
+def build_document(results: dict[str, dict], args: argparse.Namespace) -> dict:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "iterations": args.iterations,
+        "repeat": args.repeat,
+        "benchmarks": results,
+    }
+
+def compare(current: dict, baseline: dict, metric: str, tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        expected = baseline["benchmarks"].get(name, {}).get(metric)
+        if not expected:
+            print(f"{name}: no baseline", file=sys.stderr)
+            continue
+
+        ratio = result[metric] / expected
+        status = "REGRESSION" if ratio > 1 + tolerance else "ok"
+        print(f"{name}: {result[metric]} vs {expected} {metric} ({ratio:.2f}x) {status}", file=sys.stderr)
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run_suites(args.suite or ["auth_units"], args))
+    document = build_document(results, args)
+
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update-baseline first", file=sys.stderr)
+        return 1
+
+    regressions = compare(document, json.loads(args.baseline.read_text()), args.metric, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.tolerance:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
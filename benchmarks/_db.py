@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
+
+from src.api.auth.utils.token_digest import token_digest
+from src.database.base import Base
+from src.database.models import User, RefreshToken
+
+
+async def create_seeded_engine(users: int) -> AsyncEngine:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        if users:
+            created_at = datetime(2025, 1, 1)
+            await connection.execute(insert(User), [
+                {
+                    "email": f"user{index}@gmail.com",
+                    "full_name": f"User {index}",
+                    "image": f"https://lh3.googleusercontent.com/a/{index}",
+                    "user_oauth_id": f"1000{index}",
+                    "created_at": created_at + timedelta(seconds=index),
+                }
+                for index in range(users)
+            ])
+            await connection.execute(insert(RefreshToken), [
+                {
+                    "access_token": f"ya29.access-{index}",
+                    "access_token_digest": token_digest(f"ya29.access-{index}"),
+                    "refresh_token": f"1//refresh-{index}",
+                    "refresh_token_digest": token_digest(f"1//refresh-{index}"),
+                    "expires_at": created_at + timedelta(days=365),
+                    "token_type": "Bearer",
+                    "is_active": True,
+                    "user_id": index + 1,
+                }
+                for index in range(users)
+            ])
+    return engine
+
+def make_session_maker(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
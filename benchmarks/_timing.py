@@ -0,0 +1,66 @@
+import asyncio
+import json
+import statistics
+import time
+from typing import Awaitable, Callable
+
+
+# every reported result, so a runner can compare a whole suite against a baseline
+collected: list[dict] = []
+
+def measure(func: Callable[[], object], iterations: int, warmup: int = 100) -> dict:
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        func()
+        timings.append(time.perf_counter_ns() - start)
+    return summarize(timings)
+
+async def measure_async(
+        func: Callable[[], Awaitable[object]],
+        iterations: int,
+        concurrency: int = 1,
+        warmup: int = 10,
+) -> dict:
+    for _ in range(warmup):
+        await func()
+
+    timings = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_once():
+        async with semaphore:
+            start = time.perf_counter_ns()
+            await func()
+            timings.append(time.perf_counter_ns() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_once() for _ in range(iterations)))
+    elapsed = time.perf_counter() - start
+
+    result = summarize(timings)
+    result["ops_per_sec"] = round(iterations / elapsed, 1)
+    return result
+
+def summarize(timings_ns: list[int]) -> dict:
+    timings_ns = sorted(timings_ns)
+    return {
+        "iterations": len(timings_ns),
+        "mean_us": round(statistics.fmean(timings_ns) / 1000, 3),
+        "p50_us": round(percentile(timings_ns, 50) / 1000, 3),
+        "p99_us": round(percentile(timings_ns, 99) / 1000, 3),
+        "ops_per_sec": round(1e9 / statistics.fmean(timings_ns), 1),
+    }
+
+def percentile(sorted_values: list, pct: float):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+def report(name: str, result: dict) -> None:
+    collected.append({"benchmark": name, **result})
+    print(json.dumps({"benchmark": name, **result}))
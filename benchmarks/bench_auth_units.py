@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime
+from urllib.parse import urlencode
+
+import httpx
+from fastapi.dependencies.utils import solve_dependencies
+from fastapi.routing import APIRoute
+from jose import jwt
+from starlette.requests import Request
+
+import benchmarks  # noqa: F401
+from benchmarks._timing import measure, measure_async, report
+from src.api.auth.dependencies.repositories_dependencies import (
+    get_user_repository, get_refresh_token_repository,
+    get_user_read_repository,
+)
+from src.api.auth.dependencies.session_dependencies import session_token_codec
+from src.api.auth.models import User
+from src.api.auth.schemas import SessionClaims
+from src.api.auth.services.exchange_code_to_token_service import ExchangeCodeToTokenService
+from src.api.auth.services.google_login_service import GoogleLoginService
+from src.api.auth.services.save_tokens_service import SaveTokensService
+from src.api.auth.services.save_user_service import UserSaveService
+from src.api.auth.utils.get_token_from_header import get_token_from_header
+from src.api.auth.utils.jose_decoder import JoseDecoder
+from src.api.auth.utils.state_compare_hmac import StateCompareHmac
+from src.api.auth.utils.state_generator_hashlib import StateGeneratorHashlib
+from src.config import settings
+from src.main import app
+from src.storage.cookie_storage_manager import CookieStorageManager
+from src.utils.dependencies import get_httpx_http_client
+
+
+USER_SUB = "1234567890"
+ACCESS_TOKEN = "ya29.bench-access-token"
+
+ID_TOKEN_CLAIMS = {
+    "sub": USER_SUB, "email": "bench@gmail.com", "name": "Bench User", "picture": "https://x/y.jpg",
+    "aud": "benchmark-client-id", "iss": "https://accounts.google.com", "exp": int(time.time()) + 3600,
+}
+GOOGLE_TOKEN_PAYLOAD = {
+    "access_token": ACCESS_TOKEN,
+    "refresh_token": "1//bench-refresh-token",
+    "expires_in": 3599,
+    "token_type": "Bearer",
+}
+
+class StubRepository:
+    def __init__(self, row):
+        self.row = row
+
+    async def get_one_or_none(self, stmt):
+        return self.row
+
+class StubHttpClient:
+    async def send_request(self, method, url, /, **kwargs) -> httpx.Response:
+        return httpx.Response(200, json={"user_id": USER_SUB, "expires_in": 3599})
+
+def make_user() -> User:
+    return User(
+        id=1,
+        user_oauth_id=USER_SUB,
+        email="bench@gmail.com",
+        full_name="Bench User",
+        image="https://x/y.jpg",
+        created_at=datetime(2025, 1, 1, 12, 0),
+    )
+
+def make_request(method: str = "GET", path: str = "/", query: dict | None = None, headers: dict | None = None) -> Request:
+    return Request({
+        "type": "http",
+        "app": app,
+        "method": method,
+        "path": path,
+        "root_path": "",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 50000),
+        "query_string": urlencode(query or {}).encode(),
+        "headers": [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()],
+        "path_params": {},
+    })
+
+def bearer_token() -> str:
+    if not settings.session_token_settings.session_token_enabled:
+        return ACCESS_TOKEN
+
+    user = make_user()
+    return session_token_codec.issue(SessionClaims(
+        user_id=user.id,
+        sub=user.user_oauth_id,
+        session_id=1,
+        email=user.email,
+        full_name=user.full_name,
+        image=user.image,
+        created_at=user.created_at,
+    ))
+
+def route_request(route: APIRoute, method: str) -> Request:
+    headers = {
+        "Authorization": f"Bearer {bearer_token()}",
+        "Cookie": "oauth_state=bench-state; refresh_token=1//bench-refresh-token",
+    }
+    query = {"state": "bench-state", "code": "bench-code"} if route.path.endswith("/callback") else None
+    return make_request(method, route.path, query, headers)
+
+def make_route_resolver(route: APIRoute, method: str):
+    async def resolve_once():
+        async with AsyncExitStack() as async_exit_stack:
+            solved = await solve_dependencies(
+                request=route_request(route, method),
+                dependant=route.dependant,
+                dependency_overrides_provider=app,
+                async_exit_stack=async_exit_stack,
+                embed_body_fields=False,
+            )
+        if solved.errors:
+            raise RuntimeError(f"{method} {route.path} failed to resolve: {solved.errors}")
+    return resolve_once
+
+def run_units(iterations: int) -> None:
+    generator = StateGeneratorHashlib()
+    report("state_generator_hashlib_generate", measure(generator.generate, iterations))
+
+    state = generator.generate()
+    report("state_compare_hmac_compare", measure(lambda: StateCompareHmac.compare(state, state), iterations))
+
+    id_token = jwt.encode(ID_TOKEN_CLAIMS, "bench-secret", algorithm="HS256")
+    decoder = JoseDecoder()
+    report("jose_decoder_decode", measure(lambda: decoder.decode(id_token), iterations))
+
+    login_service = GoogleLoginService(CookieStorageManager(make_request()), generator)
+    report("google_login_generate_response", measure(login_service.generate_response, iterations))
+
+    save_tokens_service = SaveTokensService(StubRepository(None))
+    report(
+        "fill_token_schema",
+        measure(lambda: save_tokens_service._fill_token_schema(GOOGLE_TOKEN_PAYLOAD, 1), iterations),
+    )
+    report("fill_user_schema", measure(lambda: UserSaveService._fill_user_schema(ID_TOKEN_CLAIMS), iterations))
+
+    exchange_service = ExchangeCodeToTokenService(StubHttpClient())
+    report(
+        "fill_exchange_code_params",
+        measure(lambda: exchange_service._fill_exchange_code_params("bench-code"), iterations),
+    )
+
+async def run_dependencies(iterations: int, route_iterations: int) -> None:
+    header = f"{settings.oauth_settings.current_token_type} {ACCESS_TOKEN}"
+    report("get_token_from_header", await measure_async(lambda: get_token_from_header(header), iterations))
+
+    user_repository = StubRepository(make_user())
+    token_repository = StubRepository(None)
+    overrides = {
+        get_user_repository: lambda: user_repository,
+        get_user_read_repository: lambda: user_repository,
+        get_refresh_token_repository: lambda: token_repository,
+        get_httpx_http_client: StubHttpClient,
+    }
+    previous_overrides = dict(app.dependency_overrides)
+    app.dependency_overrides.update(overrides)
+    try:
+        for route in app.routes:
+            if not isinstance(route, APIRoute) or not route.path.startswith("/api"):
+                continue
+            for method in sorted(route.methods):
+                path = route.path.removeprefix("/api/").replace("/", "_").replace("-", "_")
+                name = f"resolve_{method.lower()}_{path}"
+                report(name, await measure_async(make_route_resolver(route, method), route_iterations))
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(previous_overrides)
+
+async def run(iterations: int, route_iterations: int) -> None:
+    run_units(iterations)
+    await run_dependencies(iterations, route_iterations)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark auth hot-path building blocks in isolation")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--route-iterations", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.route_iterations))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import asyncio
+import random
+
+import httpx
+from sqlalchemy import select
+
+import benchmarks  # noqa: F401
+from benchmarks._db import create_seeded_engine, make_session_maker
+from benchmarks._timing import measure_async, report
+from src.api.auth.dependencies.current_user_dependencies import get_user_from_google_token
+from src.api.auth.models import User, RefreshToken
+from src.api.auth.services.current_user_service import CurrentUserService
+from src.api.auth.utils.token_digest import token_digest
+from src.api.auth.utils.token_validation_cache import TokenValidationCache
+from src.database.base_repository import BaseRepository
+from src.exceptions import UnauthorizeError
+
+
+class TokenInfoClient:
+    async def send_request(self, method, url, /, **kwargs) -> httpx.Response:
+        index = url.rsplit("access-", 1)[-1]
+        return httpx.Response(200, json={"user_id": f"1000{index}", "expires_in": 3600})
+
+async def two_queries(session, user_sub: str, access_token: str) -> User:
+    users = await BaseRepository(session, User).get_by_conditions(User.user_oauth_id == user_sub)
+    tokens = await BaseRepository(session, RefreshToken).get_by_conditions(RefreshToken.user_id == users[0].id)
+    if tokens[0].access_token != access_token or not tokens[0].is_active:
+        raise UnauthorizeError("Token is inactive or not found")
+    return users[0]
+
+async def joined_query(session, user_sub: str, access_token: str) -> User:
+    stmt = (
+        select(User)
+        .join(RefreshToken, RefreshToken.user_id == User.id)
+        .where(
+            User.user_oauth_id == user_sub,
+            RefreshToken.access_token_digest == token_digest(access_token),
+            RefreshToken.is_active == True,
+        )
+    )
+    return await BaseRepository(session, User).get_one_or_none(stmt)
+
+async def lambda_query(session, user_sub: str, access_token: str) -> User:
+    stmt = CurrentUserService._active_user_stmt(user_sub, access_token)
+    return await BaseRepository(session, User).get_one_or_none(stmt)
+
+async def run(users: int, iterations: int, concurrency: int) -> None:
+    engine = await create_seeded_engine(users)
+    session_maker = make_session_maker(engine)
+    token_cache = TokenValidationCache(max_size=users, ttl=300.0, negative_ttl=5.0)
+
+    def random_user() -> tuple[str, str]:
+        index = random.randrange(users)
+        return f"1000{index}", f"ya29.access-{index}"
+
+    for name, lookup in (
+        ("current_user_two_queries", two_queries),
+        ("current_user_joined_select", joined_query),
+        ("current_user_lambda_stmt", lambda_query),
+    ):
+        async def lookup_once(lookup=lookup):
+            async with session_maker() as session:
+                await lookup(session, *random_user())
+
+        report(name, await measure_async(lookup_once, iterations, concurrency=concurrency))
+
+    async def authenticated_request():
+        _, access_token = random_user()
+        async with session_maker() as session:
+            service = CurrentUserService(BaseRepository(session, User), TokenInfoClient(), token_cache)
+            await get_user_from_google_token(access_token, service)
+
+    report(
+        "authenticated_request_warm_cache",
+        await measure_async(authenticated_request, iterations, concurrency=concurrency, warmup=users),
+    )
+
+    await engine.dispose()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the user lookup behind authenticated requests")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.iterations, args.concurrency))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+import benchmarks  # noqa: F401
+from benchmarks._timing import measure, measure_async, report
+from src.api.auth.utils.jose_decoder import JoseDecoder
+from src.api.auth.utils.jwks_decoder import JwksDecoder
+from src.api.auth.utils.jwks_key_set import JwksKeySet
+
+
+AUDIENCE = "benchmark-client-id"
+ISSUER = "https://accounts.google.com"
+
+class StaticJwksClient:
+    def __init__(self, jwks: dict):
+        self.jwks = jwks
+
+    async def send_request(self, method, url, /, **kwargs) -> httpx.Response:
+        return httpx.Response(200, json=self.jwks, headers={"Cache-Control": "max-age=3600"})
+
+def make_token_and_jwks() -> tuple[str, dict]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_jwk = jwk.construct(private_key.public_key(), "RS256").to_dict()
+    public_jwk["kid"] = "bench"
+
+    claims = {
+        "sub": "1234567890", "email": "bench@gmail.com", "name": "Bench", "picture": "https://x/y.jpg",
+        "aud": AUDIENCE, "iss": ISSUER, "exp": int(time.time()) + 3600,
+    }
+    token = jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": "bench"})
+    return token, {"keys": [public_jwk]}
+
+def make_decoder(jwks: dict, executor=None) -> JwksDecoder:
+    key_set = JwksKeySet(
+        lambda: StaticJwksClient(jwks),
+        "https://example.com/certs",
+        default_max_age=3600,
+        min_refresh_interval=30,
+    )
+    return JwksDecoder(key_set, AUDIENCE, [ISSUER], ["RS256"], executor=executor)
+
+async def run(iterations: int, concurrency: int, workers: int) -> None:
+    token, jwks = make_token_and_jwks()
+
+    unverified = JoseDecoder()
+    report("jose_unverified_claims", measure(lambda: unverified.decode(token), iterations))
+
+    inline = make_decoder(jwks)
+    await inline.key_set.refresh()
+    report("jwks_verify_inline", measure(lambda: inline.decode(token), iterations))
+    report(
+        f"jwks_adecode_inline_c{concurrency}",
+        await measure_async(lambda: inline.adecode(token), iterations, concurrency),
+    )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pooled = make_decoder(jwks, executor)
+        await pooled.key_set.refresh()
+        report(
+            f"jwks_adecode_pool{workers}_c{concurrency}",
+            await measure_async(lambda: pooled.adecode(token), iterations, concurrency),
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark local id_token verification")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.concurrency, args.workers))
+
+if __name__ == "__main__":
+    main()
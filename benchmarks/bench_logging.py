@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import benchmarks  # noqa: F401
+from benchmarks._timing import measure_async, report
+from src.logs import RateLimitFilter, move_handlers_to_queue
+
+
+logger = logging.getLogger("app.benchmarks.logging")
+
+class SlowFileHandler(logging.FileHandler):
+    # stands in for a saturated disk or network volume
+    def __init__(self, path: Path, delay: float):
+        super().__init__(path, "a", "utf-8")
+        self.delay = delay
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.delay:
+            time.sleep(self.delay)
+        super().emit(record)
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+async def send(message: dict) -> None:
+    pass
+
+async def endpoint(scope, receive, send) -> None:
+    # roughly what a request does when a lookup misses: a bit of async work and one warning
+    await asyncio.sleep(0)
+    logger.warning(f"The User id {scope['path'].rsplit('/', 1)[-1]} does not exist.")
+    await send({"type": "http.response.start", "status": 404, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+def request_once():
+    scope = {"type": "http", "method": "GET", "path": "/api/users/1", "headers": []}
+    return endpoint(scope, receive, send)
+
+def configure(mode: str, path: Path, delay: float) -> logging.handlers.QueueListener | None:
+    logger.handlers.clear()
+    logger.filters.clear()
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    handler = SlowFileHandler(path, delay)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    logger.addHandler(handler)
+    if mode == "sync":
+        return None
+
+    filters = [RateLimitFilter({logger.name: 10}, interval=60)] if mode == "queue_rate_limited" else []
+    return move_handlers_to_queue(logger, 100_000, filters)
+
+async def run(iterations: int, concurrency: int, disk_delay_ms: float) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ("sync", "queue", "queue_rate_limited"):
+            listener = configure(mode, Path(directory) / f"{mode}.log", disk_delay_ms / 1000)
+            result = await measure_async(request_once, iterations, concurrency)
+            if listener is not None:
+                listener.stop()
+            for handler in logger.handlers:
+                handler.close()
+            report(f"logging_{mode}_disk{disk_delay_ms:g}ms_c{concurrency}", result)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Request latency while every request logs a warning")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--disk-delay-ms", type=float, default=0.0, help="extra time each file write blocks for")
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.concurrency, args.disk_delay_ms))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import asyncio
+
+from starlette.routing import Route
+
+import benchmarks  # noqa: F401
+from benchmarks._timing import measure_async, report
+from src.database.query_stats import QueryInstrumentation
+from src.middleware.metrics import MetricsMiddleware
+from src.middleware.server_timing import ServerTimingMiddleware
+
+
+ROUTE = Route("/api/users/{user_id}", lambda request: None)
+
+async def endpoint(scope, receive, send) -> None:
+    scope["route"] = ROUTE
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+async def send(message: dict) -> None:
+    pass
+
+def make_request(app):
+    async def request_once():
+        scope = {"type": "http", "method": "GET", "path": "/api/users/1", "headers": []}
+        await app(scope, receive, send)
+    return request_once
+
+async def run(iterations: int) -> None:
+    instrumentation = QueryInstrumentation(slow_query_threshold=1.0, n_plus_one_threshold=10)
+    apps = {
+        "asgi_bare": endpoint,
+        "asgi_metrics": MetricsMiddleware(endpoint),
+        "asgi_server_timing": ServerTimingMiddleware(endpoint, instrumentation),
+        "asgi_metrics_and_server_timing": MetricsMiddleware(ServerTimingMiddleware(endpoint, instrumentation)),
+    }
+    for name, app in apps.items():
+        report(name, await measure_async(make_request(app), iterations, warmup=1000))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-request overhead of the metrics and Server-Timing middleware")
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import benchmarks  # noqa: F401
+from benchmarks._db import create_seeded_engine, make_session_maker
+from benchmarks._timing import report, summarize
+from src.api.auth.models import User
+from src.api.auth.router import USER_READ_COLUMNS, users_page_adapter
+from src.api.auth.schemas import UserRead
+from src.database.base_repository import BaseRepository
+from src.pagination import PaginationModel
+
+
+async def orm_page(session, limit: int) -> bytes:
+    users = await BaseRepository(session, User).get_all(0, limit)
+    page = PaginationModel[UserRead](
+        items=[UserRead.model_validate(user, from_attributes=True) for user in users],
+        total=len(users),
+    )
+    return page.model_dump_json().encode()
+
+async def projection_page(session, limit: int) -> bytes:
+    users = await BaseRepository(session, User).get_rows(USER_READ_COLUMNS, limit=limit)
+    page = users_page_adapter.validate_python({"items": users, "total": len(users)})
+    return users_page_adapter.dump_json(page)
+
+async def measure_page(session_maker, build_page, limit: int, iterations: int) -> dict:
+    async def run_once():
+        async with session_maker() as session:
+            return await build_page(session, limit)
+
+    for _ in range(3):
+        await run_once()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        await run_once()
+        timings.append(time.perf_counter_ns() - start)
+
+    tracemalloc.start()
+    await run_once()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = summarize(timings)
+    result.update({"rows": limit, "peak_kib": round(peak / 1024, 1)})
+    return result
+
+async def run(rows: int, iterations: int) -> None:
+    engine = await create_seeded_engine(rows)
+    session_maker = make_session_maker(engine)
+
+    report("users_page_orm", await measure_page(session_maker, orm_page, rows, iterations))
+    report("users_page_projection", await measure_page(session_maker, projection_page, rows, iterations))
+
+    await engine.dispose()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare ORM and projection list pages")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.iterations))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import asyncio
+import random
+import secrets
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode
+
+import uvicorn
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, RedirectResponse, Response
+from starlette.routing import Route
+
+
+KEY_ID = "load-test"
+ISSUER = "https://accounts.google.com"
+
+class FaultInjection:
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+
+    async def apply(self) -> Response | None:
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and random.random() < self.error_rate:
+            return JSONResponse({"error": "backend_error"}, status_code=503)
+        return None
+
+
+class FakeGoogle:
+    def __init__(self, client_id: str, faults: FaultInjection):
+        self.client_id = client_id
+        self.faults = faults
+
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        public_jwk = jwk.construct(private_key.public_key(), "RS256").to_dict()
+        public_jwk.update({"kid": KEY_ID, "use": "sig", "alg": "RS256"})
+        self.jwks = {"keys": [public_jwk]}
+
+        self.app = Starlette(routes=[
+            Route("/o/oauth2/v2/auth", self.authorize),
+            Route("/token", self.token, methods=["POST"]),
+            Route("/oauth2/v1/tokeninfo", self.tokeninfo),
+            Route("/oauth2/v3/certs", self.certs),
+        ])
+
+    # tokens embed the user so every endpoint stays stateless: ya29.<sub>.<nonce>, 1//<sub>.<nonce>
+    async def authorize(self, request: Request) -> Response:
+        if failure := await self.faults.apply():
+            return failure
+        params = request.query_params
+        code = f"{params.get('login_hint', 'load-0')}.{secrets.token_urlsafe(8)}"
+        query = urlencode({"code": code, "state": params["state"]})
+        return RedirectResponse(f"{params['redirect_uri']}?{query}", status_code=302)
+
+    async def token(self, request: Request) -> Response:
+        if failure := await self.faults.apply():
+            return failure
+        # urlencoded by hand so the harness does not need python-multipart
+        form = dict(parse_qsl((await request.body()).decode()))
+        if form.get("grant_type") == "refresh_token":
+            sub = form["refresh_token"].removeprefix("1//").rsplit(".", 1)[0]
+            return JSONResponse(self._access_token(sub))
+
+        sub = form["code"].rsplit(".", 1)[0]
+        return JSONResponse({
+            **self._access_token(sub),
+            "refresh_token": f"1//{sub}.{secrets.token_urlsafe(16)}",
+            "id_token": self._id_token(sub),
+        })
+
+    async def tokeninfo(self, request: Request) -> Response:
+        if failure := await self.faults.apply():
+            return failure
+        access_token = request.query_params.get("access_token", "")
+        if not access_token.startswith("ya29."):
+            return JSONResponse({"error": "invalid_token"}, status_code=400)
+        sub = access_token.removeprefix("ya29.").rsplit(".", 1)[0]
+        return JSONResponse({"user_id": sub, "audience": self.client_id, "expires_in": 3599})
+
+    async def certs(self, request: Request) -> Response:
+        return JSONResponse(self.jwks, headers={"Cache-Control": "public, max-age=3600"})
+
+    def _access_token(self, sub: str) -> dict:
+        return {
+            "access_token": f"ya29.{sub}.{secrets.token_urlsafe(24)}",
+            "expires_in": 3599,
+            "token_type": "Bearer",
+            "scope": "openid email profile",
+        }
+
+    def _id_token(self, sub: str) -> str:
+        now = int(time.time())
+        claims = {
+            "iss": ISSUER,
+            "aud": self.client_id,
+            "sub": sub,
+            "email": f"{sub}@load.test",
+            "name": f"Load {sub}",
+            "picture": f"https://lh3.googleusercontent.com/a/{sub}",
+            "iat": now,
+            "exp": now + 3600,
+        }
+        return jwt.encode(claims, self.private_pem, algorithm="RS256", headers={"kid": KEY_ID})
+
+
+class FakeGoogleServer:
+    def __init__(self, fake_google: FakeGoogle, host: str, port: int):
+        self.base_url = f"http://{host}:{port}"
+        self.server = uvicorn.Server(uvicorn.Config(fake_google.app, host=host, port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self.server.run, name="fake-google", daemon=True)
+
+    def start(self, timeout: float = 10.0) -> None:
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("fake Google server did not start")
+            time.sleep(0.05)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self._thread.join()
+
+    def app_environment(self) -> dict[str, str]:
+        return {
+            "GOOGLE_AUTH_URL": f"{self.base_url}/o/oauth2/v2/auth?",
+            "GOOGLE_EXCHANGE_URL": f"{self.base_url}/token",
+            "GOOGLE_VALID_ACCESS_TOKEN_URL": f"{self.base_url}/oauth2/v1/tokeninfo?access_token=",
+            "GOOGLE_JWKS_URL": f"{self.base_url}/oauth2/v3/certs",
+        }
@@ -0,0 +1,168 @@
+import asyncio
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit, parse_qs
+
+import httpx
+
+from benchmarks._timing import percentile
+
+
+STEPS = ("login", "google_authorize", "callback", "current_user", "refresh", "logout")
+
+class StepFailed(Exception):
+    pass
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: Counter[str] = Counter()
+        self.sessions = 0
+        self.completed_sessions = 0
+
+    def record(self, step: str, latency: float, ok: bool) -> None:
+        self.latencies[step].append(latency)
+        if not ok:
+            self.errors[step] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        requests = sum(len(values) for values in self.latencies.values())
+        everything = [latency for values in self.latencies.values() for latency in values]
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "sessions": self.sessions,
+            "completed_sessions": self.completed_sessions,
+            "requests": requests,
+            "errors": sum(self.errors.values()),
+            "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+            "overall": self._distribution(everything),
+            "steps": {
+                step: {**self._distribution(self.latencies[step]), "errors": self.errors[step]}
+                for step in STEPS if self.latencies[step]
+            },
+        }
+
+    @staticmethod
+    def _distribution(latencies: list[float]) -> dict:
+        ordered = sorted(latencies)
+        if not ordered:
+            return {"count": 0}
+        return {
+            "count": len(ordered),
+            "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+            "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        }
+
+
+class SessionScenario:
+    def __init__(
+            self,
+            client: httpx.AsyncClient,
+            stats: LoadStats,
+            *,
+            users: int,
+            current_user_calls: int,
+            refresh_ratio: float,
+            logout_ratio: float,
+    ):
+        self.client = client
+        self.stats = stats
+        self.users = users
+        self.current_user_calls = current_user_calls
+        self.refresh_ratio = refresh_ratio
+        self.logout_ratio = logout_ratio
+
+    @property
+    def requests_per_session(self) -> float:
+        return 3 + self.current_user_calls + self.refresh_ratio + self.logout_ratio
+
+    async def run(self) -> None:
+        self.stats.sessions += 1
+        try:
+            await self._run_session(f"load-{random.randrange(self.users)}")
+        except StepFailed:
+            return
+        self.stats.completed_sessions += 1
+
+    async def _run_session(self, sub: str) -> None:
+        login = await self._request("login", "GET", "/api/auth/login", expected=307)
+        state_cookie = login.cookies.get("oauth_state")
+
+        authorize = await self._request(
+            "google_authorize", "GET", f"{login.headers['location']}&login_hint={sub}", expected=302,
+        )
+        callback_query = urlsplit(authorize.headers["location"]).query
+        callback = await self._request(
+            "callback", "GET", f"/api/auth/login/callback?{callback_query}",
+            cookies={"oauth_state": state_cookie}, expected=307,
+        )
+        access_token = parse_qs(urlsplit(callback.headers["location"]).query)["access_token"][0]
+        refresh_cookie = {"refresh_token": callback.cookies.get("refresh_token")}
+
+        for _ in range(self.current_user_calls):
+            await self._request(
+                "current_user", "GET", "/api/current-user",
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
+
+        if random.random() < self.refresh_ratio:
+            await self._request("refresh", "POST", "/api/auth/refresh", cookies=refresh_cookie)
+
+        if random.random() < self.logout_ratio:
+            await self._request("logout", "POST", "/api/auth/logout", cookies=refresh_cookie)
+
+    async def _request(
+            self,
+            step: str,
+            method: str,
+            url: str,
+            *,
+            expected: int = 200,
+            cookies: dict | None = None,
+            **kwargs,
+    ) -> httpx.Response:
+        # refresh and state cookies are Secure, which httpx will not replay over plain http
+        headers = kwargs.pop("headers", {})
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{key}={value}" for key, value in cookies.items())
+
+        started_at = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(step, time.perf_counter() - started_at, ok=False)
+            raise StepFailed(step)
+
+        ok = response.status_code == expected
+        self.stats.record(step, time.perf_counter() - started_at, ok=ok)
+        if not ok:
+            raise StepFailed(step)
+        return response
+
+
+async def drive(scenario: SessionScenario, target_rps: float, duration: float, max_in_flight: int) -> float:
+    session_interval = scenario.requests_per_session / target_rps
+    in_flight: set[asyncio.Task] = set()
+    started_at = time.perf_counter()
+    next_start = started_at
+
+    # open loop: sessions start on schedule even when the server falls behind,
+    # so queueing shows up in the latencies instead of silently lowering the load
+    while next_start - started_at < duration:
+        await asyncio.sleep(max(0.0, next_start - time.perf_counter()))
+        if len(in_flight) < max_in_flight:
+            task = asyncio.create_task(scenario.run())
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        else:
+            scenario.stats.errors["client_saturated"] += 1
+        next_start += random.expovariate(1 / session_interval)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    return time.perf_counter() - started_at
@@ -11,5 +11,10 @@ done
 echo "Database is available, run migrations"
 alembic upgrade head
 
-echo "Start uvicorn"
-exec uvicorn src.main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
+if [ "${SERVER_MODE:-production}" = "development" ]; then
+  echo "Start uvicorn with reload"
+  exec uvicorn src.main:app --host 0.0.0.0 --port 8000 --reload
+fi
+
+echo "Start uvicorn workers"
+exec python -m src.cli.serve
\ No newline at end of file
@@ -0,0 +1,12 @@
+from src.api.auth.utils.token_validation_cache import TokenValidationCache
+from src.config import settings
+
+
+access_token_cache = TokenValidationCache(
+    max_size=settings.oauth_settings.access_token_cache_size,
+    ttl=settings.oauth_settings.access_token_cache_ttl,
+    negative_ttl=settings.oauth_settings.access_token_negative_cache_ttl,
+)
+
+def get_access_token_cache() -> TokenValidationCache:
+    return access_token_cache
\ No newline at end of file
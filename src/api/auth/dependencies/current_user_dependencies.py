@@ -0,0 +1,32 @@
+from fastapi import Depends
+
+from src.api.auth.dependencies.service_dependencies import get_current_user_service
+from src.api.auth.dependencies.session_dependencies import get_session_claims
+from src.api.auth.models import User
+from src.api.auth.schemas import SessionClaims, UserRead
+from src.api.auth.services.current_user_service import CurrentUserService
+from src.api.auth.utils.get_token_from_header import get_token_from_header
+from src.config import settings
+
+
+async def get_user_from_google_token(
+        token: str = Depends(get_token_from_header),
+        current_user: CurrentUserService = Depends(get_current_user_service),
+) -> User:
+    return await current_user.get_current_user(token)
+
+def get_user_from_session_token(
+        claims: SessionClaims = Depends(get_session_claims),
+) -> UserRead:
+    return UserRead(
+        email=claims.email,
+        full_name=claims.full_name,
+        image=claims.image,
+        created_at=claims.created_at,
+    )
+
+get_authenticated_user = (
+    get_user_from_session_token
+    if settings.session_token_settings.session_token_enabled
+    else get_user_from_google_token
+)
\ No newline at end of file
@@ -1,5 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.api.auth.utils.decoder import Decoder
 from src.api.auth.utils.jose_decoder import JoseDecoder
+from src.api.auth.utils.jwks_decoder import JwksDecoder
+from src.api.auth.utils.jwks_key_set import JwksKeySet
+from src.config import settings
+from src.utils.dependencies import get_httpx_http_client
+
+
+jwks_key_set = JwksKeySet(
+    get_httpx_http_client,
+    settings.oauth_settings.google_jwks_url,
+    default_max_age=settings.oauth_settings.jwks_default_max_age,
+    min_refresh_interval=settings.oauth_settings.jwks_min_refresh_interval,
+    timeout=settings.oauth_settings.jwks_timeout,
+)
 
+id_token_verify_executor = (
+    ThreadPoolExecutor(
+        max_workers=settings.oauth_settings.id_token_verify_workers,
+        thread_name_prefix="id-token-verify",
+    )
+    if settings.oauth_settings.id_token_verify_workers > 0 else None
+)
 
 def get_jose_decoder() -> JoseDecoder:
-    return JoseDecoder()
\ No newline at end of file
+    return JoseDecoder()
+
+def get_jwks_decoder() -> JwksDecoder:
+    return JwksDecoder(
+        jwks_key_set,
+        audience=settings.oauth_settings.client_id,
+        issuers=settings.oauth_settings.google_issuers,
+        algorithms=settings.oauth_settings.id_token_algorithms,
+        executor=id_token_verify_executor,
+    )
+
+def get_id_token_decoder() -> Decoder:
+    if settings.oauth_settings.verify_id_token:
+        return get_jwks_decoder()
+    return get_jose_decoder()
\ No newline at end of file
@@ -0,0 +1,13 @@
+from datetime import timedelta
+
+from src.api.auth.services.token_purge_service import TokenPurgeService
+from src.database.database_helper import database_helper
+from src.config import settings
+
+
+token_purge_service = TokenPurgeService(
+    database_helper.new_session,
+    batch_size=settings.token_purge_settings.token_purge_batch_size,
+    batch_delay=settings.token_purge_settings.token_purge_batch_delay,
+    retention=timedelta(days=settings.token_purge_settings.token_purge_retention_days),
+)
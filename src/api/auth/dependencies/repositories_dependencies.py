@@ -15,4 +15,9 @@ def get_user_repository(
 def get_refresh_token_repository(
         session: AsyncSession = Depends(database_helper.session_depends),
 ) -> BaseRepository[RefreshToken]:
-    return BaseRepository(session, RefreshToken)
\ No newline at end of file
+    return BaseRepository(session, RefreshToken)
+
+def get_user_read_repository(
+        session: AsyncSession = Depends(database_helper.read_session_depends),
+) -> BaseRepository[User]:
+    return BaseRepository(session, User)
\ No newline at end of file
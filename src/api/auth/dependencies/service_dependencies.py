@@ -1,7 +1,7 @@
 from fastapi import Depends, Request, Response
 
 from src.api.auth.dependencies.repositories_dependencies import (
-    get_user_repository, get_refresh_token_repository
+    get_user_repository, get_refresh_token_repository,
 )
 from src.api.auth.models import User, RefreshToken
 from src.api.auth.services.current_user_service import CurrentUserService
@@ -19,8 +19,16 @@ from src.api.auth.dependencies.state_dependency import get_state_generator_hashl
 from src.api.auth.services.check_valid_token_service import CheckValidTokenService
 from src.api.auth.dependencies.state_dependency import get_state_compare_hmac
 from src.api.auth.services.exchange_code_to_token_service import ExchangeCodeToTokenService
-from src.api.auth.dependencies.decoder_dependencies import get_jose_decoder
-from src.api.auth.utils.jose_decoder import JoseDecoder
+from src.api.auth.dependencies.decoder_dependencies import get_id_token_decoder
+from src.api.auth.utils.decoder import Decoder
+from src.api.auth.dependencies.cache_dependencies import get_access_token_cache
+from src.api.auth.utils.token_validation_cache import TokenValidationCache
+from src.api.auth.services.session_token_service import SessionTokenService
+from src.api.auth.dependencies.session_dependencies import get_session_token_codec
+from src.api.auth.utils.session_token_codec import SessionTokenCodec
+from src.api.auth.services.user_export_service import UserExportService
+from src.database.database_helper import database_helper
+from src.config import settings
 
 
 def get_google_login_with_cookie_and_hashlib_service(
@@ -42,7 +50,7 @@ def get_exchange_code_to_token_with_httpx_and_cookie_service(
     return ExchangeCodeToTokenService(httpx_client)
 
 def get_user_save_service(
-        decoder: JoseDecoder = Depends(get_jose_decoder),
+        decoder: Decoder = Depends(get_id_token_decoder),
         repo: BaseRepository[User] = Depends(get_user_repository)
 ) -> UserSaveService:
     return UserSaveService(
@@ -63,8 +71,21 @@ def get_refresh_token_service(
     return RefreshTokenService(httpx_client, token_repo, user_repo)
 
 def get_current_user_service(
+        # token lookups stay on the primary: a lagging replica would reject fresh logins and accept logged-out tokens
         user_repo: BaseRepository[User] = Depends(get_user_repository),
-        token_repo: BaseRepository[RefreshToken] = Depends(get_refresh_token_repository),
         httpx_client: HttpxHttpClient = Depends(get_httpx_http_client),
+        token_cache: TokenValidationCache = Depends(get_access_token_cache),
 ) -> CurrentUserService:
-    return CurrentUserService(user_repo, token_repo, httpx_client)
\ No newline at end of file
+    return CurrentUserService(user_repo, httpx_client, token_cache)
+
+def get_session_token_service(
+        codec: SessionTokenCodec = Depends(get_session_token_codec),
+        user_repo: BaseRepository[User] = Depends(get_user_repository),
+) -> SessionTokenService:
+    return SessionTokenService(codec, user_repo)
+
+def get_user_export_service() -> UserExportService:
+    return UserExportService(
+        database_helper.read_session_maker(),
+        settings.database_settings.database_stream_fetch_size,
+    )
\ No newline at end of file
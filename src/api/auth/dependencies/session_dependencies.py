@@ -0,0 +1,23 @@
+from fastapi import Depends
+
+from src.api.auth.schemas import SessionClaims
+from src.api.auth.utils.get_token_from_header import get_token_from_header
+from src.api.auth.utils.session_token_codec import SessionTokenCodec
+from src.config import settings
+
+
+session_token_codec = SessionTokenCodec(
+    secret=settings.session_token_settings.session_token_secret,
+    algorithm=settings.session_token_settings.session_token_algorithm,
+    ttl=settings.session_token_settings.session_token_ttl,
+    issuer=settings.session_token_settings.session_token_issuer,
+)
+
+def get_session_token_codec() -> SessionTokenCodec:
+    return session_token_codec
+
+def get_session_claims(
+        token: str = Depends(get_token_from_header),
+        codec: SessionTokenCodec = Depends(get_session_token_codec),
+) -> SessionClaims:
+    return codec.verify(token)
\ No newline at end of file
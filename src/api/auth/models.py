@@ -1,7 +1,7 @@
 from typing import List
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, BigInteger
+from sqlalchemy import ForeignKey, BigInteger, Index, LargeBinary, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database.base import Base
@@ -12,17 +12,29 @@ class User(Base):
     full_name: Mapped[str] = mapped_column(nullable=True)
     image: Mapped[str] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.now, onupdate=datetime.now, nullable=True, index=True)
     user_oauth_id: Mapped[str] = mapped_column(unique=True, index=True)
 
     refresh_tokens: Mapped[List["RefreshToken"]] = relationship("RefreshToken", back_populates="user")
 
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+
 class RefreshToken(Base):
-    access_token: Mapped[str] = mapped_column(index=True)
+    access_token: Mapped[str] = mapped_column()
+    access_token_digest: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, index=True)
     expires_at: Mapped[datetime] = mapped_column()
-    refresh_token: Mapped[str] = mapped_column(unique=True, index=True)
+    refresh_token: Mapped[str] = mapped_column()
+    refresh_token_digest: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, index=True)
     provider: Mapped[str] = mapped_column(nullable=True, default="google")
     is_active: Mapped[bool] = mapped_column(default=False, index=True)
     token_type: Mapped[str] = mapped_column()
+    last_used_at: Mapped[datetime] = mapped_column(default=datetime.now, nullable=True, index=True)
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), unique=True, index=True)
+    user: Mapped[User] = relationship("User", back_populates="refresh_tokens")
 
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    user: Mapped[User] = relationship("User", back_populates="refresh_tokens")
\ No newline at end of file
+    __table_args__ = (
+        Index("ix_refreshtokens_inactive_id", "id", postgresql_where=text("NOT is_active")),
+    )
\ No newline at end of file
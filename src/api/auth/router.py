@@ -1,32 +1,43 @@
+from datetime import datetime
 from urllib.parse import urlencode
 
-from fastapi import APIRouter, Response, Request, Depends, HTTPException
-from starlette.responses import RedirectResponse
+from fastapi import APIRouter, Response, Request, Depends, HTTPException, Query
+from pydantic import TypeAdapter
+from starlette.responses import RedirectResponse, StreamingResponse
 
-from src.api.auth.dependencies.repositories_dependencies import get_user_repository, get_refresh_token_repository
+from src.api.auth.dependencies.repositories_dependencies import (
+    get_refresh_token_repository, get_user_read_repository
+)
 from src.api.auth.models import User, RefreshToken
-from src.api.auth.schemas import UserRead, Token
-from src.api.auth.services.current_user_service import CurrentUserService
+from src.api.auth.schemas import UserRead, Token, ExportFormat
+from src.api.auth.services.user_export_service import UserExportService
 from src.api.auth.services.exchange_code_to_token_service import ExchangeCodeToTokenService
 from src.api.auth.services.google_login_service import GoogleLoginService
 from src.api.auth.dependencies.service_dependencies import (
     get_google_login_with_cookie_and_hashlib_service, get_exchange_code_to_token_with_httpx_and_cookie_service,
-    get_user_save_service, get_save_token_service, get_refresh_token_service, get_current_user_service
+    get_user_save_service, get_save_token_service, get_refresh_token_service, get_session_token_service,
+    get_user_export_service,
 )
+from src.api.auth.dependencies.current_user_dependencies import get_authenticated_user
+from src.api.auth.services.session_token_service import SessionTokenService
 from src.api.auth.services.check_valid_token_service import CheckValidTokenService
 from src.api.auth.dependencies.service_dependencies import get_check_valid_token_with_cookie_and_hmac_service
 from src.api.auth.services.save_tokens_service import SaveTokensService
 from src.api.auth.services.save_user_service import UserSaveService
 from src.api.auth.services.refresh_token_service import RefreshTokenService
-from src.api.auth.utils.get_token_from_header import get_token_from_header
+from src.api.auth.utils.token_digest import token_digest
 from src.config import settings
 from src.database.base_repository import BaseRepository
 from src.storage.storage_manager import ResponseAwareStorageManager
-from src.pagination import PaginationModel
+from src.pagination import PaginationModel, CursorPaginationModel, TotalMode, encode_cursor, decode_cursor
 from src.utils.dependencies import get_cookie_storage_manager
 
 router = APIRouter(tags=["Google OAuth"])
 
+USER_READ_COLUMNS = list(UserRead.model_fields)
+users_page_adapter = TypeAdapter(PaginationModel[UserRead])
+users_cursor_page_adapter = TypeAdapter(CursorPaginationModel[UserRead])
+
 def set_response_to_storage(service, response: Response):
     storage = service.storage_manager
     if isinstance(storage, ResponseAwareStorageManager):
@@ -52,6 +63,7 @@ async def login_callback(
         exchange_service: ExchangeCodeToTokenService = Depends(get_exchange_code_to_token_with_httpx_and_cookie_service),
         user_save_service: UserSaveService = Depends(get_user_save_service),
         token_save_service: SaveTokensService = Depends(get_save_token_service),
+        session_token_service: SessionTokenService = Depends(get_session_token_service),
 ):
     try:
         check_valid_service.compare_token(state)
@@ -62,10 +74,16 @@ async def login_callback(
         user = await user_save_service.save_user(id_token)
         token = await token_save_service.save_or_update_token(response_google, user.id)
 
-        token_params = Token(
-            token_type=token.token_type,
-            access_token=token.access_token,
-        )
+        if settings.session_token_settings.session_token_enabled:
+            token_params = Token(
+                token_type=settings.oauth_settings.current_token_type,
+                access_token=session_token_service.issue(user, token.id),
+            )
+        else:
+            token_params = Token(
+                token_type=token.token_type,
+                access_token=token.access_token,
+            )
         query_params = urlencode(token_params.model_dump())
 
         url = settings.oauth_settings.path_to_front_success_login + query_params
@@ -87,37 +105,79 @@ async def auth_refresh(
         cookie_storage: ResponseAwareStorageManager = Depends(get_cookie_storage_manager),
         token_save_service: SaveTokensService = Depends(get_save_token_service),
         refresh_token_service: RefreshTokenService = Depends(get_refresh_token_service),
+        session_token_service: SessionTokenService = Depends(get_session_token_service),
 ):
     refresh_token = cookie_storage.get_(settings.oauth_settings.refresh_token_cookie_key)
     payload, user_id = await refresh_token_service.update_tokens(refresh_token)
     token = await token_save_service.save_or_update_token(payload, user_id)
 
+    if settings.session_token_settings.session_token_enabled:
+        return Token(
+            token_type=settings.oauth_settings.current_token_type,
+            access_token=await session_token_service.issue_for_user_id(user_id, token.id),
+        )
+
     return Token(
         token_type=token.token_type,
         access_token=token.access_token,
     )
 
-@router.get("/users")
+@router.get("/users", response_model=PaginationModel[UserRead])
 async def get_users(
         limit: int = 10,
         offset: int = 0,
-        token: str = Depends(get_token_from_header),
-        current_user: CurrentUserService = Depends(get_current_user_service),
-        user_repo: BaseRepository[User] = Depends(get_user_repository),
+        current_user: UserRead = Depends(get_authenticated_user),
+        user_repo: BaseRepository[User] = Depends(get_user_read_repository),
 ):
-    await current_user.get_current_user(token)
     count = await user_repo.count()
-    users = await user_repo.get_all(offset, limit)
-    users_pydantic = [UserRead.model_validate(user, from_attributes=True) for user in users]
-
-    return PaginationModel[UserRead](items=users_pydantic, total=count)
+    users = await user_repo.get_rows(USER_READ_COLUMNS, offset=offset, limit=limit)
+    page = users_page_adapter.validate_python({"items": users, "total": count})
+
+    return Response(users_page_adapter.dump_json(page), media_type="application/json")
+
+@router.get("/users/cursor", response_model=CursorPaginationModel[UserRead])
+async def get_users_by_cursor(
+        limit: int = Query(10, ge=1, le=100),
+        cursor: str | None = None,
+        total: TotalMode = TotalMode.NONE,
+        current_user: UserRead = Depends(get_authenticated_user),
+        user_repo: BaseRepository[User] = Depends(get_user_read_repository),
+):
+    after = decode_cursor(cursor) if cursor else None
+    users, next_values = await user_repo.get_by_cursor(after=after, limit=limit, columns=USER_READ_COLUMNS)
+
+    match total:
+        case TotalMode.EXACT:
+            count = await user_repo.count()
+        case TotalMode.ESTIMATED:
+            count = await user_repo.estimated_count()
+        case _:
+            count = None
+
+    page = users_cursor_page_adapter.validate_python(
+        {"items": users, "next_cursor": encode_cursor(next_values) if next_values else None, "total": count},
+    )
+    return Response(users_cursor_page_adapter.dump_json(page), media_type="application/json")
+
+@router.get("/users/export")
+async def export_users(
+        format: ExportFormat = ExportFormat.NDJSON,
+        created_since: datetime | None = None,
+        updated_since: datetime | None = None,
+        current_user: UserRead = Depends(get_authenticated_user),
+        export_service: UserExportService = Depends(get_user_export_service),
+):
+    return StreamingResponse(
+        export_service.export(format, created_since, updated_since),
+        media_type=export_service.media_type(format),
+        headers={"Content-Disposition": f'attachment; filename="users.{format.value}"'},
+    )
 
 @router.get("/current-user")
 async def get_current_user(
-        token: str = Depends(get_token_from_header),
-        current_user: CurrentUserService = Depends(get_current_user_service),
+        current_user: UserRead = Depends(get_authenticated_user),
 ) -> UserRead:
-    return await current_user.get_current_user(token)
+    return current_user
 
 @router.post("/auth/logout")
 async def logout(
@@ -136,7 +196,7 @@ async def logout(
     if not refresh_token:
         return
 
-    tokens = await token_repository.get_by_conditions(RefreshToken.refresh_token == refresh_token)
-    if tokens:
-        token = tokens[0]
-        await token_repository.update(token.id, {"is_active": False})
\ No newline at end of file
+    await token_repository.update_by_conditions(
+        {"is_active": False},
+        RefreshToken.refresh_token_digest == token_digest(refresh_token),
+    )
\ No newline at end of file
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 
 from pydantic import BaseModel
 
@@ -30,21 +31,59 @@ class UserCreate(BaseModel):
     full_name: str
     image: str
 
+class UserImport(BaseModel):
+    user_oauth_id: str
+    email: str
+    full_name: str | None = None
+    image: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
 class UserRead(BaseModel):
     email: str
-    full_name: str
-    image: str
+    full_name: str | None = None
+    image: str | None = None
     created_at: datetime
 
 class TokenSave(BaseModel):
     access_token: str
+    access_token_digest: bytes
     expires_at: datetime
     refresh_token: str | None = None
+    refresh_token_digest: bytes | None = None
     provider: str = "google"
     is_active: bool
     user_id: int
     token_type: str
+    last_used_at: datetime
 
 class Token(BaseModel):
     token_type: str
-    access_token: str
\ No newline at end of file
+    access_token: str
+
+class SessionClaims(BaseModel):
+    user_id: int
+    sub: str
+    session_id: int
+    email: str
+    full_name: str | None = None
+    image: str | None = None
+    created_at: datetime
+
+class UserExport(BaseModel):
+    id: int
+    user_oauth_id: str
+    email: str
+    full_name: str | None = None
+    image: str | None = None
+    created_at: datetime
+    updated_at: datetime | None = None
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class TokenPurgeReport(BaseModel):
+    purged: int
+    batches: int
+    elapsed: float
@@ -1,6 +1,7 @@
 from src.api.auth.utils.state_compare import StateCompare
 from src.storage.storage_manager import StorageManager
 from src.api.auth.services.google_service_mixin import GoogleServiceMixin
+from src.tracing.tracer import traced
 
 
 class CheckValidTokenService(GoogleServiceMixin):
@@ -12,6 +13,7 @@ class CheckValidTokenService(GoogleServiceMixin):
         super().__init__(storage_manager)
         self.state_compare = state_compare
 
+    @traced()
     def compare_token(self, google_token: str) -> None:
         saved_state = self._get_saved_state()
         self._compare_state(google_token, saved_state)
@@ -1,34 +1,41 @@
-from fastapi import Response
+from sqlalchemy import lambda_stmt, select, StatementLambdaElement
 
 from src.api.auth.models import User, RefreshToken
+from src.api.auth.utils.token_digest import token_digest
+from src.api.auth.utils.token_validation_cache import TokenValidationCache
 from src.database.base_repository import BaseRepository
-from src.exceptions import NotFoundRecordByIdError, UnauthorizeError
+from src.exceptions import UnauthorizeError, UpstreamServiceError
 from src.http_client.http_client import HttpClient
 from src.config import settings
+from src.tracing.tracer import traced
 
 
 class CurrentUserService:
     def __init__(
             self,
             user_repo: BaseRepository[User],
-            token_repo: BaseRepository[RefreshToken],
             http_client: HttpClient,
+            token_cache: TokenValidationCache,
     ):
         self.user_repo = user_repo
-        self.token_repo = token_repo
         self.http_client = http_client
+        self.token_cache = token_cache
 
         self.url = settings.oauth_settings.google_valid_access_token_url
+        self.timeout = settings.oauth_settings.google_valid_access_token_timeout
 
+    @traced()
     async def get_current_user(self, access_token: str) -> User:
         url_with_token = self._generate_url_with_token(access_token)
-        payload = await self._get_payload_current_user(url_with_token)
+        payload = await self.token_cache.get_or_load(
+            access_token,
+            lambda: self._get_payload_current_user(url_with_token),
+        )
 
         user_sub = str(payload.get("user_id"))
-        user = await self._get_user_by_sub(user_sub)
-
-        token = await self._get_token(user.id)
-        self._check_token_to_valid(token, access_token)
+        user = await self.user_repo.get_one_or_none(self._active_user_stmt(user_sub, access_token))
+        if user is None:
+            raise UnauthorizeError("Token is inactive or not found")
 
         return user
 
@@ -36,25 +43,24 @@ class CurrentUserService:
         return self.url + access_token
 
     async def _get_payload_current_user(self, url: str) -> dict:
-        response = await self.http_client.send_request("GET", url)
-        if response.status_code != 200:
+        response = await self.http_client.send_request("GET", url, timeout=self.timeout)
+        # only a rejected token is negative-cached; rate limits and outages must not lock valid tokens out
+        if response.status_code in (400, 401):
             raise UnauthorizeError("Invalid or expired access token")
+        if response.status_code != 200:
+            raise UpstreamServiceError("Google tokeninfo", response.status_code)
 
         return response.json()
 
-    async def _get_user_by_sub(self, user_sub: str) -> User:
-        user = await self.user_repo.get_by_conditions(User.user_oauth_id == user_sub)
-
-        if user is None:
-            raise NotFoundRecordByIdError(User.__name__, user_sub)
-
-        return user[0]
-
-    async def _get_token(self, user_id: int) -> RefreshToken:
-        token = await self.token_repo.get_by_conditions(RefreshToken.user_id == user_id)
-        return token[0]
-
     @staticmethod
-    def _check_token_to_valid(token: RefreshToken, access_token: str) -> None:
-        if not token or token.access_token != access_token or not token.is_active:
-            raise UnauthorizeError("Token is inactive or not found")
\ No newline at end of file
+    def _active_user_stmt(user_sub: str, access_token: str) -> StatementLambdaElement:
+        access_token_digest = token_digest(access_token)
+        return lambda_stmt(
+            lambda: select(User)
+            .join(RefreshToken, RefreshToken.user_id == User.id)
+            .where(
+                User.user_oauth_id == user_sub,
+                RefreshToken.access_token_digest == access_token_digest,
+                RefreshToken.is_active == True,
+            )
+        )
@@ -3,6 +3,7 @@ from src.http_client.http_client import HttpClient
 from src.config import settings
 from src.api.auth.schemas import ExchangeCode
 from src.storage.storage_manager import StorageManager
+from src.tracing.tracer import traced
 
 
 class ExchangeCodeToTokenService(GoogleServiceMixin):
@@ -19,7 +20,9 @@ class ExchangeCodeToTokenService(GoogleServiceMixin):
         self.grant_type = settings.oauth_settings.grant_type
 
         self.google_exchange_url = settings.oauth_settings.google_exchange_url
+        self.timeout = settings.oauth_settings.google_exchange_timeout
 
+    @traced()
     async def get_tokens(self, code: str) -> dict:
         params = self._fill_exchange_code_params(code)
 
@@ -40,6 +43,7 @@ class ExchangeCodeToTokenService(GoogleServiceMixin):
             "POST",
             self.google_exchange_url,
             data=params,
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=self.timeout,
         )
         return response.json()
\ No newline at end of file
@@ -8,6 +8,7 @@ from src.storage.storage_manager import StorageManager
 from src.config import settings
 from src.api.auth.schemas import LoginParams
 from src.api.auth.services.google_service_mixin import GoogleServiceMixin
+from src.tracing.tracer import traced
 
 
 class GoogleLoginService(GoogleServiceMixin):
@@ -22,6 +23,7 @@ class GoogleLoginService(GoogleServiceMixin):
         self.google_auth_url = settings.oauth_settings.google_auth_url
         self.state: str | None = None
 
+    @traced()
     def generate_response(self) -> Response:
         self.state = self._generate_state()
 
@@ -32,6 +34,7 @@ class GoogleLoginService(GoogleServiceMixin):
 
         return response
 
+    @traced()
     def save_state(self) -> None:
         self.storage_manager.set_(
             self.state_token_key,
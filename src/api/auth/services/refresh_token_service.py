@@ -1,7 +1,5 @@
 from typing import Sequence, Tuple
 
-from google.oauth2.reauth import refresh_grant
-
 from src.api.auth.schemas import UpdateTokenRequest
 from src.exceptions import NotFoundRecordByIdError
 from src.http_client.httpx_http_client import HttpxHttpClient
@@ -9,6 +7,8 @@ from src.config import settings
 from src.api.auth.models import RefreshToken, User
 from src.database.base_repository import BaseRepository
 from src.api.auth.exceptions import NotFoundToken
+from src.api.auth.utils.token_digest import token_digest
+from src.tracing.tracer import traced
 
 
 class RefreshTokenService:
@@ -24,10 +24,12 @@ class RefreshTokenService:
         self.client_id = settings.oauth_settings.client_id
         self.client_secret = settings.oauth_settings.client_secret
         self.url_to_update = settings.oauth_settings.google_exchange_url
+        self.timeout = settings.oauth_settings.google_exchange_timeout
 
         self.token_repository = token_repository
         self.user_repository = user_repository
 
+    @traced()
     async def update_tokens(self, refresh_token: str) -> Tuple[dict, int]:
         tokens = await self._find_token(refresh_token)
         token = self._get_refresh_token(tokens)
@@ -38,7 +40,7 @@ class RefreshTokenService:
 
     async def _find_token(self, refresh_token: str) -> Sequence[RefreshToken]:
         return await self.token_repository.get_by_conditions(
-            RefreshToken.refresh_token == refresh_token,
+            RefreshToken.refresh_token_digest == token_digest(refresh_token),
             RefreshToken.is_active == True,
         )
 
@@ -63,5 +65,6 @@ class RefreshTokenService:
             self.url_to_update,
             data=params,
             headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=self.timeout,
         )
         return response.json()
\ No newline at end of file
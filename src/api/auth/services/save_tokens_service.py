@@ -4,6 +4,9 @@ from datetime import datetime, timedelta
 from src.api.auth.models import RefreshToken
 from src.database.base_repository import BaseRepository
 from src.api.auth.schemas import TokenSave
+from src.api.auth.exceptions import NotFoundToken
+from src.api.auth.utils.token_digest import token_digest
+from src.tracing.tracer import traced
 
 
 class SaveTokensService:
@@ -15,26 +18,36 @@ class SaveTokensService:
     ):
         self.token_repository = token_repository
 
-    async def save_or_update_token(self, payload: dict, user_id: int):
-        tokens = await self.token_repository.get_by_conditions(
-            RefreshToken.user_id == user_id,
-        )
-
+    @traced()
+    async def save_or_update_token(self, payload: dict, user_id: int) -> RefreshToken:
         token = self._fill_token_schema(payload, user_id)
-        if tokens:
-            found_token = tokens[0]
-            return await self.token_repository.update(found_token.id, token)
+        if token["refresh_token"] is None:
+            return await self._update_token(token, user_id)
 
-        return await self.token_repository.create(token)
+        return await self.token_repository.upsert(token, conflict_columns=["user_id"])
+
+    async def _update_token(self, token: dict, user_id: int) -> RefreshToken:
+        updated_token = await self.token_repository.update_by_conditions(
+            token,
+            RefreshToken.user_id == user_id,
+        )
+        if updated_token is None:
+            raise NotFoundToken()
+        return updated_token
 
     def _fill_token_schema(self, payload: dict, user_id: int) -> dict:
+        access_token = payload.get("access_token")
+        refresh_token = payload.get("refresh_token", None)
         token = TokenSave(
-            access_token=payload.get("access_token"),
+            access_token=access_token,
+            access_token_digest=token_digest(access_token),
             expires_at=self._expires_calculator(payload.get("expires_in")),
-            refresh_token=payload.get("refresh_token", None),
+            refresh_token=refresh_token,
+            refresh_token_digest=token_digest(refresh_token) if refresh_token is not None else None,
             token_type=payload.get("token_type"),
             is_active=True,
             user_id=user_id,
+            last_used_at=datetime.now(),
         )
         return token.model_dump()
 
@@ -2,10 +2,11 @@ from src.api.auth.schemas import UserCreate
 from src.api.auth.utils.decoder import Decoder
 from src.api.auth.models import User
 from src.database.base_repository import BaseRepository
+from src.tracing.tracer import traced
 
 
 class UserSaveService:
-
+    PROFILE_FIELDS = ("full_name", "image")
 
     def __init__(
             self,
@@ -15,23 +16,14 @@ class UserSaveService:
         self.decoder = decoder
         self.user_repository = user_repository
 
+    @traced()
     async def save_user(self, token: str) -> User:
-        payload = self._get_payload(token)
-        user = await self._get_exist_user(payload.get("email"))
-        if user:
-            return user
-
-        new_user = self._fill_user_schema(payload)
-        return await self._create_new_user(new_user)
+        payload = await self._get_payload(token)
+        user = self._fill_user_schema(payload)
+        return await self._save_or_refresh_user(user)
 
-    def _get_payload(self, token: str) -> dict:
-        return self.decoder.decode(token)
-
-    async def _get_exist_user(self, email: str) -> User:
-        user = await self.user_repository.get_by_conditions(
-            User.email == email
-        )
-        return user[0] if user else None
+    async def _get_payload(self, token: str) -> dict:
+        return await self.decoder.adecode(token)
 
     @staticmethod
     def _fill_user_schema(payload: dict) -> dict:
@@ -43,5 +35,9 @@ class UserSaveService:
         )
         return user.model_dump()
 
-    async def _create_new_user(self, user: dict) -> User:
-        return await self.user_repository.create(user)
\ No newline at end of file
+    async def _save_or_refresh_user(self, user: dict) -> User:
+        return await self.user_repository.upsert(
+            user,
+            conflict_columns=["user_oauth_id"],
+            update_columns=self.PROFILE_FIELDS,
+        )
\ No newline at end of file
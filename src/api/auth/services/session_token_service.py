@@ -0,0 +1,37 @@
+from src.api.auth.models import User
+from src.api.auth.schemas import SessionClaims
+from src.api.auth.utils.session_token_codec import SessionTokenCodec
+from src.database.base_repository import BaseRepository
+from src.tracing.tracer import traced
+
+
+class SessionTokenService:
+    def __init__(
+            self,
+            codec: SessionTokenCodec,
+            user_repository: BaseRepository[User],
+    ):
+        self.codec = codec
+        self.user_repository = user_repository
+
+    @traced()
+    def issue(self, user: User, session_id: int) -> str:
+        claims = self._fill_claims_schema(user, session_id)
+        return self.codec.issue(claims)
+
+    @traced()
+    async def issue_for_user_id(self, user_id: int, session_id: int) -> str:
+        user = await self.user_repository.get_by_id(user_id)
+        return self.issue(user, session_id)
+
+    @staticmethod
+    def _fill_claims_schema(user: User, session_id: int) -> SessionClaims:
+        return SessionClaims(
+            user_id=user.id,
+            sub=user.user_oauth_id,
+            session_id=session_id,
+            email=user.email,
+            full_name=user.full_name,
+            image=user.image,
+            created_at=user.created_at,
+        )
\ No newline at end of file
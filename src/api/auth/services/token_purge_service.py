@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import or_, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.api.auth.models import RefreshToken
+from src.api.auth.schemas import TokenPurgeReport
+from src.database.base_repository import BaseRepository
+from src.tracing.tracer import traced
+
+
+logger = logging.getLogger("app.api.auth.services.token_purge_service")
+
+# every worker runs the purge loop; this Postgres advisory lock lets only one of them purge at a time
+ADVISORY_LOCK_KEY = 0x70757267
+
+class TokenPurgeService:
+    def __init__(
+            self,
+            session_maker: Callable[[], AsyncSession],
+            *,
+            batch_size: int,
+            batch_delay: float,
+            retention: timedelta,
+    ):
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.retention = retention
+
+        self._task: asyncio.Task | None = None
+
+    @traced()
+    async def purge(self) -> TokenPurgeReport:
+        started_at = time.perf_counter()
+        # expires_at is the access token's expiry; the refresh token on the same row outlives it
+        unused_since = datetime.now() - self.retention
+        purged = batches = 0
+
+        while True:
+            async with self.session_maker() as session:
+                deleted = await BaseRepository(session, RefreshToken).delete_by_conditions(
+                    or_(RefreshToken.is_active == False, RefreshToken.last_used_at < unused_since),
+                    limit=self.batch_size,
+                )
+            purged += deleted
+            batches += 1
+            if deleted < self.batch_size:
+                break
+            await asyncio.sleep(self.batch_delay)
+
+        report = TokenPurgeReport(purged=purged, batches=batches, elapsed=time.perf_counter() - started_at)
+        logger.info(f"Purged {report.purged} refresh tokens in {report.batches} batches, {report.elapsed:.2f}s")
+        return report
+
+    async def purge_exclusive(self) -> TokenPurgeReport | None:
+        async with self.session_maker() as session:
+            # autocommit, so holding the lock does not keep a transaction open for the whole purge
+            connection = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+            if not await self._try_lock(connection):
+                logger.debug("Refresh token purge skipped, another process holds the lock")
+                return None
+            try:
+                return await self.purge()
+            finally:
+                await self._unlock(connection)
+
+    def start(self, interval: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.purge_exclusive()
+            except Exception as e:
+                logger.warning(f"Refresh token purge failed: {e}")
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    async def _try_lock(connection: AsyncConnection) -> bool:
+        if connection.dialect.name != "postgresql":
+            return True
+        return await connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+
+    @staticmethod
+    async def _unlock(connection: AsyncConnection) -> None:
+        if connection.dialect.name == "postgresql":
+            await connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
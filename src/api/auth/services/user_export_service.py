@@ -0,0 +1,81 @@
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Sequence, Any, Dict
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.api.auth.models import User
+from src.api.auth.schemas import UserExport, ExportFormat
+from src.database.base_repository import BaseRepository
+
+
+user_export_adapter = TypeAdapter(UserExport)
+
+class UserExportService:
+    COLUMNS = list(UserExport.model_fields)
+    MEDIA_TYPES = {
+        ExportFormat.NDJSON: "application/x-ndjson",
+        ExportFormat.CSV: "text/csv",
+    }
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker,
+            fetch_size: int,
+    ):
+        self.session_maker = session_maker
+        self.fetch_size = fetch_size
+
+    def media_type(self, export_format: ExportFormat) -> str:
+        return self.MEDIA_TYPES[export_format]
+
+    async def export(
+            self,
+            export_format: ExportFormat,
+            created_since: datetime | None = None,
+            updated_since: datetime | None = None,
+    ) -> AsyncIterator[bytes]:
+        if export_format == ExportFormat.CSV:
+            yield self._csv_header()
+
+        async for batch in self._stream_batches(self._get_conditions(created_since, updated_since)):
+            match export_format:
+                case ExportFormat.CSV:
+                    yield self._to_csv(batch)
+                case _:
+                    yield self._to_ndjson(batch)
+
+    async def _stream_batches(self, conditions: list) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+        async with self.session_maker() as session:
+            repository = BaseRepository(session, User)
+            async for batch in repository.stream_batches(self.COLUMNS, *conditions, fetch_size=self.fetch_size):
+                yield batch
+
+    @staticmethod
+    def _get_conditions(created_since: datetime | None, updated_since: datetime | None) -> list:
+        conditions = []
+        if created_since is not None:
+            conditions.append(User.created_at >= created_since)
+        if updated_since is not None:
+            conditions.append(User.updated_at >= updated_since)
+        return conditions
+
+    def _to_ndjson(self, batch: Sequence[Dict[str, Any]]) -> bytes:
+        return b"".join(
+            user_export_adapter.dump_json(user_export_adapter.validate_python(row)) + b"\n" for row in batch
+        )
+
+    def _to_csv(self, batch: Sequence[Dict[str, Any]]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.COLUMNS)
+        writer.writerows(
+            user_export_adapter.dump_python(user_export_adapter.validate_python(row), mode="json") for row in batch
+        )
+        return buffer.getvalue().encode()
+
+    def _csv_header(self) -> bytes:
+        buffer = io.StringIO()
+        csv.DictWriter(buffer, fieldnames=self.COLUMNS).writeheader()
+        return buffer.getvalue().encode()
\ No newline at end of file
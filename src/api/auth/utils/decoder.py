@@ -4,4 +4,7 @@ from abc import ABC, abstractmethod
 class Decoder(ABC):
     @abstractmethod
     def decode(self, token: str) -> dict:
-        ...
\ No newline at end of file
+        ...
+
+    async def adecode(self, token: str) -> dict:
+        return self.decode(token)
\ No newline at end of file
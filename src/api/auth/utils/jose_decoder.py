@@ -1,8 +1,5 @@
 import logging
 
-from jose import jwt
-from jose.exceptions import JWTError
-
 from src.api.auth.utils.decoder import Decoder
 from src.exceptions import InternalServerError
 
@@ -11,6 +8,9 @@ logger = logging.getLogger("app.api.auth.utils.jose_decoder")
 
 class JoseDecoder(Decoder):
     def decode(self, token: str) -> dict:
+        from jose import jwt
+        from jose.exceptions import JWTError
+
         try:
             return jwt.get_unverified_claims(token)
         except JWTError as e:
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Sequence, TYPE_CHECKING
+
+from src.api.auth.utils.decoder import Decoder
+from src.api.auth.utils.jwks_key_set import JwksKeySet
+from src.exceptions import UnauthorizeError
+
+
+if TYPE_CHECKING:
+    from jose.backends.base import Key
+
+
+logger = logging.getLogger("app.api.auth.utils.jwks_decoder")
+
+class JwksDecoder(Decoder):
+    def __init__(
+            self,
+            key_set: JwksKeySet,
+            audience: str,
+            issuers: Sequence[str],
+            algorithms: Sequence[str],
+            executor: Executor | None = None,
+    ):
+        self.key_set = key_set
+        self.audience = audience
+        self.issuers = tuple(issuers)
+        self.algorithms = list(algorithms)
+        self.executor = executor
+
+    def decode(self, token: str) -> dict:
+        kid = self._get_kid(token)
+        return self._verify(token, self.key_set.get_cached_key(kid))
+
+    async def adecode(self, token: str) -> dict:
+        kid = self._get_kid(token)
+        key = await self.key_set.get_key(kid)
+        if self.executor is None:
+            return self._verify(token, key)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._verify, token, key)
+
+    @staticmethod
+    def _get_kid(token: str) -> str:
+        from jose import jwt
+        from jose.exceptions import JWTError
+
+        try:
+            return jwt.get_unverified_header(token).get("kid")
+        except JWTError as e:
+            logger.warning(f"Error: {e}")
+            raise UnauthorizeError("Invalid id token")
+
+    def _verify(self, token: str, key: "Key | None") -> dict:
+        from jose import jwt
+        from jose.exceptions import JWTError
+
+        if key is None:
+            logger.warning("id token signed with an unknown key")
+            raise UnauthorizeError("Invalid id token")
+
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=self.algorithms,
+                audience=self.audience,
+                issuer=self.issuers,
+                options={"verify_at_hash": False},
+            )
+        except JWTError as e:
+            logger.warning(f"Error: {e}")
+            raise UnauthorizeError("Invalid id token")
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Callable, TYPE_CHECKING
+
+from src.http_client.http_client import HttpClient
+
+if TYPE_CHECKING:
+    from jose.backends.base import Key
+
+
+logger = logging.getLogger("app.api.auth.utils.jwks_key_set")
+
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+class JwksKeySet:
+    REFRESH_AHEAD_RATIO = 0.9
+
+    def __init__(
+            self,
+            http_client_factory: Callable[[], HttpClient],
+            url: str,
+            *,
+            default_max_age: float,
+            min_refresh_interval: float,
+            timeout: float | None = None,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self.http_client_factory = http_client_factory
+        self.url = url
+        self.default_max_age = default_max_age
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.clock = clock
+
+        self._keys: dict[str, "Key"] = {}
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._last_refresh: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    async def get_key(self, kid: str) -> "Key | None":
+        if self._is_stale() and self._can_refresh():
+            await self.refresh()
+
+        key = self._keys.get(kid)
+        if key is None and self._can_refresh():
+            await self.refresh()
+            key = self._keys.get(kid)
+
+        self._refresh_ahead_if_needed()
+        return key
+
+    def get_cached_key(self, kid: str) -> "Key | None":
+        key = self._keys.get(kid)
+        if key is None or self._is_stale():
+            if self._can_refresh():
+                self._schedule_refresh()
+        else:
+            self._refresh_ahead_if_needed()
+        return key
+
+    async def refresh(self) -> None:
+        await asyncio.shield(self._schedule_refresh())
+
+    def _schedule_refresh(self) -> asyncio.Task | None:
+        if self._refresh_task is None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return None
+            self._refresh_task = asyncio.ensure_future(self._fetch())
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+        return self._refresh_task
+
+    async def _fetch(self) -> None:
+        self._last_refresh = self.clock()
+        try:
+            response = await self.http_client_factory().send_request("GET", self.url, timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f"JWKS fetch from {self.url} failed: {e}")
+            self._back_off()
+            return
+
+        if response.status_code != 200:
+            logger.warning(f"JWKS fetch from {self.url} returned {response.status_code}")
+            self._back_off()
+            return
+
+        self._keys = self._construct_keys(response.json())
+        max_age = self._parse_max_age(response.headers)
+        now = self.clock()
+        self._expires_at = now + max_age
+        self._refresh_at = now + max_age * self.REFRESH_AHEAD_RATIO
+
+    def _back_off(self) -> None:
+        # keep serving the keys we have and retry no sooner than min_refresh_interval
+        self._refresh_at = self.clock() + self.min_refresh_interval
+        self._expires_at = max(self._expires_at, self._refresh_at)
+
+    def _on_refresh_done(self, task: asyncio.Task) -> None:
+        self._refresh_task = None
+        if not task.cancelled():
+            task.exception()
+
+    def _refresh_ahead_if_needed(self) -> None:
+        if self._refresh_at <= self.clock() < self._expires_at and self._can_refresh():
+            self._schedule_refresh()
+
+    def _is_stale(self) -> bool:
+        return self.clock() >= self._expires_at
+
+    def _can_refresh(self) -> bool:
+        if self._last_refresh is None:
+            return True
+        return self.clock() - self._last_refresh >= self.min_refresh_interval
+
+    def _parse_max_age(self, headers) -> float:
+        match = MAX_AGE_PATTERN.search(headers.get("cache-control", ""))
+        if match is None:
+            return self.default_max_age
+
+        age = headers.get("age", "0")
+        return max(float(match.group(1)) - float(age if age.isdigit() else 0), 0.0)
+
+    @staticmethod
+    def _construct_keys(jwks: dict) -> dict[str, "Key"]:
+        from jose import jwk
+
+        keys = {}
+        for key_data in jwks.get("keys", []):
+            try:
+                keys[key_data["kid"]] = jwk.construct(key_data, key_data.get("alg", "RS256"))
+            except Exception as e:
+                logger.warning(f"Skipping unusable JWK {key_data.get('kid')}: {e}")
+        return keys
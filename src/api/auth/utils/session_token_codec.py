@@ -0,0 +1,66 @@
+import logging
+import time
+from typing import Callable
+
+from pydantic import ValidationError
+
+from src.api.auth.schemas import SessionClaims
+from src.exceptions import UnauthorizeError
+
+
+logger = logging.getLogger("app.api.auth.utils.session_token_codec")
+
+class SessionTokenCodec:
+    TOKEN_USE = "session"
+
+    def __init__(
+            self,
+            secret: str,
+            algorithm: str,
+            ttl: int,
+            issuer: str,
+            clock: Callable[[], float] = time.time,
+    ):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.ttl = ttl
+        self.issuer = issuer
+        self.clock = clock
+
+    def issue(self, claims: SessionClaims) -> str:
+        from jose import jwt
+
+        issued_at = int(self.clock())
+        payload = claims.model_dump(mode="json")
+        payload.update(
+            iss=self.issuer,
+            iat=issued_at,
+            exp=issued_at + self.ttl,
+            token_use=self.TOKEN_USE,
+        )
+        return jwt.encode(payload, self.secret, algorithm=self.algorithm)
+
+    def verify(self, token: str) -> SessionClaims:
+        from jose import jwt
+        from jose.exceptions import JWTError
+
+        try:
+            payload = jwt.decode(
+                token,
+                self.secret,
+                algorithms=[self.algorithm],
+                issuer=self.issuer,
+                options={"verify_aud": False},
+            )
+        except JWTError as e:
+            logger.warning(f"Error: {e}")
+            raise UnauthorizeError("Invalid or expired session token")
+
+        if payload.get("token_use") != self.TOKEN_USE:
+            raise UnauthorizeError("Invalid or expired session token")
+
+        try:
+            return SessionClaims.model_validate(payload)
+        except ValidationError as e:
+            logger.warning(f"Error: {e}")
+            raise UnauthorizeError("Invalid or expired session token")
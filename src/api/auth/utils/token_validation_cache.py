@@ -0,0 +1,108 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from src.exceptions import UnauthorizeError
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    payload: dict | None
+    error_message: str | None
+    expires_at: float
+
+class TokenValidationCache:
+    def __init__(
+            self,
+            max_size: int,
+            ttl: float,
+            negative_ttl: float,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+    async def get_or_load(self, access_token: str, loader: Callable[[], Awaitable[dict]]) -> dict:
+        key = self._make_key(access_token)
+
+        entry = self._get_entry(key)
+        if entry is not None:
+            return self._unwrap(entry)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            task.add_done_callback(self._mark_exception_retrieved)
+            self._in_flight[key] = task
+
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[dict]]) -> dict:
+        try:
+            payload = await loader()
+        except UnauthorizeError as error:
+            self._store(key, CacheEntry(None, error.message, self.clock() + self.negative_ttl))
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+        ttl = self._get_ttl(payload)
+        if ttl > 0:
+            self._store(key, CacheEntry(payload, None, self.clock() + ttl))
+        return payload
+
+    def _get_entry(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires_at <= self.clock():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        if self.max_size <= 0:
+            return
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _get_ttl(self, payload: dict) -> float:
+        expires_in = payload.get("expires_in")
+        if expires_in is None:
+            return self.ttl
+        return min(self.ttl, float(expires_in))
+
+    @staticmethod
+    def _unwrap(entry: CacheEntry) -> dict:
+        if entry.payload is None:
+            raise UnauthorizeError(entry.error_message)
+        return entry.payload
+
+    @staticmethod
+    def _make_key(access_token: str) -> str:
+        return hashlib.sha256(access_token.encode()).hexdigest()
+
+    @staticmethod
+    def _mark_exception_retrieved(task: asyncio.Task) -> None:
+        if not task.cancelled():
+            task.exception()
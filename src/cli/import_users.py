@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Iterator, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.api.auth.models import User
+from src.api.auth.schemas import UserImport, ExportFormat
+from src.database.base_repository import BaseRepository
+
+
+COLUMNS = list(UserImport.model_fields)
+
+class ImportProgress:
+    def __init__(self, output: TextIO):
+        self.output = output
+        self.started_at = time.perf_counter()
+        self.imported = 0
+        self.skipped = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = time.perf_counter() - self.started_at
+        return self.imported / elapsed if elapsed > 0 else 0.0
+
+    def report(self, final: bool = False) -> None:
+        prefix = "done" if final else "progress"
+        self.output.write(
+            f"{prefix}: imported={self.imported} skipped={self.skipped} "
+            f"elapsed={time.perf_counter() - self.started_at:.1f}s rate={self.rows_per_second:.0f} rows/s\n"
+        )
+        self.output.flush()
+
+def read_rows(stream: TextIO, import_format: ExportFormat) -> Iterator[dict]:
+    if import_format == ExportFormat.CSV:
+        for row in csv.DictReader(stream):
+            yield {key: value or None for key, value in row.items()}
+        return
+
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+def to_records(rows: Iterator[dict], progress: ImportProgress, skip_invalid: bool) -> Iterator[tuple]:
+    for line_number, row in enumerate(rows, start=1):
+        try:
+            user = UserImport.model_validate(row)
+        except ValidationError as e:
+            if not skip_invalid:
+                raise ValueError(f"Invalid row {line_number}: {e}") from e
+            progress.skipped += 1
+            continue
+
+        created_at = user.created_at or datetime.now()
+        yield (
+            user.user_oauth_id,
+            user.email,
+            user.full_name,
+            user.image,
+            created_at,
+            user.updated_at or created_at,
+        )
+
+async def import_users(
+        stream: TextIO,
+        import_format: ExportFormat,
+        session_maker: async_sessionmaker,
+        *,
+        batch_size: int = 5000,
+        use_copy: bool = True,
+        skip_invalid: bool = False,
+        progress_output: TextIO = sys.stderr,
+) -> ImportProgress:
+    progress = ImportProgress(progress_output)
+    records = to_records(read_rows(stream, import_format), progress, skip_invalid)
+
+    async with session_maker() as session:
+        repository = BaseRepository(session, User)
+        while batch := list(islice(records, batch_size)):
+            if use_copy:
+                progress.imported += await repository.copy_records(COLUMNS, batch)
+            else:
+                progress.imported += await repository.bulk_create(
+                    (dict(zip(COLUMNS, record)) for record in batch), chunk_size=batch_size
+                )
+            progress.report()
+
+    progress.report(final=True)
+    return progress
+
+def detect_format(path: str, requested: str | None) -> ExportFormat:
+    if requested:
+        return ExportFormat(requested)
+    return ExportFormat.CSV if path.endswith(".csv") else ExportFormat.NDJSON
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream NDJSON or CSV users into the users table")
+    parser.add_argument("path", help="input file, or - for stdin")
+    parser.add_argument("--format", choices=[item.value for item in ExportFormat])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--no-copy", action="store_true", help="use batched INSERTs instead of COPY")
+    parser.add_argument("--skip-invalid", action="store_true", help="skip rows that fail validation")
+    args = parser.parse_args()
+
+    from src.database.database_helper import database_helper
+
+    import_format = detect_format(args.path, args.format)
+    stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8", newline="")
+
+    async def run() -> None:
+        try:
+            await import_users(
+                stream,
+                import_format,
+                database_helper.session_maker,
+                batch_size=args.batch_size,
+                use_copy=not args.no_copy,
+                skip_invalid=args.skip_invalid,
+            )
+        finally:
+            await database_helper.close()
+
+    with stream:
+        asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import asyncio
+from datetime import timedelta
+
+from src.api.auth.services.token_purge_service import TokenPurgeService
+from src.config import settings
+
+
+def main() -> None:
+    purge_settings = settings.token_purge_settings
+    parser = argparse.ArgumentParser(description="Delete inactive and long-unused refresh tokens in batches")
+    parser.add_argument("--batch-size", type=int, default=purge_settings.token_purge_batch_size)
+    parser.add_argument("--batch-delay", type=float, default=purge_settings.token_purge_batch_delay,
+                        help="seconds to pause between batches")
+    parser.add_argument("--retention-days", type=int, default=purge_settings.token_purge_retention_days)
+    args = parser.parse_args()
+
+    from src.database.database_helper import database_helper
+
+    async def run() -> None:
+        service = TokenPurgeService(
+            database_helper.session_maker,
+            batch_size=args.batch_size,
+            batch_delay=args.batch_delay,
+            retention=timedelta(days=args.retention_days),
+        )
+        try:
+            report = await service.purge()
+        finally:
+            await database_helper.close()
+        print(report.model_dump_json())
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
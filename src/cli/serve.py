@@ -0,0 +1,125 @@
+import argparse
+import logging
+import os
+import random
+import shutil
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from src.config import settings, DataBaseSettings, HttpClientSettings, MetricsSettings, ServerSettings
+from src.logs import setup_logging
+
+
+logger = logging.getLogger("app.cli.serve")
+
+APP = "src.main:app"
+
+class RecyclingServer(uvicorn.Server):
+    def __init__(self, config: uvicorn.Config, max_requests_jitter: int = 0):
+        super().__init__(config)
+        self.max_requests_jitter = max_requests_jitter
+
+    def run(self, sockets=None) -> None:
+        # runs inside each spawned worker: spread the recycle points so workers do not all restart at once
+        if self.config.limit_max_requests is not None and self.max_requests_jitter:
+            self.config.limit_max_requests += random.randint(0, self.max_requests_jitter)
+        super().run(sockets)
+
+def worker_count(requested: int) -> int:
+    if requested > 0:
+        return requested
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def split_pools(
+        workers: int,
+        database_settings: DataBaseSettings,
+        http_settings: HttpClientSettings,
+        server_settings: ServerSettings,
+) -> dict[str, str]:
+    budget = server_settings.server_postgres_max_connections - server_settings.server_postgres_reserved_connections
+    per_worker = budget // workers
+    if per_worker < 1:
+        raise ValueError(
+            f"{workers} workers cannot share {budget} Postgres connections; "
+            f"lower server_workers or raise server_postgres_max_connections"
+        )
+
+    pool_size = min(database_settings.database_pool_size, per_worker)
+    max_overflow = min(database_settings.database_max_overflow, per_worker - pool_size)
+    http_max_connections = max(http_settings.http_max_connections // workers, 1)
+    http_keepalive = min(http_settings.http_max_keepalive_connections, http_max_connections)
+
+    return {
+        "DATABASE_POOL_SIZE": str(pool_size),
+        "DATABASE_MAX_OVERFLOW": str(max_overflow),
+        "DATABASE_WARMUP_CONNECTIONS": str(min(database_settings.database_warmup_connections, pool_size)),
+        "HTTP_MAX_CONNECTIONS": str(http_max_connections),
+        "HTTP_MAX_KEEPALIVE_CONNECTIONS": str(http_keepalive),
+    }
+
+def prepare_metrics_directory(metrics_settings: MetricsSettings) -> dict[str, str]:
+    if not metrics_settings.metrics_enabled:
+        return {}
+    # files left by a previous run would be summed into this run's counters
+    directory = metrics_settings.metrics_multiprocess_dir
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    return {"PROMETHEUS_MULTIPROC_DIR": directory}
+
+def build_config(args: argparse.Namespace, workers: int) -> uvicorn.Config:
+    server_settings = settings.server_settings
+    return uvicorn.Config(
+        APP,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=server_settings.server_loop,
+        http=server_settings.server_http,
+        backlog=server_settings.server_backlog,
+        timeout_keep_alive=server_settings.server_keepalive_timeout,
+        timeout_graceful_shutdown=server_settings.server_graceful_timeout,
+        limit_max_requests=args.max_requests,
+    )
+
+def main() -> None:
+    server_settings = settings.server_settings
+    parser = argparse.ArgumentParser(description="Run the API with a pre-forked pool of uvicorn workers")
+    parser.add_argument("--host", default=server_settings.server_host)
+    parser.add_argument("--port", type=int, default=server_settings.server_port)
+    parser.add_argument("--workers", type=int, default=server_settings.server_workers,
+                        help="0 uses every CPU available to the process")
+    parser.add_argument("--max-requests", type=int, default=server_settings.server_max_requests,
+                        help="recycle a worker after this many requests")
+    args = parser.parse_args()
+    setup_logging()
+
+    workers = worker_count(args.workers)
+    pool_environment = split_pools(
+        workers,
+        settings.database_settings,
+        settings.http_client_settings,
+        server_settings,
+    )
+    # workers are spawned, so they re-read settings from the environment they inherit
+    os.environ.update(pool_environment)
+    os.environ.update(prepare_metrics_directory(settings.metrics_settings))
+
+    if workers > 1 and settings.logging_settings.logging_rotation != "none":
+        logger.warning(
+            f"logging_rotation={settings.logging_settings.logging_rotation} with {workers} workers: "
+            f"each worker rotates {settings.logging_settings.logging_file_path} on its own and lines will be lost; "
+            f"leave rotation to the platform"
+        )
+
+    config = build_config(args, workers)
+    server = RecyclingServer(config, server_settings.server_max_requests_jitter)
+    logger.info(f"Starting {workers} workers on {args.host}:{args.port} with {pool_environment}")
+
+    sock = config.bind_socket()
+    Multiprocess(config, target=server.run, sockets=[sock]).run()
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,33 @@
+from typing import Literal
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
 class DataBaseSettings(BaseSettings):
     database_url: str
     database_echo: bool
+    database_stream_fetch_size: int = 1000
+    database_unit_of_work: bool = True
+    database_query_stats_enabled: bool = True
+    database_slow_query_threshold: float = 0.2
+    database_n_plus_one_threshold: int = 10
+
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800
+    database_pool_pre_ping: bool = True
+    database_statement_cache_size: int = 100
+    database_server_settings: dict[str, str] = {}
+    database_warmup_connections: int = 0
+    database_pgbouncer: bool = False
+
+    database_replica_urls: list[str] = []
+    database_replica_routing: Literal["round_robin", "least_connections"] = "round_robin"
+    database_replica_max_lag: float = 5.0
+    database_replica_health_interval: float = 5.0
+    database_replica_health_timeout: float = 2.0
 
     class Config:
         env_file = ".env.backend"
@@ -20,10 +44,26 @@ class OAuthSettings(BaseSettings):
     google_auth_url: str = "https://accounts.google.com/o/oauth2/v2/auth?"
     google_exchange_url: str = "https://oauth2.googleapis.com/token"
     google_valid_access_token_url: str = "https://www.googleapis.com/oauth2/v1/tokeninfo?access_token="
+    google_jwks_url: str = "https://www.googleapis.com/oauth2/v3/certs"
+    google_issuers: list[str] = ["https://accounts.google.com", "accounts.google.com"]
 
     client_id: str
     client_secret: str
 
+    google_exchange_timeout: float = 10.0
+    google_valid_access_token_timeout: float = 5.0
+
+    access_token_cache_size: int = 10000
+    access_token_cache_ttl: float = 300.0
+    access_token_negative_cache_ttl: float = 5.0
+
+    verify_id_token: bool = True
+    id_token_algorithms: list[str] = ["RS256"]
+    jwks_default_max_age: float = 3600.0
+    jwks_min_refresh_interval: float = 30.0
+    jwks_timeout: float = 5.0
+    id_token_verify_workers: int = 0
+
     grant_type: str = "authorization_code"
     grant_type_refresh: str = "refresh_token"
 
@@ -31,8 +71,126 @@ class OAuthSettings(BaseSettings):
         env_file = ".env.backend"
         extra = "allow"
 
+class HttpClientSettings(BaseSettings):
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_http2: bool = False
+    http_timeout: float = 60.0
+    http_connect_timeout: float = 30.0
+
+    class Config:
+        env_file = ".env.backend"
+        extra = "allow"
+
+class SessionTokenSettings(BaseSettings):
+    session_token_enabled: bool = False
+    session_token_secret: str = ""
+    session_token_algorithm: Literal["HS256", "HS384", "HS512"] = "HS256"
+    session_token_ttl: int = 300
+    session_token_issuer: str = "oauth-fastapi"
+
+    @model_validator(mode="after")
+    def check_secret(self) -> "SessionTokenSettings":
+        if self.session_token_enabled and not self.session_token_secret:
+            raise ValueError("session_token_secret is required when session tokens are enabled")
+        return self
+
+    class Config:
+        env_file = ".env.backend"
+        extra = "allow"
+
+class TokenPurgeSettings(BaseSettings):
+    token_purge_enabled: bool = False
+    token_purge_interval: float = 3600.0
+    token_purge_batch_size: int = 1000
+    token_purge_batch_delay: float = 0.1
+    token_purge_retention_days: int = 180
+
+    class Config:
+        env_file = ".env.backend"
+        extra = "allow"
+
+class MetricsSettings(BaseSettings):
+    metrics_enabled: bool = True
+    metrics_path: str = "/metrics"
+    metrics_multiprocess_dir: str = "/tmp/prometheus-multiproc"
+
+    class Config:
+        env_file = ".env.backend"
+        extra = "allow"
+
+class TracingSettings(BaseSettings):
+    tracing_enabled: bool = False
+    tracing_sample_rate: float = 0.1
+    tracing_exporter: Literal["file", "otlp"] = "file"
+    tracing_file_path: str = "logs/traces.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318"
+    tracing_service_name: str = "oauth-fastapi"
+    tracing_max_queue_size: int = 2048
+    tracing_max_batch_size: int = 512
+    tracing_export_interval: float = 5.0
+    tracing_propagate_hosts: list[str] = []
+
+    class Config:
+        env_file = ".env.backend"
+        extra = "allow"
+
+class ServerSettings(BaseSettings):
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 0
+    server_loop: Literal["auto", "asyncio", "uvloop"] = "auto"
+    server_http: Literal["auto", "h11", "httptools"] = "auto"
+    server_backlog: int = 2048
+    server_keepalive_timeout: int = 5
+    server_graceful_timeout: int = 30
+    server_max_requests: int | None = None
+    server_max_requests_jitter: int = 0
+    server_postgres_max_connections: int = 100
+    server_postgres_reserved_connections: int = 10
+
+    class Config:
+        env_file = ".env.backend"
+        extra = "allow"
+
+class LoggingSettings(BaseSettings):
+    logging_queue_enabled: bool = True
+    logging_queue_size: int = 10000
+    logging_json: bool = False
+    logging_file_path: str = "logs/app.log"
+    logging_rotation: Literal["none", "size", "time"] = "none"
+    logging_max_bytes: int = 10 * 1024 * 1024
+    logging_rotation_when: str = "midnight"
+    logging_backup_count: int = 5
+    logging_rate_limits: dict[str, int] = {}
+    logging_rate_limit_interval: float = 60.0
+    logging_sample_rates: dict[str, float] = {}
+
+    class Config:
+        env_file = ".env.backend"
+        extra = "allow"
+
+class LoopWatchdogSettings(BaseSettings):
+    loop_watchdog_enabled: bool = False
+    loop_watchdog_threshold: float = 0.1
+    loop_watchdog_interval: float = 0.05
+    loop_watchdog_debug: bool = False
+
+    class Config:
+        env_file = ".env.backend"
+        extra = "allow"
+
 class Settings:
     database_settings: DataBaseSettings = DataBaseSettings()
     oauth_settings: OAuthSettings = OAuthSettings()
+    http_client_settings: HttpClientSettings = HttpClientSettings()
+    session_token_settings: SessionTokenSettings = SessionTokenSettings()
+    token_purge_settings: TokenPurgeSettings = TokenPurgeSettings()
+    metrics_settings: MetricsSettings = MetricsSettings()
+    tracing_settings: TracingSettings = TracingSettings()
+    server_settings: ServerSettings = ServerSettings()
+    logging_settings: LoggingSettings = LoggingSettings()
+    loop_watchdog_settings: LoopWatchdogSettings = LoopWatchdogSettings()
 
 settings = Settings()
\ No newline at end of file
@@ -1,16 +1,30 @@
-from typing import Type, Sequence, Generic, Dict, Any
+from datetime import datetime
+from itertools import islice
+from typing import Type, Sequence, Generic, Dict, Any, Callable, Tuple, AsyncIterator, Iterable, Iterator
 import logging
 
-from sqlalchemy import select, func, Select
+from sqlalchemy import select, func, insert, update, delete, text, tuple_, Select, Executable
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.types import ModelType, ID
-from src.exceptions import NotFoundRecordByIdError
+from src.exceptions import NotFoundRecordByIdError, InvalidCursorError
+from src.tracing.tracer import traced
 
 
 logger = logging.getLogger("app.database.base_repository")
 
+UPSERT_INSERTS: Dict[str, Callable] = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+UNIT_OF_WORK = "unit_of_work"
+
 class BaseRepository(Generic[ModelType]):
+    CURSOR_ORDER = ("created_at", "id")
+    BULK_CHUNK_SIZE = 1000
+
     def __init__(
             self,
             session: AsyncSession,
@@ -19,41 +33,256 @@ class BaseRepository(Generic[ModelType]):
         self.session = session
         self.model = model
 
+    @property
+    def unit_of_work(self) -> bool:
+        return self.session.info.get(UNIT_OF_WORK, False)
+
+    @traced()
     async def get_by_id(self, id_: ID) -> ModelType:
         instance = await self._get_by_id(id_)
         self._check_exists_instance(instance, id_)
         return instance
 
+    @traced()
     async def get_all(self, offset: int = 0, limit: int = 10) -> Sequence[ModelType]:
         stmt = select(self.model).offset(offset).limit(limit)
         return await self._get_all_results_from_query(stmt)
 
+    @traced()
+    async def get_rows(
+            self,
+            columns: Sequence[str],
+            *conditions,
+            offset: int = 0,
+            limit: int = 10,
+    ) -> Sequence[Dict[str, Any]]:
+        stmt = select(*self._get_columns(columns)).where(*conditions).offset(offset).limit(limit)
+        return await self._get_all_rows_from_query(stmt)
+
+    async def stream_batches(
+            self,
+            columns: Sequence[str],
+            *conditions,
+            fetch_size: int = 1000,
+            order_by: Sequence[str] = ("id",),
+    ) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+        stmt = (
+            select(*self._get_columns(columns))
+            .where(*conditions)
+            .order_by(*self._get_columns(order_by))
+            .execution_options(yield_per=fetch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield [row._asdict() for row in partition]
+
+    @traced()
+    async def get_by_cursor(
+            self,
+            *conditions,
+            after: Sequence[Any] | None = None,
+            limit: int = 10,
+            order_by: Sequence[str] = CURSOR_ORDER,
+            columns: Sequence[str] | None = None,
+    ) -> Tuple[Sequence[ModelType | Dict[str, Any]], list | None]:
+        order_columns = self._get_columns(order_by)
+        if columns is None:
+            stmt = select(self.model)
+        else:
+            stmt = select(*self._get_columns(dict.fromkeys([*columns, *order_by])))
+
+        stmt = stmt.where(*conditions).order_by(*order_columns).limit(limit + 1)
+        if after is not None:
+            stmt = stmt.where(tuple_(*order_columns) > tuple_(*self._parse_cursor_values(order_columns, after)))
+
+        if columns is None:
+            instances = await self._get_all_results_from_query(stmt)
+            get_value = getattr
+        else:
+            instances = await self._get_all_rows_from_query(stmt)
+            get_value = dict.get
+
+        if len(instances) <= limit:
+            return instances, None
+
+        instances = instances[:limit]
+        return instances, [get_value(instances[-1], name) for name in order_by]
+
+    @traced()
     async def create(self, obj_in: Dict[str, Any]) -> ModelType:
-        instance = self._add_to_session(obj_in)
-        await self._commit_and_refresh(instance)
+        if not self.session.get_bind().dialect.insert_returning:
+            instance = self._add_to_session(obj_in)
+            await self._commit_and_refresh(instance)
+            return instance
+
+        result = await self.session.scalars(
+            insert(self.model).values(**obj_in).returning(self.model),
+            execution_options={"populate_existing": True},
+        )
+        instance = result.one()
+        await self._commit()
         return instance
 
+    @traced()
     async def update(self, id_: ID, obj_update: Dict[str, Any]) -> ModelType:
-        instance = await self.get_by_id(id_)
-        instance = self._update_instance(instance, obj_update)
-        await self._commit_and_refresh(instance)
+        instance = await self.update_by_conditions(obj_update, self.model.id == id_)
+        self._check_exists_instance(instance, id_)
+        return instance
+
+    @traced()
+    async def update_by_conditions(self, obj_update: Dict[str, Any], *conditions) -> ModelType | None:
+        values = {key: value for key, value in obj_update.items() if value is not None}
+        if not values:
+            instances = await self.get_by_conditions(*conditions)
+            return instances[0] if instances else None
+
+        stmt = update(self.model).where(*conditions).values(**values)
+
+        if self.session.get_bind().dialect.update_returning:
+            result = await self.session.scalars(
+                stmt.returning(self.model),
+                execution_options={"populate_existing": True},
+            )
+            instance = result.first()
+            await self._commit()
+            return instance
+
+        await self.session.execute(stmt)
+        await self._commit()
+        instances = await self.get_by_conditions(*conditions)
+        return instances[0] if instances else None
+
+    @traced()
+    async def upsert(
+            self,
+            values: Dict[str, Any],
+            conflict_columns: Sequence[str],
+            returning: bool = True,
+            update_columns: Sequence[str] | None = None,
+    ) -> ModelType | None:
+        values = {key: value for key, value in values.items() if value is not None}
+        update_columns = self._get_upsert_update_columns(values, conflict_columns, update_columns)
+
+        insert = self._get_dialect_insert()
+        if insert is None:
+            return await self._upsert_with_select(values, conflict_columns, update_columns)
+
+        stmt = insert(self.model).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={
+                **{column: stmt.excluded[column] for column in update_columns or conflict_columns},
+                **self._get_onupdate_values(values),
+            },
+        )
+
+        instance = None
+        if returning:
+            result = await self.session.scalars(
+                stmt.returning(self.model),
+                execution_options={"populate_existing": True},
+            )
+            instance = result.one()
+        else:
+            await self.session.execute(stmt)
+
+        await self._commit()
         return instance
 
+    @traced()
     async def delete(self, id_: ID) -> None:
-        instance = await self.get_by_id(id_)
-        await self.session.delete(instance)
-        await self.session.commit()
+        result = await self.session.execute(delete(self.model).where(self.model.id == id_))
+        if result.rowcount == 0:
+            self._check_exists_instance(None, id_)
+        await self._commit()
 
+    @traced()
+    async def delete_by_conditions(self, *conditions, limit: int | None = None) -> int:
+        stmt = delete(self.model)
+        if limit is None:
+            stmt = stmt.where(*conditions)
+        else:
+            ids = select(self.model.id).where(*conditions).limit(limit)
+            stmt = stmt.where(self.model.id.in_(ids.scalar_subquery()))
+
+        result = await self.session.execute(stmt, execution_options={"synchronize_session": False})
+        await self._commit()
+        return result.rowcount
+
+    @traced()
+    async def bulk_create(self, objs_in: Iterable[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        created = 0
+        for chunk in self._chunks(objs_in, chunk_size):
+            await self.session.execute(insert(self.model), chunk)
+            await self._commit()
+            created += len(chunk)
+        return created
+
+    @traced()
+    async def bulk_update(self, objs_update: Iterable[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        updated = 0
+        for chunk in self._chunks(objs_update, chunk_size):
+            await self.session.execute(update(self.model), chunk)
+            await self._commit()
+            updated += len(chunk)
+        return updated
+
+    @traced()
+    async def bulk_delete(self, ids: Iterable[ID], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        deleted = 0
+        for chunk in self._chunks(ids, chunk_size):
+            result = await self.session.execute(delete(self.model).where(self.model.id.in_(chunk)))
+            await self._commit()
+            deleted += result.rowcount
+        return deleted
+
+    @traced()
+    async def copy_records(self, columns: Sequence[str], records: Sequence[Sequence[Any]]) -> int:
+        if self.session.get_bind().dialect.driver != "asyncpg":
+            return await self.bulk_create(dict(zip(columns, record)) for record in records)
+
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            self.model.__tablename__,
+            records=records,
+            columns=list(columns),
+        )
+        await self._commit()
+        return len(records)
+
+    @traced()
     async def exists(self, *conditions) -> bool:
         stmt = select(self.model).where(*conditions).limit(1)
         instances = await self._get_all_results_from_query(stmt)
         return self._condition_for_check_exists_instances(instances)
 
+    @traced()
     async def count(self, *conditions) -> int:
         stmt = select(func.count()).select_from(self.model).where(*conditions)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none() or 0
 
+    @traced()
+    async def estimated_count(self) -> int:
+        if self.session.get_bind().dialect.name != "postgresql":
+            return await self.count()
+
+        result = await self.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": self.model.__tablename__},
+        )
+        estimate = result.scalar_one_or_none()
+        if estimate is None or estimate < 0:
+            return await self.count()
+        return estimate
+
+    @traced()
+    async def get_one_or_none(self, stmt: Executable) -> ModelType | None:
+        result = await self.session.execute(stmt)
+        return result.scalars().one_or_none()
+
+    @traced()
     async def get_by_conditions(self, *conditions) -> Sequence[ModelType]:
         stmt = select(self.model).where(*conditions)
         return await self._get_all_results_from_query(stmt)
@@ -68,13 +297,65 @@ class BaseRepository(Generic[ModelType]):
             logger.warning(f"{self.model.__name__} not found with ID {id_}")
             raise NotFoundRecordByIdError(self.model.__name__, id_)
 
+    def _get_upsert_update_columns(
+            self,
+            values: Dict[str, Any],
+            conflict_columns: Sequence[str],
+            update_columns: Sequence[str] | None,
+    ) -> list[str]:
+        if update_columns is None:
+            update_columns = values.keys()
+        primary_keys = {column.name for column in self.model.__table__.primary_key}
+        return [
+            column for column in update_columns
+            if column in values and column not in conflict_columns and column not in primary_keys
+        ]
+
+    def _get_onupdate_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        onupdate_values = {}
+        for column in self.model.__table__.columns:
+            default = column.onupdate
+            if default is None or column.name in values:
+                continue
+            if default.is_callable:
+                onupdate_values[column.name] = default.arg(None)
+            elif default.is_scalar:
+                onupdate_values[column.name] = default.arg
+        return onupdate_values
+
+    def _get_dialect_insert(self) -> Callable | None:
+        return UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+
+    async def _upsert_with_select(
+            self,
+            values: Dict[str, Any],
+            conflict_columns: Sequence[str],
+            update_columns: Sequence[str],
+    ) -> ModelType:
+        instances = await self.get_by_conditions(
+            *(getattr(self.model, column) == values[column] for column in conflict_columns)
+        )
+        if instances:
+            instance = self._update_instance(instances[0], {column: values[column] for column in update_columns})
+        else:
+            instance = self._add_to_session(values)
+
+        await self._commit_and_refresh(instance)
+        return instance
+
     def _add_to_session(self, obj_in: Dict[str, Any]) -> ModelType:
         instance = self.model(**obj_in)
         self.session.add(instance)
         return instance
 
+    async def _commit(self) -> None:
+        if self.unit_of_work:
+            await self.session.flush()
+        else:
+            await self.session.commit()
+
     async def _commit_and_refresh(self, instance: ModelType | None) -> None:
-        await self.session.commit()
+        await self._commit()
         if instance:
             await self.session.refresh(instance)
 
@@ -85,10 +366,40 @@ class BaseRepository(Generic[ModelType]):
                 setattr(instance, key, value)
         return instance
 
+    def _get_columns(self, names: Sequence[str]) -> list:
+        return [getattr(self.model, name) for name in names]
+
+    @staticmethod
+    def _parse_cursor_values(columns: Sequence, values: Sequence[Any]) -> list:
+        if len(values) != len(columns):
+            raise InvalidCursorError()
+
+        parsed = []
+        for column, value in zip(columns, values):
+            try:
+                if column.type.python_type is datetime:
+                    value = datetime.fromisoformat(value)
+                else:
+                    value = column.type.python_type(value)
+            except (TypeError, ValueError):
+                raise InvalidCursorError()
+            parsed.append(value)
+        return parsed
+
+    @staticmethod
+    def _chunks(items: Iterable[Any], chunk_size: int) -> Iterator[list]:
+        iterator = iter(items)
+        while chunk := list(islice(iterator, chunk_size)):
+            yield chunk
+
     @staticmethod
     def _condition_for_check_exists_instances(instances: Sequence[ModelType]) -> bool:
         return len(instances) != 0
 
     async def _get_all_results_from_query(self, stmt: Select) -> Sequence[ModelType]:
         result = await self.session.execute(stmt)
-        return result.scalars().all()
\ No newline at end of file
+        return result.scalars().all()
+
+    async def _get_all_rows_from_query(self, stmt: Select) -> Sequence[Dict[str, Any]]:
+        result = await self.session.execute(stmt)
+        return [row._asdict() for row in result]
\ No newline at end of file
@@ -1,10 +1,83 @@
-from typing import AsyncGenerator
+import asyncio
+import logging
+import time
+from itertools import count
+from typing import AsyncGenerator, Any, Dict, Sequence, Iterator, Tuple
+from uuid import uuid4
 
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.pool import Pool
 from sqlalchemy.ext.asyncio import (
-    async_sessionmaker, create_async_engine, AsyncSession
+    async_sessionmaker, create_async_engine, AsyncSession, AsyncConnection, AsyncEngine
 )
 
-from src.config import settings
+from src.config import settings, DataBaseSettings
+from src.database.base_repository import UNIT_OF_WORK
+from src.database.query_stats import QueryInstrumentation
+from src.metrics import TimedAsyncAdaptedQueuePool
+from src.tracing.tracer import tracer
+
+
+logger = logging.getLogger("app.database.database_helper")
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+
+REPLICATION_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+def build_engine_options(database_settings: DataBaseSettings) -> Dict[str, Any]:
+    url = make_url(database_settings.database_url)
+    options: Dict[str, Any] = {}
+
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            poolclass=TimedAsyncAdaptedQueuePool,
+            pool_size=database_settings.database_pool_size,
+            max_overflow=database_settings.database_max_overflow,
+            pool_timeout=database_settings.database_pool_timeout,
+            pool_recycle=database_settings.database_pool_recycle,
+        )
+    options["pool_pre_ping"] = database_settings.database_pool_pre_ping
+
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = build_asyncpg_connect_args(database_settings)
+    return options
+
+def build_asyncpg_connect_args(database_settings: DataBaseSettings) -> Dict[str, Any]:
+    connect_args: Dict[str, Any] = {
+        "statement_cache_size": database_settings.database_statement_cache_size,
+        "prepared_statement_cache_size": database_settings.database_statement_cache_size,
+    }
+    if database_settings.database_server_settings:
+        connect_args["server_settings"] = dict(database_settings.database_server_settings)
+
+    if database_settings.database_pgbouncer:
+        # transaction poolers hand each transaction to any server connection,
+        # so named statements must be unique and never reused from a cache
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+    return connect_args
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine, session_maker: async_sessionmaker):
+        self.engine = engine
+        self.session_maker = session_maker
+        self.name = engine.url.render_as_string(hide_password=True)
+        self.healthy = True
+        self.lag = 0.0
+        self.in_use = 0
 
 
 class DatabaseHelper:
@@ -12,21 +85,239 @@ class DatabaseHelper:
     AUTOCOMMIT = False
     EXPIRE_ON_COMMIT = False
 
-    def __init__(self, url: str, *, echo: bool):
-        self.engine = create_async_engine(url, echo=echo)
+    def __init__(
+            self,
+            url: str,
+            *,
+            echo: bool,
+            unit_of_work: bool = False,
+            instrumentation: QueryInstrumentation | None = None,
+            replica_urls: Sequence[str] = (),
+            replica_routing: str = ROUND_ROBIN,
+            max_replica_lag: float = 5.0,
+            health_check_interval: float = 5.0,
+            health_check_timeout: float = 2.0,
+            **engine_options: Any,
+    ):
+        self.url = url
+        self.echo = echo
+        self.replica_urls = list(replica_urls)
+        self.engine_options = engine_options
+        self.unit_of_work = unit_of_work
 
-        self.session_maker = async_sessionmaker(
-            bind=self.engine,
+        self.replica_routing = replica_routing
+        self.max_replica_lag = max_replica_lag
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+
+        self.instrumentation = instrumentation
+
+        self._engine: AsyncEngine | None = None
+        self._session_maker: async_sessionmaker | None = None
+        self._replicas: list[Replica] = []
+        self._round_robin = count()
+        self._health_check_task: asyncio.Task | None = None
+
+    @classmethod
+    def from_settings(cls, database_settings: DataBaseSettings) -> "DatabaseHelper":
+        return cls(
+            database_settings.database_url,
+            echo=database_settings.database_echo,
+            unit_of_work=database_settings.database_unit_of_work,
+            instrumentation=QueryInstrumentation(
+                database_settings.database_slow_query_threshold,
+                database_settings.database_n_plus_one_threshold,
+            ) if database_settings.database_query_stats_enabled else None,
+            replica_urls=database_settings.database_replica_urls,
+            replica_routing=database_settings.database_replica_routing,
+            max_replica_lag=database_settings.database_replica_max_lag,
+            health_check_interval=database_settings.database_replica_health_interval,
+            health_check_timeout=database_settings.database_replica_health_timeout,
+            **build_engine_options(database_settings),
+        )
+
+    @property
+    def engine(self) -> AsyncEngine:
+        self.create_engines()
+        return self._engine
+
+    @property
+    def session_maker(self) -> async_sessionmaker:
+        self.create_engines()
+        return self._session_maker
+
+    @property
+    def replicas(self) -> list[Replica]:
+        self.create_engines()
+        return self._replicas
+
+    def create_engines(self) -> None:
+        # engines load the DB driver, so they are built on first use or at startup rather than on import
+        if self._engine is not None:
+            return
+
+        engine = create_async_engine(self.url, echo=self.echo, **self.engine_options)
+        replicas = [
+            Replica(replica_engine, self._make_session_maker(replica_engine))
+            for replica_engine in (
+                create_async_engine(replica_url, echo=self.echo, **self.engine_options)
+                for replica_url in self.replica_urls
+            )
+        ]
+        if self.instrumentation is not None:
+            for instrumented in (engine, *(replica.engine for replica in replicas)):
+                self.instrumentation.instrument(instrumented.sync_engine)
+
+        self._session_maker = self._make_session_maker(engine)
+        self._replicas = replicas
+        self._engine = engine
+
+    def new_session(self) -> AsyncSession:
+        return self.session_maker()
+
+    async def session_depends(self) -> AsyncGenerator[AsyncSession, None]:
+        async with self.session_maker() as session:
+            if not self.unit_of_work:
+                yield session
+                return
+
+            session.info[UNIT_OF_WORK] = True
+            try:
+                yield session
+            except Exception:
+                await session.rollback()
+                raise
+            if session.in_transaction():
+                with tracer.start_span("db.commit"):
+                    await session.commit()
+
+    async def read_session_depends(self) -> AsyncGenerator[AsyncSession, None]:
+        replica = self._choose_replica()
+        session = await self._open_replica_session(replica) if replica is not None else None
+        if session is None:
+            async with self.session_maker() as session:
+                yield session
+            return
+
+        replica.in_use += 1
+        try:
+            async with session:
+                yield session
+        finally:
+            replica.in_use -= 1
+
+    def read_session_maker(self) -> async_sessionmaker:
+        replica = self._choose_replica()
+        return replica.session_maker if replica is not None else self.session_maker
+
+    def pools(self) -> Iterator[Tuple[str, Pool]]:
+        yield "primary", self.engine.pool
+        for replica in self.replicas:
+            yield replica.name, replica.engine.pool
+
+    def start_replica_health_checks(self) -> None:
+        if self.replicas and self._health_check_task is None:
+            self._health_check_task = asyncio.create_task(self._run_health_checks())
+
+    async def check_replicas(self) -> None:
+        await asyncio.gather(*(self._check_replica(replica) for replica in self.replicas))
+
+    async def warm_up(self, connections: int) -> int:
+        pool_size = getattr(self.engine.pool, "size", None)
+        if pool_size is not None:
+            connections = min(connections, pool_size())
+        if connections <= 0:
+            return 0
+
+        started_at = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._ping() for _ in range(connections)), return_exceptions=True
+        )
+        opened = sum(1 for result in results if not isinstance(result, BaseException))
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning(f"Database warm-up connection failed: {result}")
+                break
+
+        logger.info(
+            f"Opened {opened}/{connections} database connections "
+            f"in {(time.perf_counter() - started_at) * 1000:.0f}ms"
+        )
+        return opened
+
+    async def close(self) -> None:
+        if self._health_check_task is not None:
+            self._health_check_task.cancel()
+            self._health_check_task = None
+        if self._engine is None:
+            return
+        for replica in self._replicas:
+            await replica.engine.dispose()
+        await self._engine.dispose()
+
+    async def _ping(self) -> None:
+        async with self.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    def _make_session_maker(self, engine: AsyncEngine) -> async_sessionmaker:
+        return async_sessionmaker(
+            bind=engine,
             autocommit=self.AUTOCOMMIT,
             autoflush=self.AUTOFLUSH,
             expire_on_commit=self.EXPIRE_ON_COMMIT,
         )
 
-    async def session_depends(self) -> AsyncGenerator[AsyncSession, None]:
-        async with self.session_maker() as session:
-            yield session
+    def _choose_replica(self) -> Replica | None:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.replica_routing == LEAST_CONNECTIONS:
+            return min(healthy, key=lambda replica: replica.in_use)
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    async def _open_replica_session(self, replica: Replica) -> AsyncSession | None:
+        session = replica.session_maker()
+        try:
+            await session.connection()
+        except (DBAPIError, OSError) as e:
+            await session.close()
+            self._set_replica_health(replica, False, f"connection failed: {e}")
+            return None
+        return session
+
+    async def _run_health_checks(self) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(self.health_check_interval)
+
+    async def _check_replica(self, replica: Replica) -> None:
+        try:
+            replica.lag = await asyncio.wait_for(self._measure_lag(replica), self.health_check_timeout)
+        except Exception as e:
+            self._set_replica_health(replica, False, f"health check failed: {e!r}")
+            return
+
+        if replica.lag > self.max_replica_lag:
+            self._set_replica_health(replica, False, f"lagging {replica.lag:.1f}s behind the primary")
+        else:
+            self._set_replica_health(replica, True, f"lag {replica.lag:.1f}s")
+
+    async def _measure_lag(self, replica: Replica) -> float:
+        async with replica.engine.connect() as connection:
+            return await self._replication_lag(connection)
+
+    @staticmethod
+    async def _replication_lag(connection: AsyncConnection) -> float:
+        if connection.dialect.name != "postgresql":
+            await connection.execute(text("SELECT 1"))
+            return 0.0
+        return float(await connection.scalar(REPLICATION_LAG_QUERY))
+
+    @staticmethod
+    def _set_replica_health(replica: Replica, healthy: bool, reason: str) -> None:
+        if replica.healthy != healthy:
+            state = "healthy" if healthy else "unhealthy, reads fall back to the primary"
+            logger.warning(f"Replica {replica.name} is {state}: {reason}")
+        replica.healthy = healthy
 
-database_helper = DatabaseHelper(
-    settings.database_settings.database_url,
-    echo=settings.database_settings.database_echo
-)
\ No newline at end of file
+database_helper = DatabaseHelper.from_settings(settings.database_settings)
@@ -0,0 +1,84 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger("app.database.query_stats")
+
+STATEMENT_LOG_LIMIT = 500
+
+class QueryStats:
+    def __init__(self, parent: "QueryStats | None" = None, slowest_limit: int = 3):
+        self.parent = parent
+        self.slowest_limit = slowest_limit
+        self.count = 0
+        self.duration = 0.0
+        self.slowest: list[tuple[float, str]] = []
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+        if len(self.slowest) < self.slowest_limit or duration > self.slowest[-1][0]:
+            self.slowest.append((duration, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[self.slowest_limit:]
+        if self.parent is not None:
+            self.parent.record(statement, duration)
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+query_stats_var: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats(parent=query_stats_var.get())
+    token = query_stats_var.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats_var.reset(token)
+
+@contextmanager
+def assert_query_budget(max_queries: int) -> Iterator[QueryStats]:
+    with track_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        statements = "\n".join(f"{count}x {statement}" for statement, count in stats.statements.items())
+        raise AssertionError(f"Expected at most {max_queries} queries, got {stats.count}:\n{statements}")
+
+
+class QueryInstrumentation:
+    def __init__(self, slow_query_threshold: float, n_plus_one_threshold: int):
+        self.slow_query_threshold = slow_query_threshold
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    def instrument(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def report_repeated(self, stats: QueryStats, route: str) -> None:
+        for statement, count in stats.repeated_statements(self.n_plus_one_threshold):
+            logger.warning(f"Possible N+1 on {route}: {count}x {statement[:STATEMENT_LOG_LIMIT]}")
+
+    def _before_cursor_execute(self, connection, cursor, statement, parameters, context, executemany) -> None:
+        # kept on the execution context, which is discarded with the statement even when it raises
+        context._query_start_time = time.perf_counter()
+
+    def _after_cursor_execute(self, connection, cursor, statement, parameters, context, executemany) -> None:
+        duration = time.perf_counter() - context._query_start_time
+
+        stats = query_stats_var.get()
+        if stats is not None:
+            stats.record(statement, duration)
+
+        if duration >= self.slow_query_threshold:
+            logger.warning(f"Slow query {duration * 1000:.1f}ms: {statement[:STATEMENT_LOG_LIMIT]}")
@@ -19,4 +19,14 @@ class InternalServerError(AppException):
         
 class UnauthorizeError(AppException):
     def __init__(self, message: str):
-        super().__init__(message, status_code=401)
\ No newline at end of file
+        super().__init__(message, status_code=401)
+
+class UpstreamServiceError(AppException):
+    def __init__(self, service_name: str, status_code: int):
+        message = f"{service_name} responded with status {status_code}"
+        super().__init__(message, status_code=502)
+
+class InvalidCursorError(AppException):
+    def __init__(self):
+        message = "Invalid pagination cursor"
+        super().__init__(message, status_code=400)
\ No newline at end of file
@@ -0,0 +1,66 @@
+import logging
+
+import httpx
+
+from src.config import settings, HttpClientSettings
+
+
+logger = logging.getLogger("app.http_client.httpx_client_manager")
+
+class HttpxClientManager:
+    def __init__(
+            self,
+            http_settings: HttpClientSettings,
+            transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.http_settings = http_settings
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    async def start(self) -> None:
+        _ = self.client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=self._build_limits(),
+            timeout=self._build_timeout(),
+            http2=self._http2_enabled(),
+            transport=self.transport,
+        )
+
+    def _build_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.http_settings.http_max_connections,
+            max_keepalive_connections=self.http_settings.http_max_keepalive_connections,
+            keepalive_expiry=self.http_settings.http_keepalive_expiry,
+        )
+
+    def _build_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            self.http_settings.http_timeout,
+            connect=self.http_settings.http_connect_timeout,
+        )
+
+    def _http2_enabled(self) -> bool:
+        if not self.http_settings.http_http2:
+            return False
+
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1")
+            return False
+        return True
+
+httpx_client_manager = HttpxClientManager(settings.http_client_settings)
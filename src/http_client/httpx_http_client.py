@@ -1,39 +1,79 @@
 import logging
+import time
 
 import httpx
 
 from src.exceptions import InternalServerError
 from src.http_client.http_client import HttpClient
+from src.metrics import upstream_request_duration_seconds, upstream_request_errors_total
+from src.tracing.tracer import tracer
 
 
 logger = logging.getLogger("app.http_client.httpx_http_client")
 
 class BaseRequestHttpxClient:
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+
     async def _send_request(self, method, url, *args, **kwargs) -> httpx.Response:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=30.0)) as client:
-            request = client.build_request(method, url, *args, **kwargs)
-            response = await client.send(request)
+        request = self.client.build_request(method, url, *args, **kwargs)
+        endpoint = f"{request.url.host}{request.url.path}"
+        with tracer.start_span(f"{method} {endpoint}", kind="client") as span:
+            if span is not None:
+                if tracer.should_propagate(request.url.host):
+                    request.headers["traceparent"] = span.traceparent
+                span.set_attribute("http.method", method)
+                span.set_attribute("http.url", f"{request.url.scheme}://{endpoint}")
+
+            started_at = time.perf_counter()
+            try:
+                response = await self.client.send(request)
+            except httpx.HTTPError as e:
+                upstream_request_errors_total.labels(method, endpoint, type(e).__name__).inc()
+                raise
+
+            upstream_request_duration_seconds.labels(method, endpoint, response.status_code).observe(
+                time.perf_counter() - started_at
+            )
+            if span is not None:
+                span.set_attribute("http.status_code", response.status_code)
             return response
 
+    @staticmethod
+    def _timeout_kwargs(timeout: float | None) -> dict:
+        return {"timeout": timeout} if timeout is not None else {}
+
 class GetHttpxClient(BaseRequestHttpxClient):
-    async def send_request(self, url, headers: dict | None = None) -> httpx.Response:
-        return await super()._send_request("GET", url, headers=headers)
+    async def send_request(
+            self, url, headers: dict | None = None, timeout: float | None = None
+    ) -> httpx.Response:
+        return await super()._send_request("GET", url, headers=headers, **self._timeout_kwargs(timeout))
 
 class PostHttpxClient(BaseRequestHttpxClient):
     async def send_request(
-            self, url, data: dict | None = None, json: dict | None = None, headers: dict | None = None
+            self,
+            url,
+            data: dict | None = None,
+            json: dict | None = None,
+            headers: dict | None = None,
+            timeout: float | None = None,
     ) -> httpx.Response:
-        return await super()._send_request("POST", url, data=data, json=json, headers=headers)
+        return await super()._send_request(
+            "POST", url, data=data, json=json, headers=headers, **self._timeout_kwargs(timeout)
+        )
 
 class HttpxHttpClient(HttpClient):
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+
     async def send_request(self, method, url, /, **kwargs) -> httpx.Response:
         match method.lower():
             case 'get':
-                client = GetHttpxClient()
+                client = GetHttpxClient(self.client)
             case 'post':
-                client = PostHttpxClient()
+                client = PostHttpxClient(self.client)
             case _:
                 logger.warning(f"Method {method} not supported")
                 raise InternalServerError()
 
-        return await client.send_request(url, **kwargs)
\ No newline at end of file
+        return await client.send_request(url, **kwargs)
@@ -1,11 +1,217 @@
+import atexit
+import copy
+import json
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
+import random
+import time
+from typing import Callable
 
+from src.config import settings, LoggingSettings
+from src.metrics import log_records_dropped_total
+
+
+QUEUED_LOGGERS = ("", "app")
+
+RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+active_listeners: list[logging.handlers.QueueListener] = []
 
 def create_directory(directory: str = "logs"):
     os.makedirs(directory, exist_ok=True)
 
-def setup_logging():
-    create_directory()
-    logging.config.fileConfig("logging.ini", disable_existing_loggers=False)
\ No newline at end of file
+def stop_listeners() -> None:
+    while active_listeners:
+        active_listeners.pop().stop()
+
+atexit.register(stop_listeners)
+
+def setup_logging(logging_settings: LoggingSettings | None = None) -> list[logging.handlers.QueueListener]:
+    logging_settings = logging_settings or settings.logging_settings
+    # drain the previous listeners before fileConfig closes the handlers they write to
+    stop_listeners()
+    create_directory(os.path.dirname(logging_settings.logging_file_path) or ".")
+    logging.config.fileConfig("logging.ini", disable_existing_loggers=False)
+
+    # the file handler lives here rather than in logging.ini so rotation can be set from the environment
+    app_logger = logging.getLogger("app")
+    file_handler = build_file_handler(logging_settings)
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(app_logger.handlers[0].formatter)
+    app_logger.addHandler(file_handler)
+
+    if logging_settings.logging_json:
+        for logger_name in QUEUED_LOGGERS:
+            for handler in logging.getLogger(logger_name).handlers:
+                handler.setFormatter(JsonFormatter())
+
+    filters = build_filters(logging_settings)
+    if not logging_settings.logging_queue_enabled:
+        for logger_name in QUEUED_LOGGERS:
+            for handler in logging.getLogger(logger_name).handlers:
+                for log_filter in filters:
+                    handler.addFilter(log_filter)
+        return []
+
+    active_listeners.extend(
+        move_handlers_to_queue(logging.getLogger(logger_name), logging_settings.logging_queue_size, filters)
+        for logger_name in QUEUED_LOGGERS
+    )
+    return list(active_listeners)
+
+def build_file_handler(logging_settings: LoggingSettings) -> logging.Handler:
+    # rotation is single-process only: every pre-forked worker would rename the same file on its own
+    path = logging_settings.logging_file_path
+    match logging_settings.logging_rotation:
+        case "size":
+            return logging.handlers.RotatingFileHandler(
+                path,
+                maxBytes=logging_settings.logging_max_bytes,
+                backupCount=logging_settings.logging_backup_count,
+                encoding="utf-8",
+            )
+        case "time":
+            return logging.handlers.TimedRotatingFileHandler(
+                path,
+                when=logging_settings.logging_rotation_when,
+                backupCount=logging_settings.logging_backup_count,
+                encoding="utf-8",
+            )
+        case _:
+            return logging.FileHandler(path, "a", "utf-8")
+
+def build_filters(logging_settings: LoggingSettings) -> list[logging.Filter]:
+    filters: list[logging.Filter] = []
+    if logging_settings.logging_sample_rates:
+        filters.append(SamplingFilter(logging_settings.logging_sample_rates))
+    if logging_settings.logging_rate_limits:
+        filters.append(RateLimitFilter(
+            logging_settings.logging_rate_limits,
+            logging_settings.logging_rate_limit_interval,
+        ))
+    return filters
+
+def move_handlers_to_queue(
+        logger: logging.Logger,
+        queue_size: int,
+        filters: list[logging.Filter],
+) -> logging.handlers.QueueListener:
+    handlers = list(logger.handlers)
+    records: queue.Queue = queue.Queue(queue_size)
+    queue_handler = DeferredQueueHandler(records)
+    for log_filter in filters:
+        queue_handler.addFilter(log_filter)
+
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, records: queue.Queue):
+        super().__init__(records)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # only merge msg and args here; formatters, timestamps and tracebacks run on the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            log_records_dropped_total.inc()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update(
+            (key, value) for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES
+        )
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        created = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+        return f"{created}.{int(record.msecs):03d}Z"
+
+
+class LoggerPrefixFilter(logging.Filter):
+    def __init__(self, values: dict[str, float]):
+        super().__init__()
+        # longest prefix first, so "app.database" overrides "app"
+        self.values = sorted(values.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def value_for(self, logger_name: str) -> float | None:
+        for prefix, value in self.values:
+            if logger_name == prefix or logger_name.startswith(prefix + "."):
+                return value
+        return None
+
+
+class SamplingFilter(LoggerPrefixFilter):
+    def __init__(self, rates: dict[str, float], random_value: Callable[[], float] = random.random):
+        super().__init__(rates)
+        self.random_value = random_value
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        rate = self.value_for(record.name)
+        return rate is None or self.random_value() < rate
+
+
+class RateLimitFilter(LoggerPrefixFilter):
+    def __init__(
+            self,
+            limits: dict[str, int],
+            interval: float,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(limits)
+        self.interval = interval
+        self.clock = clock
+        # call site -> [window start, records let through, records suppressed]
+        self._windows: dict[tuple[str, str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        limit = self.value_for(record.name)
+        if limit is None:
+            return True
+
+        # messages are mostly f-strings, so the call site is what identifies "the same warning"
+        key = (record.name, record.pathname, record.lineno)
+        now = self.clock()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.interval:
+            suppressed = window[2] if window is not None else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+                record.args = None
+            return True
+
+        if window[1] < limit:
+            window[1] += 1
+            return True
+
+        window[2] += 1
+        return False
@@ -0,0 +1,145 @@
+import asyncio
+import functools
+import importlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from contextlib import suppress
+from typing import Callable, Sequence
+
+from src.config import settings, LoopWatchdogSettings
+from src.metrics import event_loop_lag_seconds, event_loop_stalls_total, blocking_call_seconds
+
+
+logger = logging.getLogger("app.loop_watchdog")
+
+# synchronous code that runs on the event loop thread; wrapped in debug mode so stalls can be attributed
+HOT_SPOTS = (
+    "src.api.auth.utils.state_generator_hashlib:StateGeneratorHashlib.generate",
+    "src.api.auth.utils.jose_decoder:JoseDecoder.decode",
+    "src.api.auth.utils.jwks_decoder:JwksDecoder._verify",
+    "src.api.auth.utils.session_token_codec:SessionTokenCodec.issue",
+    "src.api.auth.utils.session_token_codec:SessionTokenCodec.verify",
+    "logging:Handler.handle",
+)
+
+class LoopWatchdog:
+    def __init__(
+            self,
+            threshold: float,
+            interval: float,
+            hot_spots: Sequence[str] = (),
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.interval = interval
+        self.hot_spots = tuple(hot_spots)
+        self.clock = clock
+
+        self._loop_thread_id: int | None = None
+        self._last_beat = 0.0
+        self._reported_beat: float | None = None
+        self._active_calls: list[str] = []
+        self._originals: list[tuple[type, str, Callable]] = []
+        self._heartbeat_task: asyncio.Task | None = None
+        self._monitor_thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._heartbeat_task is not None:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = self.clock()
+        self._stopped.clear()
+        for hot_spot in self.hot_spots:
+            self._wrap(hot_spot)
+
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._monitor_thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+        self._monitor_thread.start()
+
+    async def close(self) -> None:
+        if self._heartbeat_task is None:
+            return
+
+        self._heartbeat_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._heartbeat_task
+        self._heartbeat_task = None
+
+        self._stopped.set()
+        self._monitor_thread.join()
+        self._monitor_thread = None
+
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals.clear()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            started_at = self.clock()
+            await asyncio.sleep(self.interval)
+            now = self.clock()
+            self._last_beat = now
+
+            lag = max(now - started_at - self.interval, 0.0)
+            event_loop_lag_seconds.observe(lag)
+            if lag >= self.threshold:
+                logger.warning(f"Event loop stall ended after {lag * 1000:.0f}ms")
+
+    def _monitor(self) -> None:
+        # runs on its own thread, so it can look at the loop while the loop itself cannot run
+        check_interval = min(self.interval, self.threshold) / 2
+        while not self._stopped.wait(check_interval):
+            beat = self._last_beat
+            blocked_for = self.clock() - beat - self.interval
+            if blocked_for >= self.threshold and beat != self._reported_beat:
+                self._reported_beat = beat
+                self._report_stall(blocked_for)
+
+    def _report_stall(self, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "<loop thread not found>\n"
+        active_call = self._active_calls[-1] if self._active_calls else None
+
+        event_loop_stalls_total.labels(call=active_call or "unknown").inc()
+        where = f" in {active_call}" if active_call else ""
+        logger.warning(f"Event loop blocked for {blocked_for * 1000:.0f}ms{where}, loop thread stack:\n{stack}")
+
+    def _wrap(self, hot_spot: str) -> None:
+        module_name, _, qualname = hot_spot.partition(":")
+        class_name, _, attribute = qualname.rpartition(".")
+        owner = getattr(importlib.import_module(module_name), class_name)
+        original = owner.__dict__[attribute]
+
+        self._originals.append((owner, attribute, original))
+        setattr(owner, attribute, self._timed(qualname, original))
+
+    def _timed(self, name: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if threading.get_ident() != self._loop_thread_id:
+                return func(*args, **kwargs)
+
+            self._active_calls.append(name)
+            started_at = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                blocking_call_seconds.labels(call=name).observe(time.perf_counter() - started_at)
+                self._active_calls.pop()
+        return wrapper
+
+def build_loop_watchdog(watchdog_settings: LoopWatchdogSettings) -> LoopWatchdog | None:
+    if not watchdog_settings.loop_watchdog_enabled:
+        return None
+    return LoopWatchdog(
+        watchdog_settings.loop_watchdog_threshold,
+        watchdog_settings.loop_watchdog_interval,
+        HOT_SPOTS if watchdog_settings.loop_watchdog_debug else (),
+    )
+
+loop_watchdog = build_loop_watchdog(settings.loop_watchdog_settings)
@@ -1,15 +1,53 @@
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.logs import setup_logging
 from src.exceptions import AppException
 from src.api.routers import auth_router
+from src.http_client.httpx_client_manager import httpx_client_manager
+from src.database.database_helper import database_helper
+from src.api.auth.dependencies.decoder_dependencies import jwks_key_set, id_token_verify_executor
+from src.api.auth.dependencies.purge_dependencies import token_purge_service
+from src.middleware.server_timing import ServerTimingMiddleware
+from src.middleware.metrics import MetricsMiddleware
+from src.middleware.tracing import TracingMiddleware
+from src.tracing.tracer import tracer
+from src.loop_watchdog import loop_watchdog
+from src.metrics import build_exposition_registry, mark_worker_exited, DatabasePoolCollector
+from src.config import settings
 
 
 setup_logging()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if loop_watchdog is not None:
+        loop_watchdog.start()
+    tracer.start()
+    database_helper.create_engines()
+    await httpx_client_manager.start()
+    await database_helper.warm_up(settings.database_settings.database_warmup_connections)
+    database_helper.start_replica_health_checks()
+    if settings.oauth_settings.verify_id_token:
+        await jwks_key_set.refresh()
+    if settings.token_purge_settings.token_purge_enabled:
+        token_purge_service.start(settings.token_purge_settings.token_purge_interval)
+    yield
+    await token_purge_service.close()
+    if id_token_verify_executor is not None:
+        id_token_verify_executor.shutdown(wait=False)
+    await httpx_client_manager.close()
+    await database_helper.close()
+    tracer.shutdown()
+    mark_worker_exited()
+    if loop_watchdog is not None:
+        await loop_watchdog.close()
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost",
@@ -24,6 +62,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if database_helper.instrumentation is not None:
+    app.add_middleware(ServerTimingMiddleware, instrumentation=database_helper.instrumentation)
+
+if settings.metrics_settings.metrics_enabled:
+    metrics_registry = build_exposition_registry()
+    # pool gauges are read live from this process, so under the worker pool they describe the worker that was scraped
+    metrics_registry.register(DatabasePoolCollector(database_helper.pools))
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get(settings.metrics_settings.metrics_path, include_in_schema=False)
+    async def metrics() -> Response:
+        return Response(generate_latest(metrics_registry), media_type=CONTENT_TYPE_LATEST)
+
+if tracer.enabled:
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+
 app.include_router(auth_router, prefix="/api")
 
 @app.exception_handler(AppException)
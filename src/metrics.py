@@ -0,0 +1,101 @@
+import os
+import time
+from typing import Callable, Iterable, Tuple
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy.pool import Pool, AsyncAdaptedQueuePool
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# set by src.cli.serve before the workers start; prometheus_client then keeps values in files shared by every worker
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+registry = CollectorRegistry(auto_describe=True)
+
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "Requests currently being served",
+    multiprocess_mode="livesum", registry=registry,
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "Request latency by route template and status",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS, registry=registry,
+)
+db_pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled database connection",
+    buckets=LATENCY_BUCKETS, registry=registry,
+)
+upstream_request_duration_seconds = Histogram(
+    "upstream_request_duration_seconds", "Outbound HTTP latency by endpoint and status",
+    ["method", "endpoint", "status"], buckets=LATENCY_BUCKETS, registry=registry,
+)
+upstream_request_errors_total = Counter(
+    "upstream_request_errors_total", "Outbound HTTP requests that failed without a response",
+    ["method", "endpoint", "error"], registry=registry,
+)
+event_loop_lag_seconds = Histogram(
+    "event_loop_lag_seconds", "How late the event loop woke the watchdog heartbeat",
+    buckets=LATENCY_BUCKETS, registry=registry,
+)
+event_loop_stalls_total = Counter(
+    "event_loop_stalls_total", "Event loop stalls over the watchdog threshold by blocking call",
+    ["call"], registry=registry,
+)
+log_records_dropped_total = Counter(
+    "log_records_dropped_total", "Log records dropped because the logging queue was full", registry=registry,
+)
+blocking_call_seconds = Histogram(
+    "blocking_call_seconds", "Time spent in known synchronous hot spots on the event loop thread",
+    ["call"], buckets=LATENCY_BUCKETS, registry=registry,
+)
+
+
+def build_exposition_registry() -> CollectorRegistry:
+    if not MULTIPROCESS:
+        return registry
+    # a scrape lands on one worker, so read every worker's files instead of this process's registry
+    exposition_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(exposition_registry)
+    return exposition_registry
+
+def mark_worker_exited() -> None:
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait_seconds.observe(time.perf_counter() - started_at)
+
+
+class DatabasePoolCollector(Collector):
+    def __init__(self, pools: Callable[[], Iterable[Tuple[str, Pool]]]):
+        self.pools = pools
+
+    def describe(self):
+        # registering calls describe(), which must not touch the pools before the engines exist
+        yield from self._gauges().values()
+
+    def collect(self):
+        gauges = self._gauges()
+        for name, pool in self.pools():
+            for attribute, gauge in gauges.items():
+                value = getattr(pool, attribute, None)
+                if value is not None:
+                    gauge.add_metric([name], max(value(), 0))
+        yield from gauges.values()
+
+    @staticmethod
+    def _gauges() -> dict[str, GaugeMetricFamily]:
+        return {
+            "size": GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["pool"]),
+            "checkedout": GaugeMetricFamily("db_pool_checked_out", "Connections checked out", labels=["pool"]),
+            "checkedin": GaugeMetricFamily("db_pool_checked_in", "Idle connections in the pool", labels=["pool"]),
+            "overflow": GaugeMetricFamily("db_pool_overflow", "Connections opened beyond the pool size", labels=["pool"]),
+        }
@@ -0,0 +1,37 @@
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send, Message
+
+from src.metrics import http_requests_in_flight, http_request_duration_seconds
+
+
+UNMATCHED_ROUTE = "unmatched"
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started_at = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # the route template keeps label cardinality bounded; raw paths would not be
+            route = scope.get("route")
+            http_request_duration_seconds.labels(
+                scope["method"], getattr(route, "path", UNMATCHED_ROUTE), status,
+            ).observe(time.perf_counter() - started_at)
@@ -0,0 +1,37 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Receive, Scope, Send, Message
+
+from src.database.query_stats import QueryInstrumentation, QueryStats, track_queries
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp, instrumentation: QueryInstrumentation):
+        self.app = app
+        self.instrumentation = instrumentation
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        with track_queries() as stats:
+            async def send_with_server_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", self._format(stats, time.perf_counter() - started_at))
+                await send(message)
+
+            await self.app(scope, receive, send_with_server_timing)
+
+        route = scope.get("route")
+        self.instrumentation.report_repeated(stats, getattr(route, "path", scope["path"]))
+
+    @staticmethod
+    def _format(stats: QueryStats, elapsed: float) -> str:
+        return (
+            f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", '
+            f"app;dur={elapsed * 1000:.2f}"
+        )
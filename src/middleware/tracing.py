@@ -0,0 +1,34 @@
+from starlette.types import ASGIApp, Receive, Scope, Send, Message
+
+from src.tracing.tracer import Tracer
+
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = next(
+            (value.decode("latin-1") for name, value in scope["headers"] if name == b"traceparent"), None,
+        )
+        with self.tracer.start_span(
+                f"{scope['method']} {scope['path']}", kind="server", traceparent=traceparent,
+        ) as span:
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.name = f"{scope['method']} {route.path}"
+                span.set_attribute("http.method", scope["method"])
+                span.set_attribute("http.target", scope["path"])
@@ -1,10 +1,45 @@
-from typing import TypeVar, Generic, List
+import base64
+import binascii
+import json
+from datetime import datetime
+from enum import Enum
+from typing import TypeVar, Generic, List, Any, Sequence
 
 from pydantic import BaseModel
 
+from src.exceptions import InvalidCursorError
+
 
 T = TypeVar('T')
 
 class PaginationModel(BaseModel, Generic[T]):
     items: List[T]
-    total: int
\ No newline at end of file
+    total: int
+
+class CursorPaginationModel(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: str | None = None
+    total: int | None = None
+
+class TotalMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError()
+
+    if not isinstance(values, list):
+        raise InvalidCursorError()
+    return values
\ No newline at end of file
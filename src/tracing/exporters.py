@@ -0,0 +1,160 @@
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Sequence, TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from src.tracing.tracer import Span
+
+
+logger = logging.getLogger("app.tracing.exporters")
+
+OTLP_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: Sequence["Span"]) -> None: ...
+
+    def shutdown(self) -> None:
+        pass
+
+class FileSpanExporter(SpanExporter):
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+
+    def export(self, spans: Sequence["Span"]) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            for span in spans:
+                file.write(json.dumps({
+                    "service": self.service_name,
+                    "name": span.name,
+                    "kind": span.kind,
+                    "trace_id": span.trace_id,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "start_time_ns": span.start_time,
+                    "duration_ms": round((span.end_time - span.start_time) / 1e6, 3),
+                    "attributes": span.attributes,
+                    "error": span.error,
+                }, default=str) + "\n")
+
+class OtlpHttpSpanExporter(SpanExporter):
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 10.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.client = httpx.Client(timeout=timeout)
+
+    def export(self, spans: Sequence["Span"]) -> None:
+        response = self.client.post(self.url, json=self._encode(spans))
+        if response.status_code >= 400:
+            logger.warning(f"OTLP export to {self.url} returned {response.status_code}")
+
+    def shutdown(self) -> None:
+        self.client.close()
+
+    def _encode(self, spans: Sequence["Span"]) -> dict:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": self._attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "app"},
+                    "spans": [
+                        {
+                            "traceId": span.trace_id,
+                            "spanId": span.span_id,
+                            **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                            "name": span.name,
+                            "kind": OTLP_SPAN_KINDS.get(span.kind, 1),
+                            "startTimeUnixNano": str(span.start_time),
+                            "endTimeUnixNano": str(span.end_time),
+                            "attributes": self._attributes(span.attributes),
+                            "status": {"code": 2, "message": span.error} if span.error else {"code": 0},
+                        }
+                        for span in spans
+                    ],
+                }],
+            }],
+        }
+
+    @staticmethod
+    def _attributes(attributes: dict) -> list:
+        encoded = []
+        for key, value in attributes.items():
+            if isinstance(value, bool):
+                encoded.append({"key": key, "value": {"boolValue": value}})
+            elif isinstance(value, int):
+                encoded.append({"key": key, "value": {"intValue": str(value)}})
+            elif isinstance(value, float):
+                encoded.append({"key": key, "value": {"doubleValue": value}})
+            else:
+                encoded.append({"key": key, "value": {"stringValue": str(value)}})
+        return encoded
+
+
+class SpanProcessor:
+    def __init__(
+            self,
+            exporter: SpanExporter,
+            *,
+            max_queue_size: int = 2048,
+            max_batch_size: int = 512,
+            export_interval: float = 5.0,
+    ):
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.export_interval = export_interval
+        self.dropped = 0
+
+        self._queue: deque["Span"] = deque()
+        self._max_queue_size = max_queue_size
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def on_end(self, span: "Span") -> None:
+        # deque.append is atomic, so request handlers never take a lock here
+        if len(self._queue) >= self._max_queue_size:
+            self.dropped += 1
+            return
+        self._queue.append(span)
+        if len(self._queue) >= self.max_batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        self.exporter.shutdown()
+
+    def flush(self) -> None:
+        while self._queue:
+            self._export_batch()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.export_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _export_batch(self) -> None:
+        batch = []
+        while self._queue and len(batch) < self.max_batch_size:
+            batch.append(self._queue.popleft())
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            logger.warning(f"Exporting {len(batch)} spans failed: {e}")
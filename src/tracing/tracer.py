@@ -0,0 +1,166 @@
+import functools
+import inspect
+import random
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator
+
+from src.config import settings, TracingSettings
+from src.tracing.exporters import SpanProcessor, SpanExporter, FileSpanExporter, OtlpHttpSpanExporter
+
+
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+INVALID_TRACE_ID = "0" * 32
+INVALID_SPAN_ID = "0" * 16
+
+class Span:
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "sampled", "kind",
+        "start_time", "end_time", "attributes", "error",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, sampled: bool, kind: str):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.kind = kind
+        self.start_time = time.time_ns()
+        self.end_time: int | None = None
+        self.attributes: Dict[str, Any] = {}
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+current_span_var: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    match = TRACEPARENT_PATTERN.match(header.strip().lower()) if header else None
+    if match is None:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == INVALID_TRACE_ID or parent_id == INVALID_SPAN_ID:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+class Tracer:
+    def __init__(
+            self,
+            processor: SpanProcessor | None = None,
+            sample_rate: float = 0.0,
+            propagate_hosts: frozenset[str] = frozenset(),
+    ):
+        self.processor = processor
+        self.sample_rate = sample_rate
+        self.propagate_hosts = propagate_hosts
+
+    @property
+    def enabled(self) -> bool:
+        return self.processor is not None
+
+    @contextmanager
+    def start_span(
+            self,
+            name: str,
+            kind: str = "internal",
+            traceparent: str | None = None,
+    ) -> Iterator[Span | None]:
+        if not self.enabled:
+            yield None
+            return
+
+        span = self._create_span(name, kind, traceparent)
+        token = current_span_var.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current_span_var.reset(token)
+            span.end_time = time.time_ns()
+            if span.sampled:
+                self.processor.on_end(span)
+
+    def should_propagate(self, host: str) -> bool:
+        # traceparent leaks trace ids, so only our own services receive it
+        return host in self.propagate_hosts
+
+    def start(self) -> None:
+        if self.processor is not None:
+            self.processor.start()
+
+    def shutdown(self) -> None:
+        if self.processor is not None:
+            self.processor.shutdown()
+
+    def _create_span(self, name: str, kind: str, traceparent: str | None) -> Span:
+        parent = current_span_var.get()
+        if parent is not None:
+            return Span(name, parent.trace_id, parent.span_id, parent.sampled, kind)
+
+        remote = parse_traceparent(traceparent)
+        if remote is not None:
+            trace_id, parent_id, sampled = remote
+            return Span(name, trace_id, parent_id, sampled, kind)
+
+        # head-based sampling: decided once at the root, inherited by every child
+        return Span(name, secrets.token_hex(16), None, random.random() < self.sample_rate, kind)
+
+
+def traced(name: str | None = None) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not tracer.enabled:
+                    return await func(*args, **kwargs)
+                with tracer.start_span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.start_span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def build_tracer(tracing_settings: TracingSettings) -> Tracer:
+    if not tracing_settings.tracing_enabled:
+        return Tracer()
+
+    exporter: SpanExporter
+    if tracing_settings.tracing_exporter == "otlp":
+        exporter = OtlpHttpSpanExporter(tracing_settings.tracing_otlp_endpoint, tracing_settings.tracing_service_name)
+    else:
+        exporter = FileSpanExporter(tracing_settings.tracing_file_path, tracing_settings.tracing_service_name)
+
+    processor = SpanProcessor(
+        exporter,
+        max_queue_size=tracing_settings.tracing_max_queue_size,
+        max_batch_size=tracing_settings.tracing_max_batch_size,
+        export_interval=tracing_settings.tracing_export_interval,
+    )
+    return Tracer(
+        processor,
+        tracing_settings.tracing_sample_rate,
+        frozenset(tracing_settings.tracing_propagate_hosts),
+    )
+
+tracer = build_tracer(settings.tracing_settings)
@@ -2,6 +2,7 @@ from fastapi import Request, Response
 
 from src.storage.cookie_storage_manager import CookieStorageManager
 from src.http_client.httpx_http_client import HttpxHttpClient
+from src.http_client.httpx_client_manager import httpx_client_manager
 
 
 def get_cookie_storage_manager(
@@ -10,4 +11,4 @@ def get_cookie_storage_manager(
     return CookieStorageManager(request)
 
 def get_httpx_http_client() -> HttpxHttpClient:
-    return HttpxHttpClient()
\ No newline at end of file
+    return HttpxHttpClient(httpx_client_manager.client)
\ No newline at end of file
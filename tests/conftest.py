@@ -0,0 +1,58 @@
+import os
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.database.base import Base
+from src.database.models import User, RefreshToken  # noqa: F401
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeTokenInfoClient:
+    def __init__(self, user_id: str, status_codes: list[int] | None = None):
+        self.user_id = user_id
+        self.status_codes = status_codes or []
+        self.calls = 0
+
+    async def send_request(self, method, url, /, **kwargs) -> httpx.Response:
+        self.calls += 1
+        if self.status_codes:
+            return httpx.Response(self.status_codes.pop(0), json={"error": "upstream"})
+        return httpx.Response(200, json={"user_id": self.user_id, "expires_in": 3600})
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(engine):
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_maker() as session:
+        yield session
+
+
+@pytest.fixture
+async def concurrent_engine(tmp_path):
+    url = os.environ.get("TEST_DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'concurrency.db'}")
+    engine = create_async_engine(url, pool_size=20, max_overflow=0)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
@@ -4,7 +4,9 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, MagicMock
 
-from src.api.auth.dependencies.repositories_dependencies import get_user_repository, get_refresh_token_repository
+from src.api.auth.dependencies.repositories_dependencies import (
+    get_user_read_repository, get_refresh_token_repository
+)
 from src.api.auth.dependencies.service_dependencies import get_google_login_with_cookie_and_hashlib_service, \
     get_exchange_code_to_token_with_httpx_and_cookie_service, get_check_valid_token_with_cookie_and_hmac_service, \
     get_save_token_service, get_user_save_service, get_refresh_token_service, get_current_user_service
@@ -83,8 +85,8 @@ def mock_current_user_service():
 def mock_user_repository():
     mock = AsyncMock()
     mock.count.return_value = 1
-    mock.get_all.return_value = [MagicMock(email="test@gmail.com", full_name="test test test",
-                                          image="http://test.jpg", created_at=datetime.now())]
+    mock.get_rows.return_value = [dict(email="test@gmail.com", full_name="test test test",
+                                       image="http://test.jpg", created_at=datetime.now())]
     return mock
 
 @pytest.fixture
@@ -145,12 +147,38 @@ def test_auth_refresh(mock_cookie_storage_manager,
 async def test_get_users(mock_current_user_service,
                          mock_user_repository):
     app.dependency_overrides[get_current_user_service] = lambda: mock_current_user_service
-    app.dependency_overrides[get_user_repository] = lambda: mock_user_repository
+    app.dependency_overrides[get_user_read_repository] = lambda: mock_user_repository
 
     response = client.get("/api/users?limit=1&offset=0", headers={"Authorization": "Bearer faketoken"})
     assert response.status_code == 200
     data = response.json()
     assert "items" in data and "total" in data
+    assert data["items"][0]["email"] == "test@gmail.com"
+    clear_overrides()
+
+
+@pytest.mark.asyncio
+async def test_get_users_by_cursor(mock_current_user_service,
+                                   mock_user_repository):
+    created_at = datetime.now()
+    mock_user_repository.get_by_cursor.return_value = (
+        [dict(email="test@gmail.com", full_name="test test test", image="http://test.jpg", created_at=created_at)],
+        [created_at, 1],
+    )
+    app.dependency_overrides[get_current_user_service] = lambda: mock_current_user_service
+    app.dependency_overrides[get_user_read_repository] = lambda: mock_user_repository
+
+    response = client.get("/api/users/cursor?limit=1&total=exact", headers={"Authorization": "Bearer faketoken"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1 and data["next_cursor"]
+
+    next_page = client.get(
+        f"/api/users/cursor?limit=1&cursor={data['next_cursor']}", headers={"Authorization": "Bearer faketoken"}
+    )
+    assert next_page.status_code == 200
+    assert mock_user_repository.get_by_cursor.call_args.kwargs["after"] == [created_at.isoformat(), 1]
+    assert next_page.json()["total"] is None
     clear_overrides()
 
 
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.api.auth.models import User, RefreshToken
+from src.api.auth.services.save_tokens_service import SaveTokensService
+from src.api.auth.utils.token_digest import token_digest
+from src.database.base_repository import BaseRepository
+
+
+async def create_user(session, sub: str = "sub-1") -> User:
+    return await BaseRepository(session, User).create({
+        "email": f"{sub}@gmail.com",
+        "full_name": "Test",
+        "image": "http://test.jpg",
+        "user_oauth_id": sub,
+    })
+
+
+def token_values(user_id: int, access_token: str, refresh_token: str | None) -> dict:
+    return {
+        "access_token": access_token,
+        "access_token_digest": token_digest(access_token),
+        "expires_at": datetime.now() + timedelta(hours=1),
+        "refresh_token": refresh_token,
+        "refresh_token_digest": token_digest(refresh_token) if refresh_token else None,
+        "token_type": "Bearer",
+        "is_active": True,
+        "user_id": user_id,
+    }
+
+
+@pytest.mark.asyncio
+async def test_upsert_inserts_then_updates_in_place(session):
+    user = await create_user(session)
+    repo = BaseRepository(session, RefreshToken)
+
+    created = await repo.upsert(token_values(user.id, "access-1", "refresh-1"), ["user_id"])
+    updated = await repo.upsert(token_values(user.id, "access-2", "refresh-2"), ["user_id"])
+
+    assert updated.id == created.id
+    assert (updated.access_token, updated.refresh_token) == ("access-2", "refresh-2")
+    assert await repo.count() == 1
+
+
+@pytest.mark.asyncio
+async def test_upsert_fallback_without_on_conflict_support(session, monkeypatch):
+    user = await create_user(session)
+    repo = BaseRepository(session, RefreshToken)
+    monkeypatch.setattr(repo, "_get_dialect_insert", lambda: None)
+
+    created = await repo.upsert(token_values(user.id, "access-1", "refresh-1"), ["user_id"])
+    updated = await repo.upsert(token_values(user.id, "access-2", None), ["user_id"])
+
+    assert updated.id == created.id
+    assert (updated.access_token, updated.refresh_token) == ("access-2", "refresh-1")
+
+
+@pytest.mark.asyncio
+async def test_update_by_conditions_skips_none_values(session):
+    user = await create_user(session)
+    repo = BaseRepository(session, RefreshToken)
+    await repo.upsert(token_values(user.id, "access-1", "refresh-1"), ["user_id"])
+
+    updated = await repo.update_by_conditions(
+        {"access_token": "access-2", "refresh_token": None},
+        RefreshToken.user_id == user.id,
+    )
+    missing = await repo.update_by_conditions({"is_active": False}, RefreshToken.user_id == -1)
+
+    assert (updated.access_token, updated.refresh_token) == ("access-2", "refresh-1")
+    assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_save_or_update_token_keeps_one_row_per_user(session):
+    user = await create_user(session)
+    service = SaveTokensService(BaseRepository(session, RefreshToken))
+    payload = {"access_token": "a", "refresh_token": "r", "expires_in": 3600, "token_type": "Bearer"}
+
+    first = await service.save_or_update_token(payload, user.id)
+    second = await service.save_or_update_token({**payload, "access_token": "b", "refresh_token": None}, user.id)
+
+    assert second.id == first.id
+    assert (second.access_token, second.refresh_token, second.is_active) == ("b", "r", True)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_update_delete_in_chunks(session):
+    repo = BaseRepository(session, User)
+    users = [{"email": f"u{index}@gmail.com", "user_oauth_id": f"bulk-{index}"} for index in range(25)]
+
+    created = await repo.bulk_create(users, chunk_size=10)
+    ids = [user.id for user in await repo.get_all(limit=100)]
+    updated = await repo.bulk_update([{"id": id, "full_name": "Bulk"} for id in ids], chunk_size=10)
+    deleted = await repo.bulk_delete(ids[:5], chunk_size=2)
+
+    assert (created, updated, deleted) == (25, 25, 5)
+    assert await repo.count() == 20
+    assert {user.full_name for user in await repo.get_all(limit=100)} == {"Bulk"}
+
+
+@pytest.mark.asyncio
+async def test_saved_tokens_are_found_by_digest(session):
+    user = await create_user(session)
+    repo = BaseRepository(session, RefreshToken)
+    service = SaveTokensService(repo)
+    payload = {"access_token": "a", "refresh_token": "r", "expires_in": 3600, "token_type": "Bearer"}
+
+    await service.save_or_update_token(payload, user.id)
+    await service.save_or_update_token({**payload, "access_token": "b", "refresh_token": None}, user.id)
+
+    by_refresh = await repo.get_by_conditions(RefreshToken.refresh_token_digest == token_digest("r"))
+    by_access = await repo.get_by_conditions(RefreshToken.access_token_digest == token_digest("b"))
+    assert [token.access_token for token in by_refresh] == ["b"]
+    assert [token.refresh_token for token in by_access] == ["r"]
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from src.api.auth.models import User, RefreshToken
+from src.api.auth.services.current_user_service import CurrentUserService
+from src.api.auth.utils.token_digest import token_digest
+from src.api.auth.utils.token_validation_cache import TokenValidationCache
+from src.database.base_repository import BaseRepository
+from src.exceptions import UnauthorizeError, UpstreamServiceError
+from tests.conftest import FakeTokenInfoClient
+
+
+@pytest.fixture
+async def seeded_session(session):
+    user = await BaseRepository(session, User).create({"email": "u@gmail.com", "user_oauth_id": "sub-1"})
+    await BaseRepository(session, RefreshToken).create({
+        "access_token": "access-1",
+        "access_token_digest": token_digest("access-1"),
+        "refresh_token": "refresh-1",
+        "refresh_token_digest": token_digest("refresh-1"),
+        "expires_at": datetime.now() + timedelta(hours=1),
+        "token_type": "Bearer",
+        "is_active": True,
+        "user_id": user.id,
+    })
+    return session
+
+
+def make_service(session, user_id: str = "sub-1", http_client=None) -> CurrentUserService:
+    cache = TokenValidationCache(max_size=10, ttl=300.0, negative_ttl=5.0)
+    http_client = http_client or FakeTokenInfoClient(user_id)
+    return CurrentUserService(BaseRepository(session, User), http_client, cache)
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_loaded_with_one_query(seeded_session):
+    statements = []
+    event.listen(
+        seeded_session.bind.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    user = await make_service(seeded_session).get_current_user("access-1")
+
+    assert user.user_oauth_id == "sub-1"
+    assert len(statements) == 1
+    assert "JOIN refreshtokens" in statements[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("user_id, access_token", [("unknown-sub", "access-1"), ("sub-1", "stale-access")])
+async def test_unknown_user_or_token_is_unauthorized(seeded_session, user_id, access_token):
+    with pytest.raises(UnauthorizeError):
+        await make_service(seeded_session, user_id).get_current_user(access_token)
+
+
+@pytest.mark.asyncio
+async def test_inactive_token_is_unauthorized(seeded_session):
+    await BaseRepository(seeded_session, RefreshToken).update_by_conditions(
+        {"is_active": False}, RefreshToken.access_token_digest == token_digest("access-1"),
+    )
+    with pytest.raises(UnauthorizeError):
+        await make_service(seeded_session).get_current_user("access-1")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code", [429, 503])
+async def test_upstream_failure_is_not_negative_cached(seeded_session, status_code):
+    http_client = FakeTokenInfoClient("sub-1", [status_code])
+    service = make_service(seeded_session, http_client=http_client)
+
+    with pytest.raises(UpstreamServiceError):
+        await service.get_current_user("access-1")
+
+    user = await service.get_current_user("access-1")
+    assert user.user_oauth_id == "sub-1"
+    assert http_client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_rejected_token_is_negative_cached(seeded_session):
+    http_client = FakeTokenInfoClient("sub-1", [400])
+    service = make_service(seeded_session, http_client=http_client)
+
+    for _ in range(2):
+        with pytest.raises(UnauthorizeError):
+            await service.get_current_user("access-1")
+    assert http_client.calls == 1
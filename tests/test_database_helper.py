@@ -0,0 +1,205 @@
+from datetime import datetime
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from src.api.auth.dependencies.cache_dependencies import get_access_token_cache
+from src.api.auth.models import User, RefreshToken
+from src.api.auth.utils.token_validation_cache import TokenValidationCache
+from src.api.auth.utils.token_digest import token_digest
+from src.config import DataBaseSettings
+from src.database.base import Base
+from src.database.base_repository import BaseRepository
+from src.database.database_helper import DatabaseHelper, build_engine_options, database_helper
+from src.main import app
+from src.utils.dependencies import get_httpx_http_client
+from tests.conftest import FakeTokenInfoClient
+
+
+def make_settings(**overrides) -> DataBaseSettings:
+    values = {"database_url": "postgresql+asyncpg://u:p@localhost/db", "database_echo": False}
+    values.update(overrides)
+    return DataBaseSettings(**values)
+
+
+def test_pool_and_asyncpg_options_come_from_settings():
+    options = build_engine_options(make_settings(
+        database_pool_size=20,
+        database_max_overflow=0,
+        database_server_settings={"application_name": "oauth"},
+    ))
+
+    assert (options["pool_size"], options["max_overflow"], options["pool_pre_ping"]) == (20, 0, True)
+    assert options["connect_args"]["server_settings"] == {"application_name": "oauth"}
+    assert options["connect_args"]["statement_cache_size"] == 100
+
+
+def test_pgbouncer_mode_disables_statement_caches():
+    connect_args = build_engine_options(make_settings(database_pgbouncer=True))["connect_args"]
+    name_func = connect_args["prepared_statement_name_func"]
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert name_func() != name_func()
+
+
+def test_sqlite_gets_no_pool_sizing_or_connect_args():
+    options = build_engine_options(make_settings(database_url="sqlite+aiosqlite:///:memory:"))
+    assert options == {"pool_pre_ping": True}
+
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_the_pool(tmp_path):
+    helper = DatabaseHelper.from_settings(make_settings(
+        database_url=f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}",
+    ))
+    try:
+        opened = await helper.warm_up(3)
+        assert opened == 3
+        assert helper.engine.pool.checkedin() == 3
+    finally:
+        await helper.close()
+
+
+def make_replicated_helper(tmp_path, *replica_names: str, **options) -> DatabaseHelper:
+    return DatabaseHelper(
+        f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}",
+        echo=False,
+        replica_urls=[f"sqlite+aiosqlite:///{tmp_path / name}" for name in replica_names],
+        **options,
+    )
+
+
+async def read_database(helper: DatabaseHelper) -> str:
+    sessions = helper.read_session_depends()
+    session = await sessions.__anext__()
+    await sessions.aclose()
+    return session.bind.url.database.rsplit("/", 1)[-1]
+
+
+@pytest.mark.asyncio
+async def test_reads_round_robin_across_replicas(tmp_path):
+    helper = make_replicated_helper(tmp_path, "r1.db", "r2.db")
+    try:
+        assert [await read_database(helper) for _ in range(4)] == ["r1.db", "r2.db", "r1.db", "r2.db"]
+    finally:
+        await helper.close()
+
+
+@pytest.mark.asyncio
+async def test_least_connections_prefers_idle_replica(tmp_path):
+    helper = make_replicated_helper(tmp_path, "r1.db", "r2.db", replica_routing="least_connections")
+    try:
+        busy = helper.read_session_depends()
+        await busy.__anext__()
+        assert await read_database(helper) == "r2.db"
+        await busy.aclose()
+    finally:
+        await helper.close()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_or_lagging_replicas_fall_back_to_primary(tmp_path, monkeypatch):
+    helper = make_replicated_helper(tmp_path, "missing/r1.db", "r2.db", max_replica_lag=1.0)
+
+    async def lagging(replica):
+        return 30.0 if replica.name.endswith("r2.db") else 0.0
+
+    try:
+        assert await read_database(helper) == "primary.db"
+        assert not helper.replicas[0].healthy
+
+        monkeypatch.setattr(helper, "_measure_lag", lagging)
+        await helper.check_replicas()
+        assert [replica.healthy for replica in helper.replicas] == [True, False]
+    finally:
+        await helper.close()
+
+
+@pytest.mark.asyncio
+async def test_current_user_right_after_login_ignores_lagging_replica(tmp_path):
+    helper = make_replicated_helper(tmp_path, "lagging.db", unit_of_work=True)
+    for engine in (helper.engine, helper.replicas[0].engine):
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    # the login commits to the primary; the replica has not replayed it yet
+    sessions = helper.session_depends()
+    await save_user_and_token(await sessions.__anext__())
+    with pytest.raises(StopAsyncIteration):
+        await sessions.__anext__()
+
+    app.dependency_overrides[database_helper.session_depends] = helper.session_depends
+    app.dependency_overrides[database_helper.read_session_depends] = helper.read_session_depends
+    app.dependency_overrides[get_httpx_http_client] = lambda: FakeTokenInfoClient("sub")
+    app.dependency_overrides[get_access_token_cache] = lambda: TokenValidationCache(10, 300.0, 5.0)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/api/current-user", headers={"Authorization": "Bearer access"})
+    finally:
+        app.dependency_overrides = {}
+        await helper.close()
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "u@gmail.com"
+
+
+@pytest.fixture
+async def unit_of_work_helper(tmp_path):
+    helper = DatabaseHelper(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}", echo=False, unit_of_work=True)
+    async with helper.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    commits = []
+    event.listen(helper.engine.sync_engine, "commit", lambda connection: commits.append(connection))
+    helper.commits = commits
+    yield helper
+    await helper.close()
+
+
+async def save_user_and_token(session) -> None:
+    user = await BaseRepository(session, User).create({"email": "u@gmail.com", "user_oauth_id": "sub"})
+    await BaseRepository(session, RefreshToken).upsert(
+        {
+            "access_token": "access",
+            "access_token_digest": token_digest("access"),
+            "refresh_token": "refresh",
+            "refresh_token_digest": token_digest("refresh"),
+            "expires_at": datetime.now(),
+            "token_type": "Bearer",
+            "is_active": True,
+            "user_id": user.id,
+        },
+        ["user_id"],
+    )
+
+
+async def count_rows(helper: DatabaseHelper, model) -> int:
+    async with helper.session_maker() as session:
+        return await BaseRepository(session, model).count()
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once_per_request(unit_of_work_helper):
+    sessions = unit_of_work_helper.session_depends()
+    await save_user_and_token(await sessions.__anext__())
+    assert unit_of_work_helper.commits == []
+
+    with pytest.raises(StopAsyncIteration):
+        await sessions.__anext__()
+
+    assert len(unit_of_work_helper.commits) == 1
+    assert (await count_rows(unit_of_work_helper, User), await count_rows(unit_of_work_helper, RefreshToken)) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_on_error(unit_of_work_helper):
+    sessions = unit_of_work_helper.session_depends()
+    await save_user_and_token(await sessions.__anext__())
+
+    with pytest.raises(RuntimeError):
+        await sessions.athrow(RuntimeError("request failed"))
+
+    assert unit_of_work_helper.commits == []
+    assert await count_rows(unit_of_work_helper, User) == 0
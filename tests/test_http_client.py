@@ -0,0 +1,54 @@
+import httpx
+import pytest
+
+from src.config import HttpClientSettings
+from src.http_client.httpx_client_manager import HttpxClientManager
+from src.http_client.httpx_http_client import HttpxHttpClient
+from src.exceptions import InternalServerError
+
+
+def make_manager(handler) -> HttpxClientManager:
+    return HttpxClientManager(HttpClientSettings(), transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_clients_share_one_pooled_connection():
+    manager = make_manager(lambda request: httpx.Response(200, json={"ok": True}))
+    await manager.start()
+
+    first = HttpxHttpClient(manager.client)
+    second = HttpxHttpClient(manager.client)
+    assert first.client is second.client
+
+    response = await first.send_request("GET", "https://example.com/tokeninfo")
+    assert response.json() == {"ok": True}
+
+    await manager.close()
+    assert manager._client is None
+
+
+@pytest.mark.asyncio
+async def test_per_request_timeout_overrides_client_default():
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["timeout"] = request.extensions["timeout"]
+        return httpx.Response(200)
+
+    manager = make_manager(handler)
+    client = HttpxHttpClient(manager.client)
+
+    await client.send_request("POST", "https://example.com/token", data={"a": "b"}, timeout=2.5)
+    assert seen["timeout"]["read"] == 2.5
+
+    await client.send_request("GET", "https://example.com/tokeninfo")
+    assert seen["timeout"]["read"] == HttpClientSettings().http_timeout
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_unsupported_method():
+    manager = make_manager(lambda request: httpx.Response(200))
+    with pytest.raises(InternalServerError):
+        await HttpxHttpClient(manager.client).send_request("DELETE", "https://example.com")
+    await manager.close()
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 2000))
+MODULE_COUNT_BUDGET = int(os.environ.get("IMPORT_MODULE_BUDGET", 800))
+
+# loaded on first use or at startup, never by importing the app
+LAZY_MODULES = ("jose", "cryptography", "google", "asyncpg")
+
+
+def import_profile(module: str = "src.main") -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, total, name = line.removeprefix("import time:").split("|")
+        cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+@pytest.fixture(scope="module")
+def profile():
+    return import_profile()
+
+
+@pytest.mark.parametrize("module", LAZY_MODULES)
+def test_heavy_dependencies_are_not_imported_with_the_app(profile, module):
+    assert module not in profile
+
+
+def test_app_import_stays_within_module_budget(profile):
+    assert len(profile) <= MODULE_COUNT_BUDGET
+
+
+def test_app_import_stays_within_time_budget(profile):
+    # the best of a few runs, so a noisy neighbour does not fail the build
+    fastest = min(profile["src.main"], *(import_profile()["src.main"] for _ in range(2)))
+    assert fastest / 1000 <= IMPORT_TIME_BUDGET_MS
@@ -0,0 +1,60 @@
+import io
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.api.auth.models import User
+from src.api.auth.schemas import ExportFormat
+from src.cli.import_users import import_users
+from src.database.base_repository import BaseRepository
+
+
+@pytest.fixture
+def session_maker(engine):
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def ndjson_rows(count: int) -> io.StringIO:
+    lines = [json.dumps({"user_oauth_id": f"sub-{index}", "email": f"u{index}@gmail.com"}) for index in range(count)]
+    return io.StringIO("\n".join(lines) + "\n")
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_in_batches(session_maker):
+    output = io.StringIO()
+    progress = await import_users(
+        ndjson_rows(12), ExportFormat.NDJSON, session_maker, batch_size=5, progress_output=output,
+    )
+
+    async with session_maker() as session:
+        users = await BaseRepository(session, User).get_all(limit=100)
+
+    assert progress.imported == 12
+    assert len(users) == 12
+    assert all(user.created_at is not None and user.updated_at == user.created_at for user in users)
+    assert output.getvalue().count("progress:") == 3
+    assert output.getvalue().splitlines()[-1].startswith("done: imported=12")
+
+
+@pytest.mark.asyncio
+async def test_import_csv_skips_invalid_rows(session_maker):
+    stream = io.StringIO(
+        "user_oauth_id,email,full_name,image,created_at,updated_at\n"
+        "sub-1,u1@gmail.com,One,,2025-01-01T00:00:00,\n"
+        ",missing-sub@gmail.com,,,,\n"
+    )
+    progress = await import_users(
+        stream, ExportFormat.CSV, session_maker, skip_invalid=True, progress_output=io.StringIO(),
+    )
+
+    assert (progress.imported, progress.skipped) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_invalid_rows_by_default(session_maker):
+    with pytest.raises(ValueError):
+        await import_users(
+            io.StringIO('{"email": "no-sub@gmail.com"}\n'), ExportFormat.NDJSON, session_maker,
+            progress_output=io.StringIO(),
+        )
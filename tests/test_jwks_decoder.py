@@ -0,0 +1,154 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from src.api.auth.utils.jwks_decoder import JwksDecoder
+from src.api.auth.utils.jwks_key_set import JwksKeySet
+from src.exceptions import UnauthorizeError
+from tests.conftest import FakeClock
+
+
+AUDIENCE = "client-id"
+ISSUER = "https://accounts.google.com"
+
+
+def make_signing_key(kid: str) -> tuple[str, dict]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_jwk = jwk.construct(private_key.public_key(), "RS256").to_dict()
+    public_jwk.update({"kid": kid, "use": "sig"})
+    return private_pem, public_jwk
+
+
+def make_id_token(private_pem: str, kid: str, **claims) -> str:
+    payload = {
+        "sub": "google-sub",
+        "email": "test@gmail.com",
+        "aud": AUDIENCE,
+        "iss": ISSUER,
+        "exp": int(time.time()) + 3600,
+        "at_hash": "ignored",
+    }
+    payload.update(claims)
+    return jwt.encode(payload, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+class FakeJwksClient:
+    def __init__(self, *jwks_keys: dict, cache_control: str = "public, max-age=600"):
+        self.jwks_keys = list(jwks_keys)
+        self.cache_control = cache_control
+        self.status_code = 200
+        self.calls = 0
+
+    async def send_request(self, method, url, /, **kwargs) -> httpx.Response:
+        self.calls += 1
+        if self.status_code != 200:
+            return httpx.Response(self.status_code)
+        return httpx.Response(
+            200, json={"keys": self.jwks_keys}, headers={"Cache-Control": self.cache_control}
+        )
+
+
+def make_decoder(http_client: FakeJwksClient, executor=None) -> JwksDecoder:
+    key_set = JwksKeySet(
+        lambda: http_client,
+        "https://example.com/certs",
+        default_max_age=3600,
+        min_refresh_interval=0,
+    )
+    return JwksDecoder(key_set, AUDIENCE, [ISSUER], ["RS256"], executor=executor)
+
+
+@pytest.mark.asyncio
+async def test_valid_id_token_is_verified_locally():
+    private_pem, public_jwk = make_signing_key("k1")
+    http_client = FakeJwksClient(public_jwk)
+    decoder = make_decoder(http_client)
+
+    payload = await decoder.adecode(make_id_token(private_pem, "k1"))
+    await decoder.adecode(make_id_token(private_pem, "k1"))
+
+    assert payload["sub"] == "google-sub"
+    assert http_client.calls == 1
+    assert decoder.key_set._expires_at - decoder.key_set.clock() == pytest.approx(600, abs=1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("claims", [{"aud": "someone-else"}, {"iss": "https://evil.example"}, {"exp": 1}])
+async def test_invalid_claims_are_rejected(claims):
+    private_pem, public_jwk = make_signing_key("k1")
+    decoder = make_decoder(FakeJwksClient(public_jwk))
+
+    with pytest.raises(UnauthorizeError):
+        await decoder.adecode(make_id_token(private_pem, "k1", **claims))
+
+
+@pytest.mark.asyncio
+async def test_forged_signature_is_rejected():
+    _, public_jwk = make_signing_key("k1")
+    other_pem, _ = make_signing_key("k1")
+    decoder = make_decoder(FakeJwksClient(public_jwk))
+
+    with pytest.raises(UnauthorizeError):
+        await decoder.adecode(make_id_token(other_pem, "k1"))
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refreshes_rotated_key_set():
+    old_pem, old_jwk = make_signing_key("old")
+    new_pem, new_jwk = make_signing_key("new")
+    http_client = FakeJwksClient(old_jwk)
+    decoder = make_decoder(http_client)
+
+    await decoder.adecode(make_id_token(old_pem, "old"))
+    http_client.jwks_keys = [old_jwk, new_jwk]
+
+    payload = await decoder.adecode(make_id_token(new_pem, "new"))
+    assert payload["email"] == "test@gmail.com"
+    assert http_client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_verification_on_thread_pool():
+    private_pem, public_jwk = make_signing_key("k1")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        decoder = make_decoder(FakeJwksClient(public_jwk), executor=executor)
+        payload = await decoder.adecode(make_id_token(private_pem, "k1"))
+    assert payload["aud"] == AUDIENCE
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_keys_and_backs_off():
+    _, public_jwk = make_signing_key("k1")
+    http_client = FakeJwksClient(public_jwk, cache_control="public, max-age=60")
+    clock = FakeClock()
+    key_set = JwksKeySet(
+        lambda: http_client,
+        "https://example.com/certs",
+        default_max_age=3600,
+        min_refresh_interval=30,
+        clock=clock,
+    )
+
+    assert await key_set.get_key("k1") is not None
+    http_client.status_code = 503
+    clock.now = 60.0
+
+    for _ in range(10):
+        assert await key_set.get_key("k1") is not None
+        assert await key_set.get_key("unknown") is None
+    assert http_client.calls == 2
+
+    clock.now = 90.0
+    http_client.status_code = 200
+    assert await key_set.get_key("k1") is not None
+    assert http_client.calls == 3
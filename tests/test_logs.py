@@ -0,0 +1,114 @@
+import json
+import logging
+import queue
+import sys
+import threading
+
+from src.config import LoggingSettings
+from src.logs import (
+    DeferredQueueHandler,
+    JsonFormatter,
+    RateLimitFilter,
+    SamplingFilter,
+    move_handlers_to_queue,
+    setup_logging,
+    stop_listeners,
+)
+from src.metrics import registry
+from tests.conftest import FakeClock
+
+
+class ThreadRecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages: list[tuple[str, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append((self.format(record), threading.current_thread().name))
+
+
+def make_record(
+        name: str = "app.database.base_repository",
+        level: int = logging.WARNING,
+        lineno: int = 10,
+) -> logging.LogRecord:
+    return logging.LogRecord(name, level, "base_repository.py", lineno, "Not found", None, None)
+
+
+def test_rate_limit_suppresses_repeats_from_one_call_site_and_reports_them():
+    clock = FakeClock()
+    rate_limit = RateLimitFilter({"app.database": 2}, interval=60, clock=clock)
+
+    passed = [rate_limit.filter(make_record()) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert rate_limit.filter(make_record(lineno=99))
+    assert rate_limit.filter(make_record(name="app.api.auth.router"))
+
+    clock.now = 61
+    record = make_record()
+    assert rate_limit.filter(record)
+    assert record.getMessage() == "Not found (3 similar messages suppressed)"
+
+
+def test_sampling_drops_warnings_but_keeps_errors():
+    sampling = SamplingFilter({"app.http_client": 0.0, "app.http_client.metrics": 1.0}, random_value=lambda: 0.5)
+
+    assert not sampling.filter(make_record(name="app.http_client.httpx_http_client"))
+    assert sampling.filter(make_record(name="app.http_client.httpx_http_client", level=logging.ERROR))
+    assert sampling.filter(make_record(name="app.http_client.metrics"))
+    assert sampling.filter(make_record(name="app.database"))
+
+
+def test_queued_records_are_formatted_on_the_listener_thread():
+    logger = logging.getLogger("app.tests.queued")
+    logger.propagate = False
+    handler = ThreadRecordingHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logger.addHandler(handler)
+
+    listener = move_handlers_to_queue(logger, 100, [])
+    try:
+        logger.warning("user %s not found", 42)
+    finally:
+        listener.stop()
+
+    [(message, thread_name)] = handler.messages
+    assert message == "WARNING user 42 not found"
+    assert thread_name != threading.current_thread().name
+
+
+def test_full_queue_drops_records_instead_of_blocking():
+    dropped_before = registry.get_sample_value("log_records_dropped_total") or 0.0
+    queue_handler = DeferredQueueHandler(queue.Queue(1))
+    queue_handler.handle(make_record())
+    queue_handler.handle(make_record())
+    assert queue_handler.dropped == 1
+    assert registry.get_sample_value("log_records_dropped_total") == dropped_before + 1
+
+
+def test_json_formatter_includes_extra_fields_and_exceptions():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("app.test", logging.ERROR, "x.py", 1, "failed %s", ("export",), sys.exc_info())
+    record.request_id = "abc"
+
+    payload = json.loads(JsonFormatter().format(record))
+    assert (payload["message"], payload["level"], payload["request_id"]) == ("failed export", "ERROR", "abc")
+    assert payload["exception"].endswith("ValueError: boom")
+
+
+def test_repeated_setup_stops_the_previous_listeners_and_closes_their_files(tmp_path):
+    logging_settings = LoggingSettings(logging_file_path=str(tmp_path / "app.log"))
+    try:
+        first = setup_logging(logging_settings)
+        [first_file] = [
+            handler for handler in first[1].handlers if isinstance(handler, logging.FileHandler)
+        ]
+        second = setup_logging(logging_settings)
+    finally:
+        stop_listeners()
+
+    assert len(first) == len(second) == 2
+    assert all(listener._thread is None for listener in first)
+    assert first_file.stream is None
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from src.loop_watchdog import LoopWatchdog
+from src.metrics import registry
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+class SlowStateGenerator:
+    def generate(self) -> str:
+        time.sleep(0.2)
+        return "state"
+
+
+@pytest.fixture
+def watchdog_messages():
+    handler = RecordingHandler()
+    logger = logging.getLogger("app.loop_watchdog")
+    logger.addHandler(handler)
+    yield handler.messages
+    logger.removeHandler(handler)
+
+
+def block_the_loop() -> None:
+    time.sleep(0.2)
+
+
+async def test_stall_is_reported_with_the_blocking_stack(watchdog_messages):
+    before = registry.get_sample_value("event_loop_stalls_total", {"call": "unknown"}) or 0
+    watchdog = LoopWatchdog(threshold=0.05, interval=0.01)
+    watchdog.start()
+    await asyncio.sleep(0.05)
+
+    block_the_loop()
+    await asyncio.sleep(0.05)
+    await watchdog.close()
+
+    blocked = [message for message in watchdog_messages if message.startswith("Event loop blocked")]
+    assert len(blocked) == 1
+    assert "block_the_loop" in blocked[0]
+    assert any(message.startswith("Event loop stall ended") for message in watchdog_messages)
+    assert registry.get_sample_value("event_loop_stalls_total", {"call": "unknown"}) == before + 1
+
+
+async def test_debug_mode_attributes_stall_to_wrapped_hot_spot(watchdog_messages):
+    original = SlowStateGenerator.generate
+    watchdog = LoopWatchdog(
+        threshold=0.05,
+        interval=0.01,
+        hot_spots=["tests.test_loop_watchdog:SlowStateGenerator.generate"],
+    )
+    watchdog.start()
+    await asyncio.sleep(0.05)
+
+    assert SlowStateGenerator().generate() == "state"
+    await asyncio.sleep(0.05)
+    await watchdog.close()
+
+    assert any("in SlowStateGenerator.generate" in message for message in watchdog_messages)
+    assert registry.get_sample_value(
+        "blocking_call_seconds_count", {"call": "SlowStateGenerator.generate"},
+    ) >= 1
+    assert SlowStateGenerator.generate is original
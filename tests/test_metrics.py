@@ -0,0 +1,105 @@
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.database.database_helper import database_helper
+from src.http_client.httpx_http_client import HttpxHttpClient
+from src.main import app
+from src.metrics import registry, DatabasePoolCollector, TimedAsyncAdaptedQueuePool
+
+
+client = TestClient(app)
+
+
+def sample(name: str, **labels) -> float:
+    return registry.get_sample_value(name, labels) or 0.0
+
+
+def test_requests_are_recorded_by_route_template(tmp_path, monkeypatch):
+    # pin a sized pool so the gauges do not depend on whichever DATABASE_URL the suite runs with
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'route.db'}", poolclass=TimedAsyncAdaptedQueuePool, pool_size=3,
+    )
+    monkeypatch.setattr(database_helper, "_engine", engine)
+    monkeypatch.setattr(database_helper, "_session_maker", async_sessionmaker(bind=engine))
+    before = sample("http_request_duration_seconds_count", method="GET", route="/api/users/cursor", status="422")
+    unmatched_before = sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404")
+
+    client.get("/api/users/cursor?cursor=abc")
+    client.get("/api/no-such-route/123")
+    response = client.get("/metrics")
+
+    assert sample("http_request_duration_seconds_count", method="GET", route="/api/users/cursor", status="422") == before + 1
+    assert sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404") == unmatched_before + 1
+    assert "http_requests_in_flight" in response.text
+    assert 'db_pool_size{pool="primary"} 3.0' in response.text
+
+
+@pytest.mark.asyncio
+async def test_upstream_calls_are_labelled_without_query_string():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/broken":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as async_client:
+        http_client = HttpxHttpClient(async_client)
+        labels = {"method": "GET", "endpoint": "www.googleapis.com/oauth2/v1/tokeninfo", "status": "200"}
+        before = sample("upstream_request_duration_seconds_count", **labels)
+
+        await http_client.send_request("GET", "https://www.googleapis.com/oauth2/v1/tokeninfo?access_token=secret")
+        with pytest.raises(httpx.ConnectError):
+            await http_client.send_request("GET", "https://example.com/broken")
+
+    assert sample("upstream_request_duration_seconds_count", **labels) == before + 1
+    assert sample(
+        "upstream_request_errors_total", method="GET", endpoint="example.com/broken", error="ConnectError",
+    ) >= 1
+    assert "secret" not in str(list(registry.collect()))
+
+
+@pytest.mark.asyncio
+async def test_pool_wait_and_gauges(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=TimedAsyncAdaptedQueuePool, pool_size=2,
+    )
+    pool_registry = CollectorRegistry()
+    pool_registry.register(DatabasePoolCollector(lambda: [("primary", engine.pool)]))
+    waits_before = sample("db_pool_wait_seconds_count")
+
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            assert pool_registry.get_sample_value("db_pool_checked_out", {"pool": "primary"}) == 1
+        assert pool_registry.get_sample_value("db_pool_size", {"pool": "primary"}) == 2
+        assert sample("db_pool_wait_seconds_count") == waits_before + 1
+    finally:
+        await engine.dispose()
+
+
+def test_multiprocess_mode_sums_every_worker(tmp_path):
+    environment = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    record = (
+        "from src.metrics import http_requests_in_flight, upstream_request_errors_total, mark_worker_exited; "
+        "upstream_request_errors_total.labels('GET', 'example.com', 'ConnectError').inc(); "
+        "http_requests_in_flight.inc(); mark_worker_exited()"
+    )
+    scrape = (
+        "from src.metrics import build_exposition_registry; "
+        "print(build_exposition_registry().get_sample_value("
+        "'upstream_request_errors_total', {'method': 'GET', 'endpoint': 'example.com', 'error': 'ConnectError'}))"
+    )
+
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", record], env=environment, check=True)
+    assert not list(tmp_path.glob("gauge_livesum_*"))
+    output = subprocess.run([sys.executable, "-c", scrape], env=environment, check=True, capture_output=True)
+
+    assert output.stdout.decode().strip() == "2.0"
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.api.auth.models import User
+from src.database.base_repository import BaseRepository
+from src.exceptions import InvalidCursorError
+from src.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 7, 20, 13, 52, 45, 318334)
+    assert decode_cursor(encode_cursor([created_at, 42])) == [created_at.isoformat(), 42]
+
+
+@pytest.mark.parametrize("cursor", ["***", "bm90IGpzb24", encode_cursor([]) + "x"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_row_once(session):
+    repo = BaseRepository(session, User)
+    created_at = datetime(2025, 1, 1)
+    for index in range(25):
+        await repo.create({
+            "email": f"user{index}@gmail.com",
+            "user_oauth_id": f"sub-{index}",
+            "created_at": created_at + timedelta(minutes=index // 2),
+        })
+
+    seen, after = [], None
+    while True:
+        users, next_values = await repo.get_by_cursor(
+            after=decode_cursor(encode_cursor(after)) if after else None, limit=10,
+        )
+        seen.extend(user.user_oauth_id for user in users)
+        if next_values is None:
+            break
+        after = next_values
+
+    assert seen == [f"sub-{index}" for index in range(25)]
+
+
+@pytest.mark.asyncio
+async def test_projection_rows_skip_orm_instances(session):
+    repo = BaseRepository(session, User)
+    await repo.create({"email": "a@gmail.com", "user_oauth_id": "sub-a", "full_name": "A"})
+    await repo.create({"email": "b@gmail.com", "user_oauth_id": "sub-b", "full_name": "B"})
+
+    rows = await repo.get_rows(["email", "full_name"], limit=1)
+    page, next_values = await repo.get_by_cursor(limit=1, columns=["email"])
+
+    assert rows == [{"email": "a@gmail.com", "full_name": "A"}]
+    assert page[0]["email"] == "a@gmail.com"
+    assert next_values == [page[0]["created_at"], page[0]["id"]]
+
+
+@pytest.mark.asyncio
+async def test_cursor_with_wrong_shape_is_rejected(session):
+    with pytest.raises(InvalidCursorError):
+        await BaseRepository(session, User).get_by_cursor(after=["not-a-date", 1])
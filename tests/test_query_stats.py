@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import text
+
+from src.api.auth.dependencies.cache_dependencies import get_access_token_cache
+from src.api.auth.dependencies.repositories_dependencies import get_user_repository
+from src.api.auth.models import User, RefreshToken
+from src.api.auth.utils.token_digest import token_digest
+from src.api.auth.utils.token_validation_cache import TokenValidationCache
+from src.database import query_stats
+from src.database.base_repository import BaseRepository
+from src.database.query_stats import QueryInstrumentation, assert_query_budget, track_queries
+from src.main import app
+from src.utils.dependencies import get_httpx_http_client
+from tests.conftest import FakeTokenInfoClient
+
+
+@pytest.fixture
+def warnings_log(monkeypatch):
+    messages = []
+    monkeypatch.setattr(query_stats.logger, "warning", messages.append)
+    return messages
+
+
+@pytest.fixture
+def instrumentation(engine):
+    instrumentation = QueryInstrumentation(slow_query_threshold=60.0, n_plus_one_threshold=3)
+    instrumentation.instrument(engine.sync_engine)
+    return instrumentation
+
+
+@pytest.mark.asyncio
+async def test_queries_are_counted_per_scope(session, instrumentation):
+    with track_queries() as outer:
+        await session.execute(text("SELECT 1"))
+        with track_queries() as inner:
+            await session.execute(text("SELECT 2"))
+
+    assert (outer.count, inner.count) == (2, 1)
+    assert outer.duration >= inner.duration > 0
+    assert sorted(statement for _, statement in outer.slowest) == ["SELECT 1", "SELECT 2"]
+    assert outer.slowest[0][0] >= outer.slowest[1][0]
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_and_repeated_statements_are_logged(session, instrumentation, warnings_log):
+    instrumentation.slow_query_threshold = 0.0
+    with track_queries() as stats:
+        for _ in range(3):
+            await session.execute(text("SELECT 1"))
+    instrumentation.report_repeated(stats, "/users")
+
+    assert sum(message.startswith("Slow query") for message in warnings_log) == 3
+    assert warnings_log[-1] == "Possible N+1 on /users: 3x SELECT 1"
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_does_not_skew_the_next_timing(session, instrumentation):
+    with pytest.raises(Exception):
+        await session.execute(text("SELECT * FROM no_such_table"))
+    await session.rollback()
+
+    with track_queries() as stats:
+        await session.execute(text("SELECT 1"))
+
+    assert stats.count == 1
+    assert 0 < stats.duration < 1.0
+
+
+@pytest.mark.asyncio
+async def test_query_budget_fails_when_exceeded(session, instrumentation):
+    with pytest.raises(AssertionError, match="at most 1 queries, got 2"):
+        with assert_query_budget(1):
+            await session.execute(text("SELECT 1"))
+            await session.execute(text("SELECT 2"))
+
+
+@pytest.mark.asyncio
+async def test_current_user_route_stays_within_one_query(session, instrumentation):
+    user = await BaseRepository(session, User).create({"email": "u@gmail.com", "user_oauth_id": "sub-1"})
+    await BaseRepository(session, RefreshToken).create({
+        "access_token": "access-1",
+        "access_token_digest": token_digest("access-1"),
+        "refresh_token": "refresh-1",
+        "refresh_token_digest": token_digest("refresh-1"),
+        "expires_at": datetime.now() + timedelta(hours=1),
+        "token_type": "Bearer",
+        "is_active": True,
+        "user_id": user.id,
+    })
+    app.dependency_overrides[get_user_repository] = lambda: BaseRepository(session, User)
+    app.dependency_overrides[get_httpx_http_client] = lambda: FakeTokenInfoClient("sub-1")
+    app.dependency_overrides[get_access_token_cache] = lambda: TokenValidationCache(10, 300.0, 5.0)
+
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app), base_url="http://test") as client:
+            with assert_query_budget(1):
+                response = await client.get("/api/current-user", headers={"Authorization": "Bearer access-1"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith('db;dur=')
+    assert 'desc="1 queries"' in response.headers["server-timing"]
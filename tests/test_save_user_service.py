@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.api.auth.models import User
+from src.api.auth.services.save_user_service import UserSaveService
+from src.api.auth.utils.decoder import Decoder
+from src.database.base_repository import BaseRepository
+
+
+class StaticDecoder(Decoder):
+    def __init__(self, **claims):
+        self.claims = {
+            "sub": "google-sub",
+            "email": "test@gmail.com",
+            "name": "Test User",
+            "picture": "http://test.jpg",
+            **claims,
+        }
+
+    def decode(self, token: str) -> dict:
+        return self.claims
+
+
+@pytest.mark.asyncio
+async def test_repeat_login_refreshes_profile_fields(session):
+    repo = BaseRepository(session, User)
+
+    first = await UserSaveService(StaticDecoder(), repo).save_user("id-token")
+    first_updated_at = first.updated_at
+    second = await UserSaveService(
+        StaticDecoder(name="Renamed", picture="http://new.jpg"), repo
+    ).save_user("id-token")
+
+    assert second.id == first.id
+    assert (second.full_name, second.image) == ("Renamed", "http://new.jpg")
+    assert second.updated_at > first_updated_at
+    assert await repo.count() == 1
+
+
+@pytest.mark.asyncio
+async def test_parallel_first_logins_for_same_identity(concurrent_engine):
+    session_maker = async_sessionmaker(bind=concurrent_engine, expire_on_commit=False)
+
+    async def first_login() -> int:
+        async with session_maker() as session:
+            user = await UserSaveService(StaticDecoder(), BaseRepository(session, User)).save_user("id-token")
+            return user.id
+
+    user_ids = await asyncio.gather(*(first_login() for _ in range(200)))
+
+    async with session_maker() as session:
+        assert await BaseRepository(session, User).count() == 1
+    assert len(set(user_ids)) == 1
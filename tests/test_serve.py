@@ -0,0 +1,63 @@
+import pytest
+
+from src.cli.serve import prepare_metrics_directory, split_pools, worker_count
+from src.config import DataBaseSettings, HttpClientSettings, MetricsSettings, ServerSettings
+
+
+def make_database_settings(**overrides) -> DataBaseSettings:
+    values = {"database_url": "postgresql+asyncpg://u:p@localhost/db", "database_echo": False}
+    values.update(overrides)
+    return DataBaseSettings(**values)
+
+
+def test_pools_fit_postgres_max_connections_across_workers():
+    environment = split_pools(
+        8,
+        make_database_settings(database_pool_size=10, database_max_overflow=10, database_warmup_connections=10),
+        HttpClientSettings(http_max_connections=100, http_max_keepalive_connections=20),
+        ServerSettings(server_postgres_max_connections=100, server_postgres_reserved_connections=12),
+    )
+
+    assert environment["DATABASE_POOL_SIZE"] == "10"
+    assert environment["DATABASE_MAX_OVERFLOW"] == "1"
+    assert environment["DATABASE_WARMUP_CONNECTIONS"] == "10"
+    assert environment["HTTP_MAX_CONNECTIONS"] == "12"
+    assert environment["HTTP_MAX_KEEPALIVE_CONNECTIONS"] == "12"
+    assert 8 * (int(environment["DATABASE_POOL_SIZE"]) + int(environment["DATABASE_MAX_OVERFLOW"])) <= 88
+
+
+def test_small_worker_count_keeps_configured_pools():
+    environment = split_pools(
+        2,
+        make_database_settings(database_pool_size=5, database_max_overflow=10),
+        HttpClientSettings(),
+        ServerSettings(),
+    )
+    assert (environment["DATABASE_POOL_SIZE"], environment["DATABASE_MAX_OVERFLOW"]) == ("5", "10")
+
+
+def test_too_many_workers_for_postgres_is_rejected():
+    with pytest.raises(ValueError):
+        split_pools(
+            50,
+            make_database_settings(),
+            HttpClientSettings(),
+            ServerSettings(server_postgres_max_connections=40, server_postgres_reserved_connections=5),
+        )
+
+
+def test_worker_count_defaults_to_available_cpus():
+    assert worker_count(3) == 3
+    assert worker_count(0) >= 1
+
+
+def test_metrics_directory_is_cleared_for_a_new_run(tmp_path):
+    directory = tmp_path / "metrics"
+    directory.mkdir()
+    (directory / "counter_123.db").write_bytes(b"stale")
+
+    environment = prepare_metrics_directory(MetricsSettings(metrics_multiprocess_dir=str(directory)))
+
+    assert environment == {"PROMETHEUS_MULTIPROC_DIR": str(directory)}
+    assert list(directory.iterdir()) == []
+    assert prepare_metrics_directory(MetricsSettings(metrics_enabled=False)) == {}
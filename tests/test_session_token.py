@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from src.api.auth.dependencies.current_user_dependencies import get_user_from_session_token
+from src.api.auth.dependencies.session_dependencies import get_session_token_codec
+from src.api.auth.schemas import SessionClaims, UserRead
+from src.api.auth.utils.session_token_codec import SessionTokenCodec
+from src.config import SessionTokenSettings
+from src.exceptions import UnauthorizeError
+from tests.conftest import FakeClock
+
+
+def make_claims() -> SessionClaims:
+    return SessionClaims(
+        user_id=1,
+        sub="google-sub",
+        session_id=7,
+        email="test@gmail.com",
+        full_name="test test",
+        image="http://test.jpg",
+        created_at=datetime(2025, 1, 1, 12, 0),
+    )
+
+
+def make_codec(clock=None, secret: str = "secret") -> SessionTokenCodec:
+    return SessionTokenCodec(secret, "HS256", ttl=300, issuer="oauth-fastapi", clock=clock or FakeClock(1_700_000_000))
+
+
+def test_session_token_round_trip():
+    codec = make_codec(clock=FakeClock(now=datetime.now().timestamp()))
+    claims = codec.verify(codec.issue(make_claims()))
+    assert claims == make_claims()
+
+
+@pytest.mark.parametrize("tamper", [
+    lambda token: make_codec(secret="other").issue(make_claims()),
+    lambda token: token[:-2] + ("AA" if not token.endswith("AA") else "BB"),
+    lambda token: "not-a-jwt",
+])
+def test_tampered_session_token_is_rejected(tamper):
+    codec = make_codec(clock=FakeClock(now=datetime.now().timestamp()))
+    with pytest.raises(UnauthorizeError):
+        codec.verify(tamper(codec.issue(make_claims())))
+
+
+@pytest.mark.parametrize("algorithm", ["none", "RS256"])
+def test_non_hmac_algorithm_is_rejected_at_startup(algorithm):
+    with pytest.raises(ValidationError):
+        SessionTokenSettings(session_token_secret="secret", session_token_algorithm=algorithm)
+
+
+def test_expired_session_token_is_rejected():
+    token = make_codec(clock=FakeClock(now=datetime.now().timestamp() - 301)).issue(make_claims())
+    with pytest.raises(UnauthorizeError):
+        make_codec().verify(token)
+
+
+def test_session_token_authenticates_without_db_or_google():
+    codec = make_codec(clock=FakeClock(now=datetime.now().timestamp()))
+    app = FastAPI()
+
+    @app.get("/current-user")
+    async def current_user(user: UserRead = Depends(get_user_from_session_token)) -> UserRead:
+        return user
+
+    app.dependency_overrides[get_session_token_codec] = lambda: codec
+    client = TestClient(app)
+
+    response = client.get("/current-user", headers={"Authorization": f"Bearer {codec.issue(make_claims())}"})
+    assert response.status_code == 200
+    assert response.json()["email"] == "test@gmail.com"
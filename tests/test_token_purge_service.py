@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.api.auth.models import User, RefreshToken
+from src.api.auth.services.token_purge_service import TokenPurgeService
+from src.api.auth.utils.token_digest import token_digest
+from src.database.base_repository import BaseRepository
+
+
+@pytest.fixture
+def session_maker(engine):
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+async def seed_tokens(session_maker, states: list[tuple[bool, timedelta]]) -> None:
+    # each state is (is_active, time since the token was last used); access tokens live for an hour
+    async with session_maker() as session:
+        users = BaseRepository(session, User)
+        tokens = BaseRepository(session, RefreshToken)
+        for index, (is_active, idle) in enumerate(states):
+            user = await users.create({"email": f"u{index}@gmail.com", "user_oauth_id": f"sub-{index}"})
+            await tokens.create({
+                "access_token": f"access-{index}",
+                "access_token_digest": token_digest(f"access-{index}"),
+                "refresh_token": f"refresh-{index}",
+                "refresh_token_digest": token_digest(f"refresh-{index}"),
+                "expires_at": datetime.now() - idle + timedelta(hours=1),
+                "token_type": "Bearer",
+                "is_active": is_active,
+                "last_used_at": datetime.now() - idle,
+                "user_id": user.id,
+            })
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_inactive_and_long_unused_tokens_in_batches(session_maker):
+    await seed_tokens(session_maker, [
+        *[(False, timedelta(0))] * 5,
+        (True, timedelta(days=200)),
+        (True, timedelta(days=40)),
+        (True, timedelta(0)),
+    ])
+    service = TokenPurgeService(session_maker, batch_size=2, batch_delay=0, retention=timedelta(days=180))
+
+    report = await service.purge()
+
+    async with session_maker() as session:
+        remaining = await BaseRepository(session, RefreshToken).get_all(limit=100)
+    assert (report.purged, report.batches) == (6, 4)
+    assert sorted(token.access_token for token in remaining) == ["access-6", "access-7"]
+
+
+@pytest.mark.asyncio
+async def test_purge_is_skipped_while_another_process_holds_the_lock(session_maker, monkeypatch):
+    await seed_tokens(session_maker, [(False, timedelta(0))])
+    service = TokenPurgeService(session_maker, batch_size=10, batch_delay=0, retention=timedelta(days=30))
+
+    async def locked_elsewhere(connection):
+        return False
+
+    monkeypatch.setattr(TokenPurgeService, "_try_lock", staticmethod(locked_elsewhere))
+    assert await service.purge_exclusive() is None
+
+    monkeypatch.undo()
+    report = await service.purge_exclusive()
+    assert report.purged == 1
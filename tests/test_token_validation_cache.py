@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from src.api.auth.utils.token_validation_cache import TokenValidationCache
+from src.exceptions import UnauthorizeError
+from tests.conftest import FakeClock
+
+
+def make_cache(clock: FakeClock, max_size: int = 100) -> TokenValidationCache:
+    return TokenValidationCache(max_size=max_size, ttl=300.0, negative_ttl=5.0, clock=clock)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_upstream_call():
+    cache = make_cache(FakeClock())
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"user_id": "1", "expires_in": 3600}
+
+    results = await asyncio.gather(*(cache.get_or_load("token", loader) for _ in range(50)))
+
+    assert calls == 1
+    assert all(result["user_id"] == "1" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_entry_expires_with_token():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        return {"user_id": "1", "expires_in": 10}
+
+    await cache.get_or_load("token", loader)
+    clock.now = 9.0
+    await cache.get_or_load("token", loader)
+    assert calls == 1
+
+    clock.now = 10.0
+    await cache.get_or_load("token", loader)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_is_negative_cached():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        raise UnauthorizeError("Invalid or expired access token")
+
+    for _ in range(3):
+        with pytest.raises(UnauthorizeError):
+            await cache.get_or_load("bad", loader)
+    assert calls == 1
+
+    clock.now = 5.0
+    with pytest.raises(UnauthorizeError):
+        await cache.get_or_load("bad", loader)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_not_cached():
+    cache = make_cache(FakeClock())
+    outcomes = [RuntimeError("boom"), {"user_id": "1"}]
+
+    async def loader():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("token", loader)
+    assert (await cache.get_or_load("token", loader))["user_id"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(FakeClock(), max_size=2)
+
+    async def loader():
+        return {"expires_in": 100}
+
+    await cache.get_or_load("a", loader)
+    await cache.get_or_load("b", loader)
+    await cache.get_or_load("a", loader)
+    await cache.get_or_load("c", loader)
+
+    assert len(cache) == 2
+    assert cache._get_entry(cache._make_key("a")) is not None
+    assert cache._get_entry(cache._make_key("b")) is None
@@ -0,0 +1,140 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.http_client.httpx_http_client import HttpxHttpClient
+from src.middleware.tracing import TracingMiddleware
+from src.tracing.exporters import SpanExporter, SpanProcessor, OtlpHttpSpanExporter
+from src.tracing.tracer import Tracer, traced, parse_traceparent, tracer
+
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class InMemoryExporter(SpanExporter):
+    def __init__(self):
+        self.batches = []
+
+    def export(self, spans) -> None:
+        self.batches.append(list(spans))
+
+    @property
+    def spans(self) -> list:
+        return [span for batch in self.batches for span in batch]
+
+
+@pytest.fixture
+def exporter(monkeypatch) -> InMemoryExporter:
+    exporter = InMemoryExporter()
+    monkeypatch.setattr(tracer, "processor", SpanProcessor(exporter))
+    monkeypatch.setattr(tracer, "sample_rate", 1.0)
+    return exporter
+
+
+@traced()
+async def load_user() -> str:
+    return await load_token()
+
+
+@traced("token.load")
+async def load_token() -> str:
+    raise ValueError("missing")
+
+
+@pytest.mark.parametrize("header, expected", [
+    (f"00-{TRACE_ID}-{PARENT_ID}-01", (TRACE_ID, PARENT_ID, True)),
+    (f"00-{TRACE_ID}-{PARENT_ID}-00", (TRACE_ID, PARENT_ID, False)),
+    (f"00-{'0' * 32}-{PARENT_ID}-01", None),
+    ("garbage", None),
+    (None, None),
+])
+def test_parse_traceparent(header, expected):
+    assert parse_traceparent(header) == expected
+
+
+@pytest.mark.asyncio
+async def test_nested_spans_share_trace_and_record_errors(exporter):
+    with pytest.raises(ValueError):
+        await load_user()
+    tracer.processor.flush()
+
+    child, parent = exporter.spans
+    assert (child.name, parent.name) == ("token.load", "load_user")
+    assert child.trace_id == parent.trace_id and child.parent_id == parent.span_id
+    assert child.error == "ValueError: missing"
+
+
+@pytest.mark.asyncio
+async def test_head_sampling_decision_is_inherited(exporter, monkeypatch):
+    monkeypatch.setattr(tracer, "sample_rate", 0.0)
+    with tracer.start_span("root"):
+        with tracer.start_span("child"):
+            pass
+    with tracer.start_span("remote", traceparent=f"00-{TRACE_ID}-{PARENT_ID}-01"):
+        pass
+    tracer.processor.flush()
+
+    assert [(span.name, span.trace_id, span.parent_id) for span in exporter.spans] == [
+        ("remote", TRACE_ID, PARENT_ID),
+    ]
+
+
+def test_processor_exports_in_batches_off_thread_and_drops_when_full():
+    exporter = InMemoryExporter()
+    processor = SpanProcessor(exporter, max_queue_size=5, max_batch_size=2, export_interval=60)
+    local_tracer = Tracer(processor, sample_rate=1.0)
+
+    for index in range(7):
+        with local_tracer.start_span(f"span-{index}"):
+            pass
+    processor.start()
+    processor.shutdown()
+
+    assert processor.dropped == 2
+    assert [len(batch) for batch in exporter.batches] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_request_spans_cover_middleware_services_and_http_client(exporter, monkeypatch):
+    monkeypatch.setattr(tracer, "propagate_hosts", frozenset({"users.internal"}))
+    outbound_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        outbound_headers.append(request.headers.get("traceparent"))
+        return httpx.Response(200, json={})
+
+    app = FastAPI()
+
+    @app.get("/users/{user_id}")
+    async def get_user(user_id: int):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await HttpxHttpClient(client).send_request("GET", "https://oauth2.googleapis.com/token?code=secret")
+            await HttpxHttpClient(client).send_request("GET", "https://users.internal/profile")
+        return {"id": user_id}
+
+    async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(TracingMiddleware(app, tracer)), base_url="http://test",
+    ) as client:
+        response = await client.get("/users/7", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+    tracer.processor.flush()
+
+    outbound, internal, server = exporter.spans
+    assert response.status_code == 200
+    assert server.name == "GET /users/{user_id}" and server.parent_id == PARENT_ID
+    assert server.attributes["http.status_code"] == 200
+    assert outbound.name == "GET oauth2.googleapis.com/token" and outbound.parent_id == server.span_id
+    assert internal.parent_id == server.span_id
+    assert outbound_headers == [None, internal.traceparent]
+    assert "secret" not in outbound.attributes["http.url"]
+
+
+def test_otlp_payload_shape():
+    local_tracer = Tracer(SpanProcessor(InMemoryExporter()), sample_rate=1.0)
+    with local_tracer.start_span("GET /users", kind="server") as span:
+        span.set_attribute("http.status_code", 200)
+
+    payload = OtlpHttpSpanExporter("http://collector:4318", "oauth")._encode([span])
+    encoded = payload["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert encoded["traceId"] == span.trace_id and encoded["kind"] == 2
+    assert encoded["attributes"] == [{"key": "http.status_code", "value": {"intValue": "200"}}]
@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.api.auth.models import User
+from src.api.auth.schemas import ExportFormat
+from src.api.auth.services.user_export_service import UserExportService
+from src.database.base_repository import BaseRepository
+
+
+@pytest.fixture
+async def export_service(engine):
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_maker() as session:
+        repo = BaseRepository(session, User)
+        for index in range(7):
+            await repo.create({
+                "email": f"user{index}@gmail.com",
+                "user_oauth_id": f"sub-{index}",
+                "created_at": datetime(2025, 1, 1) + timedelta(days=index),
+            })
+        await session.execute(
+            update(User).where(User.id == 2).values(updated_at=datetime(2030, 1, 1))
+        )
+        await session.commit()
+    return UserExportService(session_maker, fetch_size=3)
+
+
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_streams_every_row(export_service):
+    body = await collect(export_service.export(ExportFormat.NDJSON))
+    rows = [json.loads(line) for line in body.splitlines()]
+
+    assert [row["user_oauth_id"] for row in rows] == [f"sub-{index}" for index in range(7)]
+
+
+@pytest.mark.asyncio
+async def test_csv_export_with_incremental_filters(export_service):
+    created = await collect(export_service.export(ExportFormat.CSV, created_since=datetime(2025, 1, 6)))
+    updated = await collect(export_service.export(ExportFormat.CSV, updated_since=datetime(2029, 1, 1)))
+
+    created_rows = list(csv.DictReader(io.StringIO(created.decode())))
+    updated_rows = list(csv.DictReader(io.StringIO(updated.decode())))
+
+    assert [row["email"] for row in created_rows] == ["user5@gmail.com", "user6@gmail.com"]
+    assert [row["id"] for row in updated_rows] == ["2"]